@@ -3,9 +3,13 @@ from dash import html, dcc
 from dash.dependencies import Input, Output
 import plotly.express as px
 import pandas as pd 
+from dataset import load_dataset
+from figure_cache import FigureCache
 
 # Read the provided dataset
-df = pd.read_csv("ecommerce_customer_data_large.csv", parse_dates=['Purchase Date'], low_memory=False)
+df = load_dataset()
+
+figure_cache = FigureCache()
 
 # Initialize the Dash app
 app = dash.Dash(__name__)
@@ -56,6 +60,7 @@ app.layout = html.Div(style={'font-family': 'Arial, sans-serif'}, children=[
      Output('box-plot', 'figure')],
     [Input('analysis-dropdown', 'value')]
 )
+@figure_cache.memoize('churn-analysis')
 def update_graph(selected_analysis):
     if selected_analysis == 'Product Category Count':
         bar_fig = px.bar(df['Product Category'].value_counts(), x=df['Product Category'].value_counts().index, y=df['Product Category'].value_counts(), title='Product Category Count')
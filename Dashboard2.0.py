@@ -2,192 +2,35 @@ import dash
 from dash import html, dcc
 from dash.dependencies import Input, Output, State
 from dash.exceptions import PreventUpdate
-import dash_ag_grid as dag
-import matplotlib.pyplot as plt
-import seaborn as sns
-import statsmodels.api as sm
 import pandas as pd
 import plotly.express as px
 import numpy as np
 import base64
-from prettytable import PrettyTable
-from scipy.stats import boxcox
-from scipy.stats import anderson
-from sklearn.decomposition import PCA
-from sklearn.preprocessing import StandardScaler
+import io
 import numpy as np
-
-# Load the dataset
-df = pd.read_csv("ecommerce_customer_data_large.csv")
-
+from dataset import load_dataset, load_shared_dataset
+from background_jobs import BackgroundJobs
+from column_store import open_store
+from cube import COUNT
+from customer_index import CustomerIndex
+from customer_metrics import GAP, CustomerMetrics
+from customer_search import PrefixIndex
+from dense_scatter import dense_scatter, dense_scatter_3d
+from downsample import downsample, zoom_window
+from figure_cache import FIGURE_DIR, FigureCache
+from filter_index import FilterIndex
+from grid_query import GridQuery, data_grid
+from histograms import histogram
+from static_plots import PLOTS, StaticPlots
+from time_pyramid import PERIODS, UNITS, TimePyramid
+
+# Load the dataset, read-only: it is shared by every request thread, and its columns are
+# memory-mapped, so every worker process of the server shares one copy of them
+df = load_dataset(shared=True)
 
 time_intervals = ['D', 'W', 'M', 'Y']  # 'D' for Daily, 'W' for Weekly, 'M' for Monthly, 'Y' for Yearly
-df['Purchase Date'] = pd.to_datetime(df['Purchase Date'])
-payment_methods = df['Payment Method'].unique()
-return_percentage = (df['Returns'].count() / len(df)) * 100
-returns_df = df[df['Returns'].notnull()]
 # Dropdown options for product categories
 product_category_options = [{'label': category, 'value': category} for category in df['Product Category'].unique()]
-print(df.shape)
-print(df.info())
-print(df.describe().round(2))
-missing_values = df.isnull().sum()
-print("Missing Values(before cleaning) are :")
-print(missing_values)
-# Remove duplicates
-df.drop_duplicates(inplace=True)
-df.reset_index(drop=True, inplace=True)
-# Replace missing 'Returns' values with a suitable default value, e.g., 0 for no return
-default = 0
-df['Returns'].fillna(default, inplace=True)
-print("Missing Values (after cleaning) are :")
-print(df.isnull().sum())
-df['Total Purchase Amount'] = df['Product Price'] * df['Quantity']
-# Drop unnecessary columns
-df.drop(['Customer Name'], axis=1, inplace=True)
-df['Purchase Date'] = pd.to_datetime(df['Purchase Date'])
-df.set_index('Purchase Date', inplace=True)
-#print top 5 records
-print(df.head())
-#1
-# Filling missing values in 'Returns' with the mean
-df['Returns'].fillna(df['Returns'].mean(), inplace=True)
-cleaned_df_head = df.head()
-cleaned_df_stats = df.describe()
-print("Cleaned Dataset - First Few Observations:")
-print(cleaned_df_head)
-print(df.isnull().sum())
-print("\nCleaned Dataset - Statistics:")
-print(cleaned_df_stats)
-
-#2 Out-liners
-from scipy import stats
-z_threshold = 3
-z_scores = stats.zscore(df.select_dtypes(include=['int64', 'float64']))
-outliers = (abs(z_scores) > z_threshold).all(axis=1)
-cleaned_outliers = df[~outliers]
-cleaned_outliers_stats = cleaned_outliers.describe()
-
-# Print the cleaned DataFrame without outliers
-print("Cleaned Dataset without Outliers:")
-print(cleaned_outliers)
-
-# Print the statistics of the cleaned dataset without outliers
-print("\nCleaned Dataset without Outliers - Statistics:")
-print(cleaned_outliers_stats)
-
-#PCA
-numerical_features = df.select_dtypes(include=['int64', 'float64']).columns
-
-# Standardize the data
-scaler = StandardScaler()
-scaled_data = scaler.fit_transform(df[numerical_features])
-
-# Perform PCA
-pca = PCA()
-pca_result = pca.fit_transform(scaled_data)
-
-# Explained variance ratio
-explained_variance_ratio = pca.explained_variance_ratio_
-
-# Display explained variance ratio for each principal component
-print("Explained Variance Ratio:")
-print(explained_variance_ratio)
-
-# Cumulative explained variance
-cumulative_variance_ratio = explained_variance_ratio.cumsum()
-
-# Display cumulative explained variance
-print("\nCumulative Explained Variance:")
-print(cumulative_variance_ratio)
-
-# Number of principal components to retain based on desired explained variance
-desired_explained_variance = 0.95  # Adjust as needed
-num_components = (cumulative_variance_ratio < desired_explained_variance).sum() + 1
-
-# Retain the desired number of principal components
-pca_result_reduced = pca_result[:, :num_components]
-
-# Display the number of retained principal components
-print(f"\nNumber of Retained Principal Components: {num_components}")
-
-# Condition number of the covariance matrix
-condition_number = np.linalg.cond(pca.get_covariance())
-print(f"\nCondition Number of Covariance Matrix: {condition_number}")
-
-# Singular values of the retained principal components
-singular_values = pca.singular_values_[:num_components]
-print("\nSingular Values of Retained Principal Components:")
-print(singular_values)
-
-#Normality
-# Significance levels for the Anderson-Darling test
-alpha_levels = [0.01, 0.05, 0.1]
-
-# Loop through numerical features and perform the Anderson-Darling test
-for feature in numerical_features:
-    result = anderson(df[feature])
-    print(f"Anderson-Darling test for {feature}: Statistic={result.statistic}, Critical Values={result.critical_values}, Significance Levels={alpha_levels}")
-    print(f"Conclusion: {'Normal' if result.statistic < result.critical_values[2] else 'Not Normal'}\n")
-
-#BOXCOX
-transformed_df = pd.DataFrame()
-
-# Loop through numerical features and perform the Box-Cox transformation
-for feature in numerical_features:
-    transformed_data, lambda_value = boxcox(df[feature] + 1)  # Adding 1 to handle zero values
-    transformed_df[feature] = transformed_data
-
-# Display the first few observations of the transformed dataset
-print("Transformed Dataset:")
-print(transformed_df.head())
-
-#HeatMap
-# Calculate the Pearson correlation matrix
-# correlation_matrix = df[numerical_features].corr()
-# plt.figure(figsize=(12, 8))
-# sns.heatmap(correlation_matrix,  cmap="coolwarm", fmt=".2f", linewidths=.5)
-# for i in range(len(correlation_matrix)):
-#     for j in range(len(correlation_matrix.columns)):
-#         coeff_value = correlation_matrix.iloc[i, j]
-#         plt.text(j + 0.5, i + 0.5, f"{coeff_value:.2f}", ha='center', va='center', color='black')
-# plt.title("Pearson Correlation Coefficient Heatmap")
-# plt.show()
-
-# # Create a scatter plot matrix using seaborn
-
-# scatter_plot_matrix = sns.pairplot(df[numerical_features])
-# plt.suptitle("Scatter Plot Matrix")
-# plt.show()
-
-
-numerical_features = df.select_dtypes(include=['int64', 'float64']).columns
-
-# Display numerical features in a PrettyTable with two-point precision for mean, median, and standard deviation
-table_stats = PrettyTable(["Feature", "Mean", "Median", "Correlation", "Std Dev","Variance"])
-for feature in numerical_features:
-    table_stats.add_row([
-        feature,
-        f"{df[feature].mean():.2f}",
-        f"{df[feature].median():.2f}",
-        f"{df['Churn'].corr(df[feature]):.2f}",  # Replace 'Churn' with your target column
-        f"{df[feature].std():.2f}",
-        f"{df[feature].var():.2f}"
-    ])
-
-table_correlation = PrettyTable(["Feature1", "Feature2", "Correlation"])
-for i in range(len(numerical_features)):
-    for j in range(i + 1, len(numerical_features)):
-        feature1 = numerical_features[i]
-        feature2 = numerical_features[j]
-        correlation = df[feature1].corr(df[feature2])
-        table_correlation.add_row([feature1, feature2, f"{correlation:.2f}"])
-
-print("Correlation Table:")
-print(table_correlation)
-
-print("Statistics Table:")
-print(table_stats)
 
 colors = {
     'background': '#f8f9fa',  # Light gray background
@@ -203,15 +46,36 @@ color_map = {
 
 # Dropdown options for age groups
 age_group_options = [{'label': f'{i}-{i+9}', 'value': i} for i in range(18, 71, 10)]
-df = pd.read_csv("ecommerce_customer_data_large.csv")
-df['Purchase Date'] = pd.to_datetime(df['Purchase Date'])
 
-time_intervals = ['D', 'W', 'M', 'Y']  # 'D' for Daily, 'W' for Weekly, 'M' for Monthly, 'Y' for Yearly
 payment_methods = df['Payment Method'].unique()
 return_percentage = (df['Returns'].count() / len(df)) * 100
 returns_df = df[df['Returns'].notnull()]
+# Row bitmaps for the categorical filters used by the callbacks
+filter_index = FilterIndex(df)
+# Row positions sorted by purchase date, for the line charts drawn over raw transactions
+date_order = np.argsort(df['Purchase Date'].to_numpy(), kind='stable')
+customer_index = CustomerIndex(df)
+# Per-customer metrics for the purchase behavior tab, built on first use
+customer_metrics = CustomerMetrics(df, version=df.version)
+customer_names = PrefixIndex(df['Customer Name'])
+customer_ids = PrefixIndex(df['Customer ID'])
+# Pre-aggregated counts and sums for the charts that only need totals, built one month at a
+# time from the column store; the store is written from the loaded frame, not the CSV
+cube = open_store(frame=df).cube(dimensions=['Product Category', 'Gender', 'Payment Method', 'Age'])
+
+# Yearly to hourly aggregates and the transactions by date, for the zoomable time-series charts;
+# the time-interval dropdowns read its cached interval totals
+time_pyramid = TimePyramid(df, by=['Product Category'])
+time_buckets = time_pyramid.buckets
+# Figures of the dropdown-driven tabs, shared with the other worker processes through the disk tier
+figure_cache = FigureCache(disk_dir=FIGURE_DIR)
+# Matplotlib plots of the Phase-1 selector, rendered to PNG outside the request threads
+static_plots = StaticPlots(loader=load_shared_dataset)
+# The heavy callbacks run as background jobs, off the request threads, when diskcache is installed
+background_jobs = BackgroundJobs()
 
 app = dash.Dash(__name__)
+static_plots.register(app.server)
 image = 'logo.png'
 image_base64 = base64.b64encode(open(image, 'rb').read()).decode('ascii')
 app.layout = html.Div(style={'font-family': 'Arial, sans-serif'},children=[
@@ -304,22 +168,10 @@ app.layout = html.Div(style={'font-family': 'Arial, sans-serif'},children=[
             }
         ),
         # Display the data in an Ag-Grid table with styling
-        dag.AgGrid(
-            id='ag-grid',
-            columnDefs=[{'headerName': col, 'field': col} for col in df.columns],
-            rowData=df.to_dict('records'),
-            className="ag-theme-alpine-dark",
-            dashGridOptions={
-                'rowHeight': 40,
-                'domLayout': 'autoHeight',
-                'animateRows': True,
-                'pagination': True,
-                'paginationPageSize': 20,
-                'exportDataAsCsv': True,  # Enable CSV export option
-            },
-            style={'height': '500px', 'width': '100%', },
-        ),
+        # Rows are fetched block by block through the getRowsRequest callback
+        data_grid(df, className="ag-theme-alpine-dark", style={'height': '500px', 'width': '100%', }),
         dcc.Download(id="download-data"),
+        html.Div(id='download-status'),
             ]),
         ]),#TAB-9 END
         
@@ -715,8 +567,8 @@ app.layout = html.Div(style={'font-family': 'Arial, sans-serif'},children=[
             html.Label("Select Customer:"),
             dcc.Dropdown(
                 id='customer-dropdown1',
-                options=[{'label': customer, 'value': customer} for customer in df['Customer Name'].unique()],
-                value=df['Customer Name'].unique()[0],style={'box-shadow': '0 4px 8px rgba(0,0,0,0.1)', 'border-radius': '8px','margin-bottom': '1rem'}
+                options=customer_names.options(selected=df['Customer Name'].iloc[0]),
+                value=df['Customer Name'].iloc[0],style={'box-shadow': '0 4px 8px rgba(0,0,0,0.1)', 'border-radius': '8px','margin-bottom': '1rem'}
                
             ),
             html.Label("Select Product Category:"),
@@ -761,8 +613,8 @@ app.layout = html.Div(style={'font-family': 'Arial, sans-serif'},children=[
         html.Label("Select Customer ID:"),
         dcc.Dropdown(
             id='customer-dropdown2',
-            options=[{'label': customer, 'value': customer} for customer in df['Customer ID'].unique()],
-            value=df['Customer ID'].unique()[0],
+            options=customer_ids.options(selected=df['Customer ID'].iloc[0]),
+            value=df['Customer ID'].iloc[0],
             style={'width': '50%','margin-left':'18rem'}
         ),
     ], style={'margin': '20px','text-align':'center'}),
@@ -804,30 +656,37 @@ app.layout = html.Div(style={'font-family': 'Arial, sans-serif'},children=[
 # Define callback to update the graph based on the selected option
 @app.callback(
     Output('selected-graph', 'figure'),
-    [Input('graph-selector', 'value')]
+    [Input('graph-selector', 'value'),
+     # Zooming the line and area graphs redraws them at a finer interval
+     Input('selected-graph', 'relayoutData')]
 )
-def update_graph(selected_graph):
-    if selected_graph == 'line-plot':
-        df2 = pd.read_csv("ecommerce_customer_data_large.csv")
-        df2['Purchase Date'] = pd.to_datetime(df['Purchase Date'])
-        df2.set_index('Purchase Date', inplace=True)
-        monthly_purchase = df2.resample('M')['Total Purchase Amount'].sum().reset_index()
+def update_graph(selected_graph, zoom):
+    zoomed = dash.callback_context.triggered[0]['prop_id'] == 'selected-graph.relayoutData'
+    if zoomed and selected_graph not in ('line-plot', 'Area-Graph'):
+        raise PreventUpdate
+    # A new selection starts from the full date range
+    window = zoom_window(zoom) if zoomed else None
+    if selected_graph in PLOTS:
+        # Rendered by the static plot workers and shown as an image
+        return static_plots.figure(selected_graph)
+    elif selected_graph == 'line-plot':
+        level, monthly_purchase = time_pyramid.window(window, base='M')
         fig = px.line(monthly_purchase, x='Purchase Date', y='Total Purchase Amount', markers=True, line_shape='linear',
-                    labels={'Purchase Date': 'Month', 'Total Purchase Amount': 'Total Purchase Amount'},
-                    title='Monthly Total Purchase Amount')
+                    labels={'Purchase Date': UNITS[level], 'Total Purchase Amount': 'Total Purchase Amount'},
+                    title=f'{PERIODS[level]} Total Purchase Amount')
         fig.update_xaxes(tickangle=45)
         fig.update_layout(font=dict(family='serif', color='blue', size=20))
         fig.update_layout(
             xaxis=dict(tickfont=dict(family='serif', color='darkred')),
-            yaxis=dict(tickfont=dict(family='serif', color='darkred')),title_x=0.5
+            yaxis=dict(tickfont=dict(family='serif', color='darkred')),title_x=0.5, uirevision=selected_graph
         )
         return fig
     
     elif selected_graph == 'stack-bar-plot':
         # Stack bar plot
-        gender_category_counts = df.groupby(['Gender', 'Product Category']).size().unstack().reset_index()
-        fig = px.bar(gender_category_counts, x='Gender', y=[col for col in gender_category_counts.columns if col != 'Gender'],
-                    barmode='stack', labels={'value': 'Number of Purchases', 'variable': 'Product Category'},
+        gender_category_counts = cube.query(by=['Gender', 'Product Category'], measures=[COUNT])
+        fig = px.bar(gender_category_counts, x='Gender', y=COUNT, color='Product Category',
+                    barmode='stack', labels={COUNT: 'Number of Purchases'},
                     title='Product Category Purchase Count by Gender')
         fig.update_layout(font=dict(family='serif', color='blue', size=20))
         fig.update_layout(
@@ -837,9 +696,9 @@ def update_graph(selected_graph):
         
         return fig
     elif selected_graph == 'Group-bar-plot':
-        grouped_data = df.groupby(['Product Category', 'Gender'])['Total Purchase Amount'].sum().unstack().reset_index()
-        fig = px.bar(grouped_data, x='Product Category', y=[col for col in grouped_data.columns if col != 'Product Category'],
-                    barmode='group', labels={'value': 'Total Purchase Amount', 'variable': 'Gender'},
+        grouped_data = cube.query(by=['Product Category', 'Gender'], measures=['Total Purchase Amount'])
+        fig = px.bar(grouped_data, x='Product Category', y='Total Purchase Amount', color='Gender',
+                    barmode='group',
                     title='Total Purchase Amount by Product Category and Gender')
         fig.update_xaxes(tickangle=45)
         fig.update_layout(font=dict(family='serif', color='blue', size=20))
@@ -860,71 +719,9 @@ def update_graph(selected_graph):
             yaxis=dict(tickfont=dict(family='serif', color='darkred')),title_x=0.5
         )
         return fig
-    elif selected_graph == 'pie-chart':
-        # Update the pie chart
-        payment_method_counts = df['Payment Method'].value_counts()
-        plt.figure(figsize=(8, 8))
-        plt.pie(payment_method_counts, labels=payment_method_counts.index, autopct='%1.2f%%', startangle=90, colors=sns.color_palette('pastel'))
-        plt.title('Payment Method Distribution',fontdict={'fontname': 'serif', 'color': 'blue', 'size': 16})
-        plt.show()
-        return px.line()
-    elif selected_graph == 'Dist-plot':
-        plt.figure(figsize=(8, 6))
-        sns.histplot(df['Customer Age'], kde=True, color='skyblue')
-        plt.title('Distribution of Customer Ages',fontdict={'fontname': 'serif', 'color': 'blue', 'size': 16})
-        plt.xlabel('Customer Age',fontname='serif', color='darkred', fontsize=14)
-        plt.ylabel('Density',fontname='serif', color='darkred', fontsize=14)
-        plt.show()
-        return px.line()
-    elif selected_graph == 'Pair-plot':
-        # Pair plot
-        sns.set(style="whitegrid")
-        sns.pairplot(df, vars=['Product Price','Quantity','Total Purchase Amount'], hue='Churn')
-        plt.suptitle('Pair Plot for Selected Columns', y=1.02)
-        plt.show()
-        return px.line()
-    elif selected_graph =='Heatmap':
-        #Heatmap
-       numeric_df = df.select_dtypes(include=['float64', 'int64'])
-       correlation_matrix = numeric_df.corr()
-       plt.figure(figsize=(10, 8))
-       sns.heatmap(correlation_matrix, cmap='coolwarm')
-       for i in range(len(correlation_matrix)):
-            for j in range(len(correlation_matrix.columns)):
-                text = f"{correlation_matrix.iloc[i, j]:.2f}"
-                plt.text(j + 0.5, i + 0.5, text, ha='center', va='center', color='black', fontsize=12)
-       
-       plt.title('Heat Map: Correlation Matrix', fontdict={'fontname': 'serif', 'color': 'blue', 'size': 16})
-       plt.show()
-       return px.line()
-    elif selected_graph =='Histogram-with-kde':
-        #Histogram with kde
-        plt.figure(figsize=(8, 6))
-        sns.histplot(df['Total Purchase Amount'], kde=True, color='skyblue')
-        plt.title('Histogram Plot with KDE',fontdict={'fontname': 'serif', 'color': 'blue', 'size': 16})
-        plt.xlabel( 'Total Purchase Amount',fontname='serif', color='darkred')
-        plt.ylabel( 'Count',fontname='serif', color='darkred')
-        plt.show()
-        return px.line()
-    elif selected_graph =='QQ-Plot':
-        # QQ-Plot
-        sm.qqplot(df['Product Price'], line='s')
-        plt.title('QQ-Plot',fontdict={'fontname': 'serif', 'color': 'blue', 'size': 16})
-        plt.xlabel('Theoritical quantity',fontname='serif', color='darkred')
-        plt.ylabel('Sample quantity', fontname='serif', color='darkred')
-        plt.show()
-        return px.line()
-    elif selected_graph == 'kde-plot':
-        # kde plot
-        plt.figure(figsize=(8, 6))
-        sns.kdeplot(df['Quantity'], fill=True, alpha=0.6, palette="viridis", linewidth=3)
-        plt.title('KDE Plot with Filled Area',fontdict={'fontname': 'serif', 'color': 'blue', 'size': 16})
-        plt.xlabel("Quality", fontname='serif', color='darkred')
-        plt.ylabel('Density', fontname='serif', color='darkred')
-        plt.show()
     elif selected_graph == 'Implot' :
         #Implot
-        fig = px.scatter(df, x='Customer Age', y='Total Purchase Amount', trendline='ols',
+        fig = dense_scatter(df, x='Customer Age', y='Total Purchase Amount', trendline='ols',
                  title='lmplot: Total Purchase Amount vs. Customer Age')
         fig.update_layout(font=dict(family='serif', color='blue', size=20))
         fig.update_layout(
@@ -943,15 +740,15 @@ def update_graph(selected_graph):
         )
         return fig
     elif selected_graph == 'Area-Graph':
-        monthly_purchase = df.resample('M')['Total Purchase Amount'].sum().reset_index()
+        level, monthly_purchase = time_pyramid.window(window, base='M')
         fig = px.area(monthly_purchase, x='Purchase Date', y='Total Purchase Amount',
-              labels={'Purchase Date': 'Month', 'Total Purchase Amount': 'Total Purchase Amount'},
-              title='Area Graph - Monthly Purchase Trends')
+              labels={'Purchase Date': UNITS[level], 'Total Purchase Amount': 'Total Purchase Amount'},
+              title=f'Area Graph - {PERIODS[level]} Purchase Trends')
         fig.update_xaxes(tickangle=45)
         fig.update_layout(font=dict(family='serif', color='blue', size=20))
         fig.update_layout(
             xaxis=dict(tickfont=dict(family='serif', color='darkred')),
-            yaxis=dict(tickfont=dict(family='serif', color='darkred')),title_x=0.5
+            yaxis=dict(tickfont=dict(family='serif', color='darkred')),title_x=0.5, uirevision=selected_graph
         )
         return fig
     elif selected_graph == 'Violin-Plot':
@@ -964,17 +761,8 @@ def update_graph(selected_graph):
             yaxis=dict(tickfont=dict(family='serif', color='darkred')),title_x=0.5
         )
         return fig
-    elif selected_graph == 'Joint-Plot':
-        #Joint Plot with KDE and Scatter Representation:
-        sns.set(style="whitegrid")
-        sns.jointplot(x='Customer Age', y='Total Purchase Amount', data=df, color='g')
-        sns.kdeplot(df['Customer Age'], color='b', ax=plt.gca())
-        sns.kdeplot(df['Total Purchase Amount'], color='r', vertical=True, ax=plt.gca())
-        plt.suptitle('Joint Plot with KDE: Customer Age vs. Total Purchase Amount', fontdict={'fontname': 'serif', 'color': 'blue', 'size': 16})
-        plt.show()
-        return px.line()
     elif selected_graph == 'Rug-Plot':
-        fig = px.scatter(df, x='Product Price', marginal_y='rug',
+        fig = dense_scatter(df, x='Product Price', marginal_y='rug',
                  title='Rug Plot: Product Price Distribution')
         fig.update_xaxes(tickangle=45)
         fig.update_layout(font=dict(family='serif', color='blue', size=20))
@@ -984,7 +772,7 @@ def update_graph(selected_graph):
         )
         return fig
     elif selected_graph == '3D-Plot':
-        fig = px.scatter_3d(df, x='Customer Age', y='Product Price', z='Total Purchase Amount',title='3D Plot: Customer Age, Product Price, and Total Purchase Amount')
+        fig = dense_scatter_3d(df, x='Customer Age', y='Product Price', z='Total Purchase Amount',title='3D Plot: Customer Age, Product Price, and Total Purchase Amount')
         fig.update_xaxes(tickangle=45)
         fig.update_layout(font=dict(family='serif', color='blue', size=20))
         fig.update_layout(
@@ -1002,27 +790,6 @@ def update_graph(selected_graph):
             yaxis=dict(tickfont=dict(family='serif', color='darkred')),title_x=0.5
         )
         return fig
-    elif selected_graph == 'Cluster-map':
-        #Cluster map
-        numeric_df = df.select_dtypes(include=['float64', 'int64'])
-        correlation_matrix = numeric_df.corr()
-        sns.clustermap(numeric_df.corr(), cmap='coolwarm', annot=True, figsize=(10, 8))
-        for i in range(len(correlation_matrix)):
-            for j in range(len(correlation_matrix.columns)):
-                text = f"{correlation_matrix.iloc[i, j]:.2f}"
-        plt.title('Cluster Map: Correlation Heatmap', fontdict={'fontname': 'serif', 'color': 'blue', 'size': 16})
-        plt.show()
-        return px.line()
-    elif selected_graph == 'Hexbin-plot':
-        # Hexbin plot
-        plt.figure(figsize=(10, 8))  # Adjust the figure size as needed
-        plt.hexbin(df['Age'], df['Customer ID'], gridsize=50, cmap='viridis')
-        plt.colorbar()
-        plt.title('Hexbin Plot of Age vs Customer ID', fontdict={'fontname': 'serif', 'color': 'blue', 'size': 16})
-        plt.xlabel('Age', fontdict={'fontname': 'serif', 'color': 'darkred'})
-        plt.ylabel('Total Purchase Amount', fontdict={'fontname': 'serif', 'color': 'darkred'})
-        plt.show()
-        return px.line()
     elif selected_graph == 'Strip-Plot' :
         fig = px.strip(df, x='Gender', y='Total Purchase Amount', color='Gender',
                title='Strip Plot: Total Purchase Amount by Gender')
@@ -1058,19 +825,21 @@ def update_graph(selected_graph):
 )
 def tab2_update_charts(selected_demographic, selected_groups, selected_age_range):
     if selected_demographic == 'Age':
-        filtered_df = df[(df['Age'] >= selected_age_range[0]) & (df['Age'] <= selected_age_range[1])]
+        filtered_df = filter_index.select(age_range=selected_age_range)
+        cube_selection = {'ranges': {'Age': selected_age_range}}
     else:
-        filtered_df = df[df['Gender'].isin(selected_groups)]
+        filtered_df = filter_index.select({'Gender': selected_groups})
+        cube_selection = {'filters': {'Gender': selected_groups}}
 
     # Bar chart for distribution of customers by age or gender
-    bar_chart = px.histogram(filtered_df, x=selected_demographic, title=f'Distribution of Customers by {selected_demographic}',
+    bar_chart = histogram(filtered_df, x=selected_demographic, title=f'Distribution of Customers by {selected_demographic}',
                                     labels={selected_demographic: selected_demographic, 'count': 'Count'},
                                     category_orders={'Gender': selected_groups} if selected_demographic == 'Gender' else None,
                                     color_discrete_sequence=px.colors.qualitative.D3_r, template="plotly_dark")
     bar_chart.update_layout( title_x=0.5,bargap=0.2)
 
     # Bar chart for average purchase amount by age or gender
-    avg_purchase_chart = px.bar(filtered_df.groupby(selected_demographic)['Total Purchase Amount'].mean().reset_index(),
+    avg_purchase_chart = px.bar(cube.mean('Total Purchase Amount', by=[selected_demographic], **cube_selection),
                                 x=selected_demographic, y='Total Purchase Amount',
                                 title=f'Average Purchase Amount by {selected_demographic}',
                                 labels={selected_demographic: selected_demographic, 'Total Purchase Amount': 'Average Purchase Amount'},
@@ -1079,7 +848,8 @@ def tab2_update_charts(selected_demographic, selected_groups, selected_age_range
     avg_purchase_chart.update_layout( title_x=0.5)
 
     # Pie chart for most popular product categories by age or gender
-    pie_chart = px.pie(filtered_df, names='Product Category', title=f'Most Popular Product Categories by {selected_demographic}',
+    category_counts = cube.query(by=['Product Category'], measures=[COUNT], **cube_selection)
+    pie_chart = px.pie(category_counts, names='Product Category', values=COUNT, title=f'Most Popular Product Categories by {selected_demographic}',
                        labels={'Product Category': 'Product Category', 'count': 'Count'},
                        category_orders={'Gender': selected_groups} if selected_demographic == 'Gender' else None,
                        color_discrete_sequence=px.colors.qualitative.Pastel,template="plotly_dark")
@@ -1093,25 +863,36 @@ def tab2_update_charts(selected_demographic, selected_groups, selected_age_range
      Output('average-quantity-chart', 'figure'),
      Output('product-category-chart', 'figure'),
      Output('total-purchase-distribution', 'figure')],
-    [Input('time-interval-dropdown', 'value')]
+    [Input('time-interval-dropdown', 'value'),
+     # Zooming the purchase date chart redraws it alone, at a finer interval
+     Input('purchase-date-chart', 'relayoutData')]
 )
     
 
-def update_graphs(selected_interval):
-    
-    # Resample data based on the selected time interval
-    df_resampled = df.set_index('Purchase Date').resample(selected_interval).count().reset_index()
+def update_graphs(selected_interval, purchase_date_zoom):
+    zoomed = dash.callback_context.triggered[0]['prop_id'] == 'purchase-date-chart.relayoutData'
 
     # Frequency distribution of purchase dates
-    fig_purchase_date = px.line(df_resampled, x='Purchase Date', y='Customer ID', title='Frequency Distribution of Purchase Dates', color_discrete_sequence=px.colors.qualitative.Vivid,template="plotly_dark")
+    # Transactions per interval of the visible range; a new interval starts from the full range
+    level, purchase_counts = time_pyramid.window(zoom_window(purchase_date_zoom) if zoomed else None,
+                                                 base=selected_interval, transactions=False)
+    fig_purchase_date = px.line(purchase_counts, x='Purchase Date', y=COUNT, title='Frequency Distribution of Purchase Dates', color_discrete_sequence=px.colors.qualitative.Vivid,template="plotly_dark",
+                                labels={'Purchase Date': UNITS[level]})
+    fig_purchase_date.update_layout(uirevision=selected_interval)
+    if zoomed:
+        return fig_purchase_date, dash.no_update, dash.no_update, dash.no_update
+
+    # Resample data based on the selected time interval
+    # Transactions per interval, rolled up from the cached daily aggregates
+    df_resampled = time_buckets.totals(selected_interval).reset_index()
 
     # Average quantity of products purchased
-    fig_average_quantity = px.bar(df_resampled, x='Purchase Date', y='Quantity', title='Average Quantity of Products Purchased', color_discrete_sequence=px.colors.qualitative.Safe,template="plotly_dark")
+    fig_average_quantity = px.bar(df_resampled, x='Purchase Date', y=COUNT, title='Average Quantity of Products Purchased', color_discrete_sequence=px.colors.qualitative.Safe,template="plotly_dark")
     # Most popular product categories and their average prices
-    fig_product_category = px.histogram(df, x='Product Price', color='Product Category', nbins=30,title='Distribution of Product Prices by Category',color_discrete_sequence=px.colors.qualitative.Antique,template='plotly_dark')
+    fig_product_category = histogram(df, x='Product Price', color='Product Category', nbins=30,title='Distribution of Product Prices by Category',color_discrete_sequence=px.colors.qualitative.Antique,template='plotly_dark')
     fig_product_category.update_layout( title_x=0.5,bargap=0.2)
     # Distribution of total purchase amounts
-    fig_total_purchase_distribution = px.histogram(df, x='Total Purchase Amount', title='Distribution of Total Purchase Amounts', color_discrete_sequence= px.colors.qualitative.Light24,template="plotly_dark")
+    fig_total_purchase_distribution = histogram(df, x='Total Purchase Amount', title='Distribution of Total Purchase Amounts', color_discrete_sequence= px.colors.qualitative.Light24,template="plotly_dark")
     return fig_purchase_date, fig_average_quantity, fig_product_category, fig_total_purchase_distribution
 
 #TAB-3
@@ -1124,10 +905,11 @@ def update_graphs(selected_interval):
 )
 def tab3_update_graphs(selected_payment_methods):
     # Filter data based on selected payment methods
-    filtered_df = df[df['Payment Method'].isin(selected_payment_methods)]
+    filtered_df = filter_index.select({'Payment Method': selected_payment_methods})
 
     # Pie chart showing the percentage of the selected payment methods
-    pie_chart = px.pie(filtered_df, names='Payment Method', title=f'Distribution of Selected Payments',
+    payment_counts = cube.query(by=['Payment Method'], filters={'Payment Method': selected_payment_methods}, measures=[COUNT])
+    pie_chart = px.pie(payment_counts, names='Payment Method', values=COUNT, title=f'Distribution of Selected Payments',
                        color_discrete_sequence=px.colors.qualitative.Set1,template="plotly_dark")
     pie_chart.update_layout(title_x=0.5)
     # Bar chart with payment methods on X-axis, average purchase amount on Y-axis
@@ -1138,7 +920,7 @@ def tab3_update_graphs(selected_payment_methods):
                                template="plotly_dark")
     bar_chart.update_layout(title_x=0.5,bargap=0.1)
     # Scatter plot with payment methods on X-axis, product category/price on Y-axis
-    scatter_plot = px.scatter(filtered_df, x='Payment Method', y='Product Price', color='Product Category',
+    scatter_plot = dense_scatter(filtered_df, x='Payment Method', y='Product Price', color='Product Category',
                               title='Correlation between Selected Payments and Product Category/Price',
                               color_discrete_sequence=px.colors.qualitative.Set3,template="plotly_dark")
     scatter_plot.update_layout(title_x=0.5)
@@ -1157,8 +939,7 @@ def tab3_update_graphs(selected_payment_methods):
     Input('age-range-slider', 'value')
 )
 def update_visualizations(selected_category, selected_age_group, selected_age_range):
-    filtered_df = df[(df['Product Category'] == selected_category) &
-                     (df['Age'].between(selected_age_range[0], selected_age_range[1]))]
+    filtered_df = filter_index.select({'Product Category': selected_category}, age_range=selected_age_range)
 
     # Update the pie chart
     return_percentage = (filtered_df['Returns'].count() / len(filtered_df)) * 100
@@ -1170,15 +951,15 @@ def update_visualizations(selected_category, selected_age_group, selected_age_ra
     pie_chart .update_layout(title_x=0.5)
 
     # Update the bar chart for correlation between returns and product categories
-    bar_chart_correlation = px.histogram(filtered_df, x='Product Category', color='Returns', barmode='group', title='Distribution of Product Category with Returns',color_discrete_sequence=px.colors.qualitative.Dark24_r,template="plotly_dark")
+    bar_chart_correlation = histogram(filtered_df, x='Product Category', color='Returns', barmode='group', title='Distribution of Product Category with Returns',color_discrete_sequence=px.colors.qualitative.Dark24_r,template="plotly_dark")
     bar_chart_correlation.update_layout(title_x=0.5)
 
     # Update the bar chart for returns by age group
-    bar_chart_age_group =px.histogram(filtered_df, x='Age', color='Returns', barmode='group',title='Distribution of Age with Returns',color_discrete_sequence=px.colors.qualitative.Light24,template="plotly_dark")
+    bar_chart_age_group =histogram(filtered_df, x='Age', color='Returns', barmode='group',title='Distribution of Age with Returns',color_discrete_sequence=px.colors.qualitative.Light24,template="plotly_dark")
     bar_chart_age_group.update_layout(title_x=0.5)
 
     # Update the bar chart for returns by gender
-    bar_chart_gender = px.histogram(filtered_df, x='Gender', color='Returns', barmode='group',title='Distribution of Gender with Returns',color_discrete_sequence=px.colors.qualitative.Set2,template="plotly_dark")
+    bar_chart_gender = histogram(filtered_df, x='Gender', color='Returns', barmode='group',title='Distribution of Gender with Returns',color_discrete_sequence=px.colors.qualitative.Set2,template="plotly_dark")
     bar_chart_gender.update_layout(title_x=0.5,bargap=0.2)
 
     return pie_chart, bar_chart_common_returns, bar_chart_correlation, bar_chart_age_group, bar_chart_gender
@@ -1191,8 +972,9 @@ def update_visualizations(selected_category, selected_age_group, selected_age_ra
      Output('churn-rate', 'children')],
     [Input('productcategory-dropdown', 'value')]
 )
+@figure_cache.memoize('churn-by-category')
 def update_churn_by_category(selected_category):
-    filtered_df = df[df['Product Category'] == selected_category]
+    filtered_df = filter_index.select({'Product Category': selected_category})
     churn_by_category_fig = px.line(
         filtered_df,
         x='Churn',
@@ -1207,27 +989,27 @@ def update_churn_by_category(selected_category):
     return churn_by_category_fig, total_customers, churn_rate
 
 #TAB-6
-@app.callback(
+@background_jobs.callback(
+    app,
     Output('analysis-result', 'figure'),
-    [Input('analysis-type', 'value')]
+    [Input('analysis-type', 'value')],
+    memoize=figure_cache.memoize('purchase-behavior'),
 )
 def update_graph(selected_analysis):
     if selected_analysis == 'avg_transactions':
         # Calculate average transactions per customer
-        avg_transactions = df.groupby('Customer ID')['Purchase Date'].count().mean()
+        avg_transactions = customer_metrics.table('Customer ID')['Frequency'].mean()
 
         # Create a simple bar chart
         fig = px.bar(x=['Average Transactions per Customer'], y=[avg_transactions], title='Average Transactions per Customer',template="plotly_dark" ,color_discrete_sequence=[px.colors.qualitative.Plotly[0]])
         fig.update_layout(title_x=0.5)
 
     elif selected_analysis == 'avg_time_between_purchases':
-        # Calculate average time between consecutive purchases
-        # (You'll need to adjust this based on your specific date columns)
-        df['Purchase Date'] = pd.to_datetime(df['Purchase Date'])
-        df['Time Between Purchases'] = df.groupby('Customer ID')['Purchase Date'].diff().mean()
+        # Days between consecutive purchases of the same customer, computed once per process
+        gaps = customer_metrics.gaps('Customer ID')
 
         # Create a histogram
-        fig = px.histogram(df, x='Time Between Purchases', nbins=50, title='Average Time Between Consecutive Purchases',template="plotly_dark", color_discrete_sequence=[px.colors.qualitative.Plotly[1]])
+        fig = histogram(gaps, x=GAP, nbins=50, labels={GAP: 'Days Between Purchases'}, title='Average Time Between Consecutive Purchases',template="plotly_dark", color_discrete_sequence=[px.colors.qualitative.Plotly[1]])
         fig.update_layout(title_x=0.5)
     elif selected_analysis == 'correlation':
         # Calculate correlation between total purchase amount and churn
@@ -1240,11 +1022,10 @@ def update_graph(selected_analysis):
         threshold_frequency = 3  # Define your threshold for purchase frequency
         threshold_amount = 1000  # Define your threshold for total purchase amount
 
-        loyal_customers = df.groupby('Customer ID').agg({'Total Purchase Amount': 'sum', 'Purchase Date': 'count'})
-        loyal_customers = loyal_customers[(loyal_customers['Total Purchase Amount'] > threshold_amount) & (loyal_customers['Purchase Date'] > threshold_frequency)]
+        loyal_customers = customer_metrics.loyal('Customer ID', min_frequency=threshold_frequency, min_monetary=threshold_amount)
 
         # Create a scatter plot or table
-        fig = px.scatter(loyal_customers, x='Total Purchase Amount', y='Purchase Date', title='Identify Potential Loyal Customers', color_discrete_sequence=[px.colors.qualitative.Plotly[3]])
+        fig = px.scatter(loyal_customers, x='Monetary', y='Frequency', hover_data=['Customer ID'], labels={'Monetary': 'Total Purchase Amount', 'Frequency': 'Number of Purchases'}, title='Identify Potential Loyal Customers', color_discrete_sequence=[px.colors.qualitative.Plotly[3]])
         fig.update_layout(title_x=0.5)
 
     return fig
@@ -1255,26 +1036,36 @@ def update_graph(selected_analysis):
     Output('product-category-sales-graph', 'figure'),
     Output('returns-over-time-graph', 'figure'),
     Input('time-period-dropdown', 'value'),
-    Input('product-category-radio', 'value')
+    Input('product-category-radio', 'value'),
+    # Zooming a graph redraws it from the rows inside the visible range
+    Input('total-sales-graph', 'relayoutData'),
+    Input('product-category-sales-graph', 'relayoutData'),
+    Input('returns-over-time-graph', 'relayoutData')
 )
-def update_graphs(selected_time_period, selected_category):
-    # Filter data based on selected product category
-    filtered_df = df[df['Product Category'] == selected_category]
-
-    # a. Monthly or weekly trends in total sales
-    total_sales_fig = px.line(filtered_df, x='Purchase Date', y='Total Purchase Amount', 
-                              labels={'Total Purchase Amount': 'Total Sales'},template="plotly_dark",
-                              title=f'Trends in Total Sales ({selected_time_period})',
+def update_graphs(selected_time_period, selected_category, total_sales_zoom, category_sales_zoom, returns_zoom):
+    # Rows of the selected product category, in purchase date order
+    in_category = filter_index.mask({'Product Category': selected_category})
+    filtered_df = df.iloc[date_order[in_category[date_order]]]
+
+    # a. Monthly or weekly trends in total sales, at a finer interval when zoomed
+    level, total_sales = time_pyramid.window(zoom_window(total_sales_zoom), base=selected_time_period,
+                                             filters={'Product Category': selected_category})
+    total_sales_fig = px.line(total_sales,
+                              x='Purchase Date', y='Total Purchase Amount',
+                              labels={'Total Purchase Amount': 'Total Sales', 'Purchase Date': UNITS[level]},template="plotly_dark",
+                              title=f'Trends in Total Sales ({PERIODS[level]})',
                               color_discrete_sequence=[px.colors.qualitative.Plotly[0]])
-    total_sales_fig.update_layout(title_x=0.5)
+    total_sales_fig.update_layout(title_x=0.5, uirevision='zoom')
     # b. Seasonal patterns in selected product category sales
-    product_category_sales_fig = px.line(filtered_df, x='Purchase Date', y='Total Purchase Amount', template="plotly_dark",labels={'Total Purchase Amount': 'Total Sales'},
+    product_category_sales_fig = px.line(downsample(filtered_df, 'Purchase Date', 'Total Purchase Amount', zoom_window(category_sales_zoom)),
+    x='Purchase Date', y='Total Purchase Amount', template="plotly_dark",labels={'Total Purchase Amount': 'Total Sales'},
     title=f'Seasonal Patterns in {selected_category} Sales',color_discrete_sequence=[px.colors.qualitative.Plotly[1]])
-    product_category_sales_fig.update_layout(title_x=0.5)
+    product_category_sales_fig.update_layout(title_x=0.5, uirevision='zoom')
     # c. Trends in returns over time
-    returns_over_time_fig = px.line(filtered_df, x='Purchase Date', y='Returns',template="plotly_dark",labels={'Returns': 'Count of Returns'},title=f'Trends in Returns Over Time ({selected_category})',color_discrete_sequence=[px.colors.qualitative.Plotly[2]])
+    returns_over_time_fig = px.line(downsample(filtered_df, 'Purchase Date', 'Returns', zoom_window(returns_zoom)),
+    x='Purchase Date', y='Returns',template="plotly_dark",labels={'Returns': 'Count of Returns'},title=f'Trends in Returns Over Time ({selected_category})',color_discrete_sequence=[px.colors.qualitative.Plotly[2]])
 
-    returns_over_time_fig.update_layout(title_x=0.5)
+    returns_over_time_fig.update_layout(title_x=0.5, uirevision='zoom')
 
     return total_sales_fig, product_category_sales_fig, returns_over_time_fig
 
@@ -1286,15 +1077,16 @@ def update_graphs(selected_time_period, selected_category):
     Input('segment-dropdown', 'value')
 )
 def update_plots(selected_segment):
-    # Update 'Segment' column based on selected segment
-    df['Segment'] = selected_segment
+    # Label the rows with the selected segment in a derived frame; the shared dataset stays untouched
+    segmented = df.derive(['Customer Age', 'Total Purchase Amount', 'Quantity', 'Customer Name'],
+                          Segment=selected_segment)
 
     # Update scatter plot based on 'Segment' column
-    scatter_fig = px.scatter(df, x='Customer Age', y='Total Purchase Amount', color='Segment', size='Quantity', hover_data=['Customer Name'], title='Customer Segmentation', color_discrete_map=color_map, template="plotly_dark")  
+    scatter_fig = dense_scatter(segmented, x='Customer Age', y='Total Purchase Amount', color='Segment', size='Quantity', hover_data=['Customer Name'], title='Customer Segmentation', color_discrete_map=color_map, template="plotly_dark")  
     scatter_fig.update_layout(title_x=0.5)
 
     # Update revenue chart based on 'Segment' column
-    revenue_fig = px.histogram(df, x='Total Purchase Amount', color='Segment', nbins=30, title='Distribution of Total Purchase Amount by Segment', template='plotly_dark', color_discrete_map=color_map)
+    revenue_fig = histogram(segmented, x='Total Purchase Amount', color='Segment', nbins=30, title='Distribution of Total Purchase Amount by Segment', template='plotly_dark', color_discrete_map=color_map)
     revenue_fig.update_layout(title_x=0.5, bargap=0.2)
 
     # Display detailed information in the text area
@@ -1315,32 +1107,61 @@ def get_detailed_info(segment):
         return "No specific information available for this segment."
     
 #TAB-9 Download
-@app.callback(
+# Rows written per step of the CSV export, between progress updates
+EXPORT_BLOCK_ROWS = 50000
+
+@background_jobs.callback(
+    app,
     Output("download-data", "data"),
     [Input("csv-button", "n_clicks")],
     [State("column-checklist-row1", "value"),
-     State("column-checklist-row2", "value")]
+     State("column-checklist-row2", "value")],
+    progress=Output('download-status', 'children'),
+    running=[(Output('csv-button', 'disabled'), True, False)],
+    prevent_initial_call=True,
 )
-def download_data(n_clicks, selectedChecklist1, selectedChecklist2):
+def download_data(set_progress, n_clicks, selectedChecklist1, selectedChecklist2):
     if n_clicks > 0:
-        # Copy the DataFrame to avoid modifying the original DataFrame
-        dfCopy = df.copy()
-
         # Combine selected columns from both rows
         selected_columns = selectedChecklist1 + selectedChecklist2
+        columns = [col for col in df.columns if col not in selected_columns]
 
-        # Drop selected columns
-        dfCopy = dfCopy.drop(columns=selected_columns)
-
-        # Create a CSV string for the modified dataset
-        csv_string = dfCopy.to_csv(index=False, encoding='utf-8')
+        # Write the CSV block by block, without copying the DataFrame
+        buffer = io.StringIO()
+        for start in range(0, len(df), EXPORT_BLOCK_ROWS):
+            df.iloc[start:start + EXPORT_BLOCK_ROWS][columns].to_csv(buffer, index=False, header=start == 0)
+            set_progress(f"Exported {min(start + EXPORT_BLOCK_ROWS, len(df))} of {len(df)} rows")
+        set_progress("")
 
         # Return a dictionary specifying data and filename for download
-        return dcc.send_data_frame(dfCopy.to_csv, filename="E-commercedataset.csv", index=False)
+        return dcc.send_string(buffer.getvalue(), filename="E-commercedataset.csv")
 
     # Return PreventUpdate to prevent updating the download when the button is not clicked
     raise PreventUpdate
 
+# Serve only the block of rows the grid is showing, sorted and filtered on the server
+grid_query = GridQuery(df)
+
+@app.callback(
+    Output('ag-grid', 'getRowsResponse'),
+    Input('ag-grid', 'getRowsRequest')
+)
+def grid_rows(request):
+    if request is None:
+        raise PreventUpdate
+    return grid_query.rows(request)
+
+# Type-ahead search: the dropdown only holds the matches of what has been typed
+@app.callback(
+    Output('customer-dropdown1', 'options'),
+    [Input('customer-dropdown1', 'search_value')],
+    [State('customer-dropdown1', 'value')]
+)
+def search_customer_names(search_value, selected_customer):
+    if not search_value:
+        raise PreventUpdate
+    return customer_names.options(search_value, selected_customer)
+
 #TAB-10
 # Define callback to update graphs based on dropdown selections
 @app.callback(
@@ -1352,7 +1173,8 @@ def download_data(n_clicks, selectedChecklist1, selectedChecklist2):
 )
 def update_graphs(selected_customer, selected_category):
     # Filter DataFrame based on selected values
-    filtered_df = df[(df['Customer Name'] == selected_customer) & (df['Product Category'] == selected_category)]
+    customer_rows = customer_index.select('Customer Name', selected_customer)
+    filtered_df = customer_rows[customer_rows['Product Category'] == selected_category]
 
     # Scatter Plot
     scatter_plot = px.scatter(filtered_df, x='Customer Age', y='Total Purchase Amount', color='Gender', size='Quantity',title='Customer Age vs. Total Purchase Amount',color_discrete_sequence=[px.colors.qualitative.Dark24])
@@ -1384,6 +1206,17 @@ def update_graphs(selected_customer, selected_category):
 
     return scatter_plot, pie_chart, bar_chart
 
+# Type-ahead search: the dropdown only holds the matches of what has been typed
+@app.callback(
+    Output('customer-dropdown2', 'options'),
+    [Input('customer-dropdown2', 'search_value')],
+    [State('customer-dropdown2', 'value')]
+)
+def search_customer_ids(search_value, selected_customer):
+    if not search_value:
+        raise PreventUpdate
+    return customer_ids.options(search_value, selected_customer)
+
 #TAB-11
 # Define callback to update graphs based on dropdown selections
 @app.callback(
@@ -1395,7 +1228,7 @@ def update_graphs(selected_customer, selected_category):
 )
 def update_dashboard(selected_customer):
     # Filter DataFrame based on selected customer
-    filtered_df = df[df['Customer ID'] == selected_customer]
+    filtered_df = customer_index.select('Customer ID', selected_customer)
 
     # Scatter Plot
     scatter_plot = px.scatter(filtered_df, x='Customer Age', y='Total Purchase Amount', color='Gender',
@@ -1425,4 +1258,5 @@ def update_dashboard(selected_customer):
 
 # Run the app
 if __name__ == '__main__':
+    static_plots.prefetch()
     app.run_server(debug=True)
@@ -3,9 +3,10 @@ from dash import dcc, html
 from dash.dependencies import Input, Output
 import pandas as pd
 import plotly.express as px
+from dataset import load_dataset
 
 # Assume df is your DataFrame containing the data
-df = pd.read_csv("ecommerce_customer_data_large.csv", parse_dates=['Purchase Date'], low_memory=False)
+df = load_dataset()
 
 # Drop duplicates based on 'Customer Name' for demographic analysis
 unique_customers = df.drop_duplicates(subset='Customer Name')
@@ -127,7 +128,7 @@ def update_graph(age_group, gender):
     fig4.set_ylabel('Number of Purchases')
 
     # Most popular product categories by gender
-    popular_products_gender = filtered_data.groupby(['Gender', 'Product Category']).size().unstack()
+    popular_products_gender = filtered_data.groupby(['Gender', 'Product Category'], observed=True).size().unstack()
     fig5 = popular_products_gender.plot(kind='bar', stacked=True, figsize=(10, 6))
     fig5.set_title(f'Most Popular Product Categories for {gender}')
     fig5.set_ylabel('Number of Purchases')
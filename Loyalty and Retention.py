@@ -4,17 +4,18 @@ from dash.dependencies import Input, Output
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+from customer_metrics import customer_metrics, loyal_customers
+from dataset import load_dataset
+from histograms import histogram
 
 # Assume df is your DataFrame containing the data
-df = pd.read_csv("ecommerce_customer_data_large.csv", parse_dates=['Purchase Date'], low_memory=False)
+df = load_dataset()
+# One row per customer, built before 'Returns' is relabelled below
+customers = customer_metrics(df, 'Customer Name')
 
 # Convert Returns column to a more descriptive format for visualization
 df['Returns'] = df['Returns'].map({0: 'No Return', 1: 'Returned'})
 
-# Calculate transactions_per_customer and total_purchase_per_customer outside the callback
-transactions_per_customer = df.groupby('Customer Name').size()
-total_purchase_per_customer = df.groupby('Customer Name')['Total Purchase Amount'].sum()
-
 # Create a Dash web application
 app = dash.Dash(__name__)
 
@@ -45,25 +46,20 @@ app.layout = html.Div([
 def update_graph(selected_analysis):
     if selected_analysis == 'transactions_per_customer':
         # 1. Average number of transactions per customer
-        fig = px.histogram(transactions_per_customer, x=transactions_per_customer, title='Distribution of Number of Transactions Per Customer', labels={'x': 'Number of Transactions'})
+        fig = histogram(customers, x='Frequency', title='Distribution of Number of Transactions Per Customer', labels={'Frequency': 'Number of Transactions'})
     elif selected_analysis == 'time_between_purchases':
         # 2. Average time between consecutive purchases for a customer
-        df['Purchase Date'] = pd.to_datetime(df['Purchase Date'])
-        df_sorted = df.sort_values(['Customer Name', 'Purchase Date'])
-        df_sorted['Time Between Purchases'] = df_sorted.groupby('Customer Name')['Purchase Date'].diff()
-        average_time_between_purchases = df_sorted.groupby('Customer Name')['Time Between Purchases'].mean().dt.days
-        fig = px.histogram(average_time_between_purchases, x=average_time_between_purchases, title='Average Time Between Consecutive Purchases (in days)', labels={'x': 'Days'})
+        fig = histogram(customers, x='Mean Gap', title='Average Time Between Consecutive Purchases (in days)', labels={'Mean Gap': 'Days'})
     elif selected_analysis == 'total_purchase_by_churn':
         # 3. Correlation between total purchase amount and churn
         fig = px.histogram(df, x='Total Purchase Amount', color='Churn', nbins=20, title='Total Purchase Amount by Churn Status', labels={'x': 'Total Purchase Amount', 'color': 'Churn'})
         fig.update_layout(bargap=0.2)
     elif selected_analysis == 'potential_loyal_customers':
         # 4. Identify potential loyal customers based on frequency and amount of purchases
-        loyal_threshold_transactions = transactions_per_customer.quantile(0.75)
-        loyal_threshold_purchase = total_purchase_per_customer.quantile(0.75)
-        potential_loyal_customers = df.groupby('Customer Name').filter(lambda x: len(x) > loyal_threshold_transactions and x['Total Purchase Amount'].sum() > loyal_threshold_purchase)
+        # Above the 75th percentile of both the number of transactions and the total purchase amount
+        potential_loyal_customers = loyal_customers(customers, quantile=0.75)['Customer Name']
         fig = go.Figure()
-        fig.add_trace(go.Scatter(x=potential_loyal_customers['Customer Name'].unique(), y=[1] * len(potential_loyal_customers['Customer Name'].unique()), mode='markers', marker=dict(size=10), text=potential_loyal_customers['Customer Name'].unique()))
+        fig.add_trace(go.Scatter(x=potential_loyal_customers, y=[1] * len(potential_loyal_customers), mode='markers', marker=dict(size=10), text=potential_loyal_customers))
         fig.update_layout(title='Potential Loyal Customers', showlegend=False)
 
     return fig
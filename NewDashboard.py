@@ -4,29 +4,29 @@ from dash.dependencies import Input, Output
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from sklearn.cluster import KMeans
 from sklearn.preprocessing import StandardScaler
 from sklearn.impute import SimpleImputer
 from dash.dash_table.Format import Group
 from dash import dash_table
-
-df = pd.read_csv("ecommerce_customer_data_large.csv", parse_dates=['Purchase Date'], low_memory=False)
-df2 = pd.read_csv("ecommerce_customer_data_large.csv", parse_dates=['Purchase Date'], low_memory=False)
-df3 = pd.read_csv("ecommerce_customer_data_large.csv", parse_dates=['Purchase Date'], low_memory=False)
-df4 = pd.read_csv("ecommerce_customer_data_large.csv", parse_dates=['Purchase Date'], low_memory=False)
+from background_jobs import BackgroundJobs
+from customer_metrics import customer_metrics, loyal_customers
+from dataset import load_dataset
+from figure_cache import FigureCache
+from histograms import histogram
+from segment_models import SegmentModels, recommendation_text, recommended_k, sweep_figure
+
+# Load once; df2/df3 share the raw frame and df/df4 are date-indexed copies of it
+df3 = load_dataset()
+df2 = df3
+# One row per customer, shared by the loyalty and segmentation tabs
+customers = customer_metrics(df3, 'Customer Name')
 # Set 'Purchase Date' as the index
-df.set_index('Purchase Date', inplace=True)
-df4.set_index('Purchase Date', inplace=True)
+df = df3.set_index('Purchase Date')
+df4 = df3.set_index('Purchase Date')
 analysis_options = ['Product Category Count', 'Payment Method Count', 'Gender Count'] 
 
 # Convert Returns column to a more descriptive format for visualization
 df['Returns'] = df['Returns'].map({0: 'No Return', 1: 'Returned'})
-
-# Calculate transactions_per_customer and total_purchase_per_customer outside the callback
-transactions_per_customer = df.groupby('Customer Name').size()
-total_purchase_per_customer = df.groupby('Customer Name')['Total Purchase Amount'].sum()
-# Convert 'Purchase Date' to datetime
-df2['Purchase Date'] = pd.to_datetime(df2['Purchase Date'])
 df2['Purchase Month'] = df2['Purchase Date'].dt.to_period('M').astype(str)  # Convert to string
 
 # Create the 'Age Group' column
@@ -35,12 +35,11 @@ df['Age Group'] = pd.cut(df['Customer Age'], bins=age_bins, labels=['20-29', '30
 
 #Segementation
 # Create a customer-level dataset with relevant metrics for segmentation
-customer_data = df3.groupby('Customer Name').agg({
-    'Total Purchase Amount': ['sum', 'mean'],
-    'Returns': 'sum',
-    'Churn': 'max'
-}).reset_index()
-customer_data.columns = ['Customer Name', 'Total Purchases', 'Average Purchase Amount', 'Total Returns', 'Churn Status']
+customer_data = customers[['Customer Name', 'Monetary', 'Average Basket', 'Total Returns', 'Churn']].rename(columns={
+    'Monetary': 'Total Purchases',
+    'Average Basket': 'Average Purchase Amount',
+    'Churn': 'Churn Status'
+})
 
 # Standardize the data
 scaler = StandardScaler()
@@ -50,6 +49,14 @@ scaled_data = scaler.fit_transform(customer_data[['Total Purchases', 'Average Pu
 imputer = SimpleImputer(strategy='mean')
 scaled_data_imputed = imputer.fit_transform(scaled_data)
 
+# The segmentation callback waits for a fit that has not finished yet as a background job
+background_jobs = BackgroundJobs()
+# Cached KMeans models for every choice of the cluster dropdown
+segment_models = SegmentModels(customer_data, scaled_data_imputed,
+                               ['Total Purchases', 'Average Purchase Amount', 'Total Returns', 'Churn Status'])
+
+figure_cache = FigureCache()
+
 # Set up Dash app
 app = dash.Dash(__name__)
 
@@ -215,6 +222,11 @@ app.layout = html.Div([
         dash_table.DataTable(
             id='cluster-summary',
         ),
+
+        # Model selection: elbow and silhouette per cluster count, filled in as the fits finish
+        html.Div(id='sweep-progress'),
+        dcc.Graph(id='model-selection'),
+        dcc.Interval(id='sweep-interval', interval=1000),
         ]),#TAB-6 End
         
          #TAB-7
@@ -249,6 +261,7 @@ app.layout = html.Div([
      Output('box-plot', 'figure')],
     [Input('analysis-dropdown', 'value')]
 )
+@figure_cache.memoize('churn-analysis')
 def update_graph(selected_analysis):
     if selected_analysis == 'Product Category Count':
         bar_fig = px.bar(df['Product Category'].value_counts(), x=df['Product Category'].value_counts().index, y=df['Product Category'].value_counts(), title='Product Category Count')
@@ -277,25 +290,20 @@ def update_graph(selected_analysis):
 def update_graph(selected_analysis):
     if selected_analysis == 'transactions_per_customer':
         # 1. Average number of transactions per customer
-        fig = px.histogram(transactions_per_customer, x=transactions_per_customer, title='Distribution of Number of Transactions Per Customer', labels={'x': 'Number of Transactions'})
+        fig = histogram(customers, x='Frequency', title='Distribution of Number of Transactions Per Customer', labels={'Frequency': 'Number of Transactions'})
     elif selected_analysis == 'time_between_purchases':
         # 2. Average time between consecutive purchases for a customer
-        df['Purchase Date'] = pd.to_datetime(df['Purchase Date'])
-        df_sorted = df.sort_values(['Customer Name', 'Purchase Date'])
-        df_sorted['Time Between Purchases'] = df_sorted.groupby('Customer Name')['Purchase Date'].diff()
-        average_time_between_purchases = df_sorted.groupby('Customer Name')['Time Between Purchases'].mean().dt.days
-        fig = px.histogram(average_time_between_purchases, x=average_time_between_purchases, title='Average Time Between Consecutive Purchases (in days)', labels={'x': 'Days'})
+        fig = histogram(customers, x='Mean Gap', title='Average Time Between Consecutive Purchases (in days)', labels={'Mean Gap': 'Days'})
     elif selected_analysis == 'total_purchase_by_churn':
         # 3. Correlation between total purchase amount and churn
         fig = px.histogram(df, x='Total Purchase Amount', color='Churn', nbins=20, title='Total Purchase Amount by Churn Status', labels={'x': 'Total Purchase Amount', 'color': 'Churn'})
         fig.update_layout(bargap=0.2)
     elif selected_analysis == 'potential_loyal_customers':
         # 4. Identify potential loyal customers based on frequency and amount of purchases
-        loyal_threshold_transactions = transactions_per_customer.quantile(0.75)
-        loyal_threshold_purchase = total_purchase_per_customer.quantile(0.75)
-        potential_loyal_customers = df.groupby('Customer Name').filter(lambda x: len(x) > loyal_threshold_transactions and x['Total Purchase Amount'].sum() > loyal_threshold_purchase)
+        # Above the 75th percentile of both the number of transactions and the total purchase amount
+        potential_loyal_customers = loyal_customers(customers, quantile=0.75)['Customer Name']
         fig = go.Figure()
-        fig.add_trace(go.Scatter(x=potential_loyal_customers['Customer Name'].unique(), y=[1] * len(potential_loyal_customers['Customer Name'].unique()), mode='markers', marker=dict(size=10), text=potential_loyal_customers['Customer Name'].unique()))
+        fig.add_trace(go.Scatter(x=potential_loyal_customers, y=[1] * len(potential_loyal_customers), mode='markers', marker=dict(size=10), text=potential_loyal_customers))
         fig.update_layout(title='Potential Loyal Customers', showlegend=False)
 
     return fig
@@ -306,6 +314,7 @@ def update_graph(selected_analysis):
     dash.dependencies.Output('Payment-plot', 'figure'),
     [dash.dependencies.Input('Payment-dropdown', 'value')]
 )
+@figure_cache.memoize('payment-analysis')
 def update_selected_plot(selected_analysis):
     if selected_analysis == 'payment_distribution':
         return payment_distribution_fig
@@ -320,6 +329,7 @@ def update_selected_plot(selected_analysis):
     Output('output-graph', 'figure'),
     [Input('analysis-type', 'value')]
 )
+@figure_cache.memoize('purchase-analysis')
 def update_graph(selected_analysis):
     if selected_analysis == 'frequency':
         fig = px.histogram(df2, x='Purchase Month', title='Frequency Distribution of Purchase Dates',color_discrete_sequence=[px.colors.qualitative.Light24[2]]).update_xaxes(categoryorder='total descending')
@@ -347,7 +357,7 @@ def update_graph(age_range, selected_categories):
     filtered_df = df[(df['Customer Age'] >= age_range[0]) & (df['Customer Age'] <= age_range[1])]
     
     # Visualization 1: Percentage of transactions that resulted in returns
-    fig1 = px.histogram(filtered_df, x='Returns', title='Distribution of Transactions Resulting in Returns',color_discrete_sequence=[px.colors.qualitative.Set1])
+    fig1 = histogram(filtered_df, x='Returns', title='Distribution of Transactions Resulting in Returns',color_discrete_sequence=[px.colors.qualitative.Set1])
 
     # Define 'returned_products' here
     returned_products = filtered_df[filtered_df['Returns'] == 'Returned']
@@ -376,44 +386,39 @@ def update_graph(age_range, selected_categories):
     fig3.add_trace(go.Box(x=filtered_df['Returns'], y=filtered_df['Product Price'], name='Product Price'))
 
     # For Payment Methods
-    payment_counts = filtered_df.groupby(['Payment Method', 'Returns']).size().unstack(fill_value=0)
+    payment_counts = filtered_df.groupby(['Payment Method', 'Returns'], observed=True).size().unstack(fill_value=0)
     fig3.add_trace(go.Bar(x=payment_counts.index, y=payment_counts['Returned'], name='Returned'))
     fig3.add_trace(go.Bar(x=payment_counts.index, y=payment_counts['No Return'], name='No Return'))
 
     fig3.update_layout(title='Returns by Product Category, Prices, and Payment Method', barmode='group')
 
     # Visualization 4: Returns by age group and gender
-    fig4 = px.histogram(filtered_df, x='Age Group', color='Returns', barnorm='percent',
+    fig4 = histogram(filtered_df, x='Age Group', color='Returns', barnorm='percent',
                         title='Returns by Age Group', category_orders={'Age Group': ['20-29', '30-39', '40-49', '50-59', '60-69', '70-79']})
     
     # For Gender
-    fig5 = px.histogram(filtered_df, x='Gender', color='Returns', barnorm='percent', title='Returns by Gender')
+    fig5 = histogram(filtered_df, x='Gender', color='Returns', barnorm='percent', title='Returns by Gender')
 
     return fig1, fig2, fig3, fig4 , fig5
 
 #TAB-6
-@app.callback(
+@background_jobs.callback(
+    app,
     [Output('customer-segmentation', 'figure'),
      Output('cluster-summary', 'columns'),
      Output('cluster-summary', 'data')],
     [Input('cluster-dropdown', 'value')]
 )
 def update_graph(num_clusters):
-    # Apply KMeans clustering with the selected number of clusters
-    kmeans = KMeans(n_clusters=num_clusters, random_state=42)
-    customer_data['Cluster'] = kmeans.fit_predict(scaled_data_imputed)
+    # KMeans clustering with the selected number of clusters, fitted in the background at start-up
+    segmented = segment_models.segmented(num_clusters)
 
     # Cluster summary
-    cluster_summary = customer_data.groupby('Cluster').agg({
-        'Total Purchases': 'mean',
-        'Average Purchase Amount': 'mean',
-        'Total Returns': 'mean',
-        'Churn Status': 'mean'
-    }).reset_index()
+    cluster_summary = segment_models.summary(num_clusters)
 
     # Scatter plot
     fig = px.scatter(
-        customer_data,
+        segmented,
         x='Total Purchases',
         y='Average Purchase Amount',
         color='Cluster',
@@ -422,6 +427,24 @@ def update_graph(num_clusters):
 
     return fig, [{'name': col, 'id': col} for col in cluster_summary.columns], cluster_summary.to_dict('records')
 
+# Poll the model-selection sweep until every cluster count has been fitted
+@app.callback(
+    [Output('model-selection', 'figure'),
+     Output('sweep-progress', 'children'),
+     Output('sweep-interval', 'disabled')],
+    [Input('sweep-interval', 'n_intervals')]
+)
+def update_model_selection(n_intervals):
+    # Starts the fits if the app was not launched through __main__
+    segment_models.prefetch()
+    sweep = segment_models.sweep()
+    finished, total = segment_models.progress()
+    if finished < total:
+        return sweep_figure(sweep), f'Fitting cluster counts: {finished} of {total} done', False
+    # Every count is fitted or failed: stop polling
+    k = recommended_k(sweep) if not sweep.empty else None
+    return sweep_figure(sweep, k), recommendation_text(sweep, segment_models.failures()), True
+
 #TAB-7
 # Callback to update the graphs based on the selected time frequency
 @app.callback(
@@ -439,7 +462,7 @@ def update_graphs(selected_frequency):
                               title='Weekly Sales Trend')
 
     # Seasonal patterns in product category sales
-    monthly_product_sales = df4.groupby([df4.index.month, 'Product Category']).size().unstack()
+    monthly_product_sales = df4.groupby([df4.index.month, 'Product Category'], observed=True).size().unstack()
     seasonal_patterns = px.line(monthly_product_sales, x=monthly_product_sales.index, y=monthly_product_sales.columns,
                                 labels={'x': 'Month', 'y': 'Number of Sales'}, title='Monthly Sales Count by Product Category')
 
@@ -447,4 +470,6 @@ def update_graphs(selected_frequency):
 
 
 if __name__ == '__main__':
+    # Fit the segmentations in the background; the server does not wait for them
+    segment_models.prefetch()
     app.run_server(debug=True)
@@ -3,10 +3,13 @@ from dash import dcc, html
 import plotly.express as px
 import pandas as pd
 import seaborn as sns
+from dataset import load_dataset
+from figure_cache import FigureCache
 
 # Assuming df is your DataFrame with the payment data
-df = pd.read_csv("ecommerce_customer_data_large.csv", parse_dates=['Purchase Date'], low_memory=False)
+df = load_dataset()
 
+figure_cache = FigureCache()
 
 app = dash.Dash(__name__)
 
@@ -22,12 +25,6 @@ analysis_dropdown = dcc.Dropdown(
     multi=False
 )
 
-# Default figures
-payment_distribution_fig = px.histogram(df, x='Payment Method', title='Distribution of Payment Methods Used by Customers')
-average_purchase_fig = px.scatter(df, x='Payment Method', y='Total Purchase Amount', title='Average Purchase Amount by Payment Method')  # Changed to scatter plot
-correlation_fig = px.box(df, x='Payment Method', y='Product Price', color='Product Category',
-                         title='Distribution of Product Prices by Payment Method and Product Category')
-
 app.layout = html.Div(children=[
     html.H1("Payment Analysis"),
     
@@ -47,13 +44,16 @@ app.layout = html.Div(children=[
     dash.dependencies.Output('Payment-plot', 'figure'),
     [dash.dependencies.Input('Payment-dropdown', 'value')]
 )
+@figure_cache.memoize('payment-analysis')
 def update_selected_plot(selected_analysis):
+    # Figures are built on first selection; figure_cache serves them afterwards
     if selected_analysis == 'payment_distribution':
-        return payment_distribution_fig
+        return px.histogram(df, x='Payment Method', title='Distribution of Payment Methods Used by Customers')
     elif selected_analysis == 'average_purchase':
-        return average_purchase_fig
+        return px.scatter(df, x='Payment Method', y='Total Purchase Amount', title='Average Purchase Amount by Payment Method')  # Changed to scatter plot
     elif selected_analysis == 'correlation_plot':
-        return correlation_fig
+        return px.box(df, x='Payment Method', y='Product Price', color='Product Category',
+                      title='Distribution of Product Prices by Payment Method and Product Category')
 
 
 if __name__ == '__main__':
@@ -3,13 +3,15 @@ from dash import dcc, html
 from dash.dependencies import Input, Output
 import pandas as pd
 import plotly.express as px
+from dataset import load_dataset
+from figure_cache import FigureCache
 
 # Assume df is your DataFrame containing the data
-df = pd.read_csv("ecommerce_customer_data_large.csv", parse_dates=['Purchase Date'], low_memory=False)
-# Convert 'Purchase Date' to datetime
-df['Purchase Date'] = pd.to_datetime(df['Purchase Date'])
+df = load_dataset()
 df['Purchase Month'] = df['Purchase Date'].dt.to_period('M').astype(str)  # Convert to string
 
+figure_cache = FigureCache()
+
 # Create a Dash web application
 app = dash.Dash(__name__)
 
@@ -38,6 +40,7 @@ app.layout = html.Div([
     Output('output-graph', 'figure'),
     [Input('analysis-type', 'value')]
 )
+@figure_cache.memoize('purchase-analysis')
 def update_graph(selected_analysis):
     if selected_analysis == 'frequency':
         fig = px.histogram(df, x='Purchase Month', title='Frequency Distribution of Purchase Dates',color_discrete_sequence=[px.colors.qualitative.Light24[2]]).update_xaxes(categoryorder='total descending')
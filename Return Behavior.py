@@ -4,9 +4,11 @@ from dash.dependencies import Input, Output
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+from dataset import load_dataset
+from histograms import histogram
 
 # Assume df is your DataFrame containing the data
-df = pd.read_csv("ecommerce_customer_data_large.csv", parse_dates=['Purchase Date'], low_memory=False)
+df = load_dataset()
 
 # Convert Returns column to a more descriptive format for visualization
 df['Returns'] = df['Returns'].map({0: 'No Return', 1: 'Returned'})
@@ -61,7 +63,7 @@ def update_graph(age_range, selected_categories):
     filtered_df = df[(df['Customer Age'] >= age_range[0]) & (df['Customer Age'] <= age_range[1])]
     
     # Visualization 1: Percentage of transactions that resulted in returns
-    fig1 = px.histogram(filtered_df, x='Returns', title='Distribution of Transactions Resulting in Returns',color_discrete_sequence=[px.colors.qualitative.Set1])
+    fig1 = histogram(filtered_df, x='Returns', title='Distribution of Transactions Resulting in Returns',color_discrete_sequence=[px.colors.qualitative.Set1])
 
     # Define 'returned_products' here
     returned_products = filtered_df[filtered_df['Returns'] == 'Returned']
@@ -90,18 +92,18 @@ def update_graph(age_range, selected_categories):
     fig3.add_trace(go.Box(x=filtered_df['Returns'], y=filtered_df['Product Price'], name='Product Price'))
 
     # For Payment Methods
-    payment_counts = filtered_df.groupby(['Payment Method', 'Returns']).size().unstack(fill_value=0)
+    payment_counts = filtered_df.groupby(['Payment Method', 'Returns'], observed=True).size().unstack(fill_value=0)
     fig3.add_trace(go.Bar(x=payment_counts.index, y=payment_counts['Returned'], name='Returned'))
     fig3.add_trace(go.Bar(x=payment_counts.index, y=payment_counts['No Return'], name='No Return'))
 
     fig3.update_layout(title='Returns by Product Category, Prices, and Payment Method', barmode='group')
 
     # Visualization 4: Returns by age group and gender
-    fig4 = px.histogram(filtered_df, x='Age Group', color='Returns', barnorm='percent',
+    fig4 = histogram(filtered_df, x='Age Group', color='Returns', barnorm='percent',
                         title='Returns by Age Group', category_orders={'Age Group': ['20-29', '30-39', '40-49', '50-59', '60-69', '70-79']})
     
     # For Gender
-    fig5 = px.histogram(filtered_df, x='Gender', color='Returns', barnorm='percent', title='Returns by Gender')
+    fig5 = histogram(filtered_df, x='Gender', color='Returns', barnorm='percent', title='Returns by Gender')
 
     return fig1, fig2, fig3, fig4 , fig5
 
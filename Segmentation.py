@@ -3,22 +3,25 @@ from dash import dcc, html
 from dash.dependencies import Input, Output
 import pandas as pd
 import plotly.express as px
-from sklearn.cluster import KMeans
 from sklearn.preprocessing import StandardScaler
 from sklearn.impute import SimpleImputer
 from dash.dash_table.Format import Group
 import dash_table
+from background_jobs import BackgroundJobs
+from customer_metrics import customer_metrics
+from dataset import load_dataset
+from segment_models import SegmentModels, recommendation_text, recommended_k, sweep_figure
 
 # Assume df is your DataFrame containing the data
-df = pd.read_csv("ecommerce_customer_data_large.csv", parse_dates=['Purchase Date'], low_memory=False)
+df = load_dataset()
 
 # Create a customer-level dataset with relevant metrics for segmentation
-customer_data = df.groupby('Customer Name').agg({
-    'Total Purchase Amount': ['sum', 'mean'],
-    'Returns': 'sum',
-    'Churn': 'max'
-}).reset_index()
-customer_data.columns = ['Customer Name', 'Total Purchases', 'Average Purchase Amount', 'Total Returns', 'Churn Status']
+customers = customer_metrics(df, 'Customer Name')
+customer_data = customers[['Customer Name', 'Monetary', 'Average Basket', 'Total Returns', 'Churn']].rename(columns={
+    'Monetary': 'Total Purchases',
+    'Average Basket': 'Average Purchase Amount',
+    'Churn': 'Churn Status'
+})
 
 # Standardize the data
 scaler = StandardScaler()
@@ -28,6 +31,12 @@ scaled_data = scaler.fit_transform(customer_data[['Total Purchases', 'Average Pu
 imputer = SimpleImputer(strategy='mean')
 scaled_data_imputed = imputer.fit_transform(scaled_data)
 
+# The segmentation callback waits for a fit that has not finished yet as a background job
+background_jobs = BackgroundJobs()
+# Cached KMeans models for every choice of the cluster dropdown
+segment_models = SegmentModels(customer_data, scaled_data_imputed,
+                               ['Total Purchases', 'Average Purchase Amount', 'Total Returns', 'Churn Status'])
+
 # Dash web application
 app = dash.Dash(__name__)
 
@@ -52,31 +61,31 @@ app.layout = html.Div([
     dash_table.DataTable(
         id='cluster-summary',
     ),
+
+    # Model selection: elbow and silhouette per cluster count, filled in as the fits finish
+    html.Div(id='sweep-progress'),
+    dcc.Graph(id='model-selection'),
+    dcc.Interval(id='sweep-interval', interval=1000),
 ])
 
 # Callback to update the graphs based on the selected number of clusters
-@app.callback(
+@background_jobs.callback(
+    app,
     [Output('customer-segmentation', 'figure'),
      Output('cluster-summary', 'columns'),
      Output('cluster-summary', 'data')],
     [Input('cluster-dropdown', 'value')]
 )
 def update_graph(num_clusters):
-    # Apply KMeans clustering with the selected number of clusters
-    kmeans = KMeans(n_clusters=num_clusters, random_state=42)
-    customer_data['Cluster'] = kmeans.fit_predict(scaled_data_imputed)
+    # KMeans clustering with the selected number of clusters, fitted in the background at start-up
+    segmented = segment_models.segmented(num_clusters)
 
     # Cluster summary
-    cluster_summary = customer_data.groupby('Cluster').agg({
-        'Total Purchases': 'mean',
-        'Average Purchase Amount': 'mean',
-        'Total Returns': 'mean',
-        'Churn Status': 'mean'
-    }).reset_index()
+    cluster_summary = segment_models.summary(num_clusters)
 
     # Scatter plot
     fig = px.scatter(
-        customer_data,
+        segmented,
         x='Total Purchases',
         y='Average Purchase Amount',
         color='Cluster',
@@ -85,6 +94,26 @@ def update_graph(num_clusters):
 
     return fig, [{'name': col, 'id': col} for col in cluster_summary.columns], cluster_summary.to_dict('records')
 
+# Poll the model-selection sweep until every cluster count has been fitted
+@app.callback(
+    [Output('model-selection', 'figure'),
+     Output('sweep-progress', 'children'),
+     Output('sweep-interval', 'disabled')],
+    [Input('sweep-interval', 'n_intervals')]
+)
+def update_model_selection(n_intervals):
+    # Starts the fits if the app was not launched through __main__
+    segment_models.prefetch()
+    sweep = segment_models.sweep()
+    finished, total = segment_models.progress()
+    if finished < total:
+        return sweep_figure(sweep), f'Fitting cluster counts: {finished} of {total} done', False
+    # Every count is fitted or failed: stop polling
+    k = recommended_k(sweep) if not sweep.empty else None
+    return sweep_figure(sweep, k), recommendation_text(sweep, segment_models.failures()), True
+
 # Run the app
 if __name__ == '__main__':
+    # Fit the segmentations in the background; the server does not wait for them
+    segment_models.prefetch()
     app.run_server(debug=True)
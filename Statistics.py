@@ -1,12 +1,15 @@
 import pandas as pd
-import seaborn as sns
 import matplotlib.pyplot as plt
+from dataset import load_dataset
+from scatter_matrix import pair_plot
 
 # Load the dataset
 # Assuming df is your DataFrame
-df = pd.read_csv("ecommerce_customer_data_large.csv", parse_dates=['Purchase Date'])
+df = load_dataset()
 
 # Pairplot to visualize relationships between numerical variables
-sns.pairplot(df, hue='Churn', diag_kind='kde', markers=['o', 's'], palette='husl')
+# Scatter panes use a sample stratified by churn; histograms use every row
+numerical_columns = [col for col in df.select_dtypes(include='number').columns if col != 'Churn']
+pair_plot(df, numerical_columns, hue='Churn')
 plt.show()
 
@@ -3,10 +3,11 @@ from dash import html, dcc
 from dash.dependencies import Input, Output
 import pandas as pd
 import plotly.express as px
+from dataset import load_dataset
+from histograms import histogram
 
 # Load the dataset
-df = pd.read_csv("ecommerce_customer_data_large.csv")
-df['Purchase Date'] = pd.to_datetime(df['Purchase Date'])
+df = load_dataset()
 time_intervals = ['D', 'W', 'M', 'Y']  # 'D' for Daily, 'W' for Weekly, 'M' for Monthly, 'Y' for Yearly
 payment_methods = df['Payment Method'].unique()
 
@@ -90,7 +91,7 @@ def update_charts(selected_demographic, selected_groups, selected_age_range):
 
     # Bar chart for distribution of customers by age or gender
    # Bar chart for distribution of customers by age or gender
-    bar_chart = px.histogram(filtered_df, x=selected_demographic, title=f'Distribution of Customers by {selected_demographic}',
+    bar_chart = histogram(filtered_df, x=selected_demographic, title=f'Distribution of Customers by {selected_demographic}',
                                     labels={selected_demographic: selected_demographic, 'count': 'Count'},
                                     category_orders={'Gender': selected_groups} if selected_demographic == 'Gender' else None,
                                     color_discrete_sequence=px.colors.qualitative.D3_r, template="plotly_dark")
@@ -99,7 +100,7 @@ def update_charts(selected_demographic, selected_groups, selected_age_range):
 
 
     # Bar chart for average purchase amount by age or gender
-    avg_purchase_chart = px.bar(filtered_df.groupby(selected_demographic)['Total Purchase Amount'].mean().reset_index(),
+    avg_purchase_chart = px.bar(filtered_df.groupby(selected_demographic, observed=True)['Total Purchase Amount'].mean().reset_index(),
                                 x=selected_demographic, y='Total Purchase Amount',
                                 title=f'Average Purchase Amount by {selected_demographic}',
                                 labels={selected_demographic: selected_demographic, 'Total Purchase Amount': 'Average Purchase Amount'},
@@ -1,11 +1,17 @@
 import dash
 from dash import dcc, html
-from dash.dependencies import Input, Output
+from dash.dependencies import Input, Output, State
+from dash.exceptions import PreventUpdate
 import plotly.express as px
 import pandas as pd
+from customer_index import CustomerIndex
+from customer_search import PrefixIndex
+from dataset import load_dataset
 
 # Assuming you have already loaded your DataFrame 'df'
-df = pd.read_csv("ecommerce_customer_data_large.csv")
+df = load_dataset()
+customer_index = CustomerIndex(df)
+customer_ids = PrefixIndex(df['Customer ID'])
 
 # Create a Dash web application
 app = dash.Dash(__name__)
@@ -17,8 +23,8 @@ app.layout = html.Div([
         html.Label("Select Customer ID:"),
         dcc.Dropdown(
             id='customer-dropdown2',
-            options=[{'label': customer, 'value': customer} for customer in df['Customer ID'].unique()],
-            value=df['Customer ID'].unique()[0],
+            options=customer_ids.options(selected=df['Customer ID'].iloc[0]),
+            value=df['Customer ID'].iloc[0],
             style={'width': '50%','margin-left':'18rem'}
         ),
     ], style={'margin': '20px','text-align':'center'}),
@@ -51,6 +57,17 @@ app.layout = html.Div([
     ], style={'display': 'grid', 'grid-template-columns': '1fr 1fr', 'gap': '20px', 'margin': '20px'}),
 ])
 
+# Type-ahead search: the dropdown only holds the matches of what has been typed
+@app.callback(
+    Output('customer-dropdown2', 'options'),
+    [Input('customer-dropdown2', 'search_value')],
+    [State('customer-dropdown2', 'value')]
+)
+def search_customer_ids(search_value, selected_customer):
+    if not search_value:
+        raise PreventUpdate
+    return customer_ids.options(search_value, selected_customer)
+
 # Define callback to update graphs based on dropdown selections
 @app.callback(
     [Output('scatter-plot2', 'figure'),
@@ -61,7 +78,7 @@ app.layout = html.Div([
 )
 def update_dashboard(selected_customer):
     # Filter DataFrame based on selected customer
-    filtered_df = df[df['Customer ID'] == selected_customer]
+    filtered_df = customer_index.select('Customer ID', selected_customer)
 
     # Scatter Plot
     scatter_plot = px.scatter(filtered_df, x='Customer Age', y='Total Purchase Amount', color='Gender',
@@ -3,12 +3,19 @@ from dash import dcc, html
 from dash.dependencies import Input, Output
 import plotly.express as px
 import pandas as pd
+from cube import COUNT
+from dataset import load_dataset
+from downsample import zoom_window
+from time_pyramid import PERIODS, UNITS, TimePyramid
 
 # Load your dataset
-df = pd.read_csv("ecommerce_customer_data_large.csv")
-df['Purchase Date'] = pd.to_datetime(df['Purchase Date'])
+df = load_dataset()
 
 # Initialize the Dash app
+# Yearly to hourly aggregates behind the time-interval dropdown and the zoomable purchase date chart
+time_pyramid = TimePyramid(df, by=['Product Category'])
+time_buckets = time_pyramid.buckets
+
 app = dash.Dash(__name__)
 
 # Define the time intervals for the dropdown with full names
@@ -76,22 +83,35 @@ app.layout = html.Div(style={'background-color': '#f8f9fa', 'padding': '20px'},
      Output('average-quantity-chart', 'figure'),
      Output('product-category-chart', 'figure'),
      Output('total-purchase-distribution', 'figure')],
-    [Input('time-interval-dropdown', 'value')]
+    [Input('time-interval-dropdown', 'value'),
+     # Zooming the purchase date chart redraws it alone, at a finer interval
+     Input('purchase-date-chart', 'relayoutData')]
 )
-def update_graphs(selected_interval):
+def update_graphs(selected_interval, purchase_date_zoom):
+    zoomed = dash.callback_context.triggered[0]['prop_id'] == 'purchase-date-chart.relayoutData'
+
     # Frequency distribution of purchase dates
-    df_resampled = df.set_index('Purchase Date').resample(selected_interval).count().reset_index()
-    fig_purchase_date = px.line(df_resampled, x='Purchase Date', y='Customer ID', template='plotly_dark',title=f'Frequency Distribution of Purchase Dates ({[item["label"] for item in time_intervals if item["value"]==selected_interval][0]})', color_discrete_sequence=px.colors.qualitative.Vivid)
+    # Transactions per interval of the visible range; a new interval starts from the full range
+    level, purchase_counts = time_pyramid.window(zoom_window(purchase_date_zoom) if zoomed else None,
+                                                 base=selected_interval, transactions=False)
+    fig_purchase_date = px.line(purchase_counts, x='Purchase Date', y=COUNT, template='plotly_dark',title=f'Frequency Distribution of Purchase Dates ({PERIODS[level]})', color_discrete_sequence=px.colors.qualitative.Vivid,
+                                labels={'Purchase Date': UNITS[level]})
+    fig_purchase_date.update_layout(uirevision=selected_interval)
+    if zoomed:
+        return fig_purchase_date, dash.no_update, dash.no_update, dash.no_update
+
+    # Transactions per interval, rolled up from the cached daily aggregates
+    df_resampled = time_buckets.totals(selected_interval).reset_index()
 
     # Average quantity of products purchased
-    fig_average_quantity = px.bar(df_resampled, x='Purchase Date', y='Quantity',template='plotly_dark', title=f'Average Quantity of Products Purchased ({[item["label"] for item in time_intervals if item["value"]==selected_interval][0]})', color_discrete_sequence=px.colors.qualitative.Safe)  
+    fig_average_quantity = px.bar(df_resampled, x='Purchase Date', y=COUNT,template='plotly_dark', title=f'Average Quantity of Products Purchased ({[item["label"] for item in time_intervals if item["value"]==selected_interval][0]})', color_discrete_sequence=px.colors.qualitative.Safe)  
 
     # Most popular product categories and their average prices
-    df_category_grouped = df.groupby(pd.Grouper(key='Purchase Date', freq=selected_interval))['Product Category'].value_counts().unstack().fillna(0)
+    df_category_grouped = time_buckets.by_dimension(selected_interval, 'Product Category')
     fig_product_category = px.bar(df_category_grouped, barmode='stack', title=f'Distribution of Product Prices by Category ({[item["label"] for item in time_intervals if item["value"]==selected_interval][0]})', template='plotly_dark')
 
     # Scatter plot for total purchase amounts
-    df_total_purchase_scatter = df.set_index('Purchase Date').resample(selected_interval).sum().reset_index()
+    df_total_purchase_scatter = time_buckets.totals(selected_interval).reset_index()
     fig_total_purchase_distribution = px.scatter(df_total_purchase_scatter, x='Purchase Date', y='Total Purchase Amount',template='plotly_dark', title=f'Scatter Plot of Total Purchase Amounts ({[item["label"] for item in time_intervals if item["value"]==selected_interval][0]})', color_discrete_sequence= px.colors.qualitative.Light24)
 
     return fig_purchase_date, fig_average_quantity, fig_product_category, fig_total_purchase_distribution
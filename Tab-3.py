@@ -2,9 +2,11 @@ import dash
 from dash import dcc, html, Input, Output
 import plotly.express as px
 import pandas as pd
+from dataset import load_dataset
+from dense_scatter import dense_scatter
 
 # Read your CSV file
-df = pd.read_csv("ecommerce_customer_data_large.csv")
+df = load_dataset()
 
 # Get unique payment methods for dropdown options
 payment_methods = df['Payment Method'].unique()
@@ -68,7 +70,7 @@ def update_graphs(selected_payment_methods):
                                template="plotly_dark")
     bar_chart.update_layout(title_x=0.5,bargap=0.1)
     # Scatter plot with payment methods on X-axis, product category/price on Y-axis
-    scatter_plot = px.scatter(filtered_df, x='Payment Method', y='Product Price', color='Product Category',
+    scatter_plot = dense_scatter(filtered_df, x='Payment Method', y='Product Price', color='Product Category',
                               title='Correlation between Selected Payments and Product Category/Price',
                               color_discrete_sequence=px.colors.qualitative.Set3)
     scatter_plot.update_layout(title_x=0.5)
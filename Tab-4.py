@@ -3,9 +3,11 @@ from dash import html, dcc
 from dash.dependencies import Input, Output
 import plotly.express as px
 import pandas as pd
+from dataset import load_dataset
+from histograms import histogram
 
 # Assume df is your DataFrame
-df = pd.read_csv("ecommerce_customer_data_large.csv")
+df = load_dataset()
 return_percentage = (df['Returns'].count() / len(df)) * 100
 returns_df = df[df['Returns'].notnull()]
 
@@ -121,15 +123,15 @@ def update_visualizations(selected_category, selected_age_group, selected_age_ra
     pie_chart .update_layout(title_x=0.5)
 
     # Update the bar chart for correlation between returns and product categories
-    bar_chart_correlation = px.histogram(filtered_df, x='Product Category', color='Returns', barmode='group', title='Distribution of Product Category with Returns',color_discrete_sequence=px.colors.qualitative.Dark24_r,template="plotly_dark")
+    bar_chart_correlation = histogram(filtered_df, x='Product Category', color='Returns', barmode='group', title='Distribution of Product Category with Returns',color_discrete_sequence=px.colors.qualitative.Dark24_r,template="plotly_dark")
     bar_chart_correlation.update_layout(title_x=0.5)
 
     # Update the bar chart for returns by age group
-    bar_chart_age_group =px.histogram(filtered_df, x='Age', color='Returns', barmode='group',title='Distribution of Age with Returns',color_discrete_sequence=px.colors.qualitative.Light24,template="plotly_dark")
+    bar_chart_age_group =histogram(filtered_df, x='Age', color='Returns', barmode='group',title='Distribution of Age with Returns',color_discrete_sequence=px.colors.qualitative.Light24,template="plotly_dark")
     bar_chart_age_group.update_layout(title_x=0.5)
 
     # Update the bar chart for returns by gender
-    bar_chart_gender = px.histogram(filtered_df, x='Gender', color='Returns', barmode='group',title='Distribution of Gender with Returns',color_discrete_sequence=px.colors.qualitative.Set2,template="plotly_dark")
+    bar_chart_gender = histogram(filtered_df, x='Gender', color='Returns', barmode='group',title='Distribution of Gender with Returns',color_discrete_sequence=px.colors.qualitative.Set2,template="plotly_dark")
     bar_chart_gender.update_layout(title_x=0.5,bargap=0.2)
 
     return pie_chart, bar_chart_common_returns, bar_chart_correlation, bar_chart_age_group, bar_chart_gender
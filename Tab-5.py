@@ -3,9 +3,11 @@ from dash import dcc, html
 import pandas as pd
 import plotly.express as px
 from dash.dependencies import Input, Output
+from dataset import load_dataset
+from figure_cache import FigureCache
 
 # Load the dataset
-df = pd.read_csv("ecommerce_customer_data_large.csv")
+df = load_dataset()
 
 # Set color scheme
 colors = {
@@ -14,6 +16,8 @@ colors = {
     'accent': '#007BFF'  # Blue accent color
 }
 
+figure_cache = FigureCache()
+
 # Initialize the Dash app
 app = dash.Dash(__name__)
 
@@ -73,6 +77,7 @@ app.layout = html.Div(style={'backgroundColor': colors['background'], 'padding':
      Output('churn-rate', 'children')],
     [Input('product-category-dropdown', 'value')]
 )
+@figure_cache.memoize('churn-by-category')
 def update_churn_by_category(selected_category):
     filtered_df = df[df['Product Category'] == selected_category]
     churn_by_category_fig = px.line(
@@ -3,9 +3,17 @@ from dash import dcc, html
 from dash.dependencies import Input, Output
 import pandas as pd
 import plotly.express as px
+from customer_metrics import GAP, CustomerMetrics
+from dataset import load_dataset
+from figure_cache import FigureCache
+from histograms import histogram
 
 # Load your dataset
-df = pd.read_csv("ecommerce_customer_data_large.csv")
+df = load_dataset()
+
+figure_cache = FigureCache()
+# Per-customer metrics for the purchase behavior tab, built on first use
+customer_metrics = CustomerMetrics(df)
 
 # Initialize the Dash app
 app = dash.Dash(__name__)
@@ -42,23 +50,22 @@ app.layout = html.Div([
     Output('analysis-result', 'figure'),
     [Input('analysis-type', 'value')]
 )
+@figure_cache.memoize('purchase-behavior')
 def update_graph(selected_analysis):
     if selected_analysis == 'avg_transactions':
         # Calculate average transactions per customer
-        avg_transactions = df.groupby('Customer ID')['Purchase Date'].count().mean()
+        avg_transactions = customer_metrics.table('Customer ID')['Frequency'].mean()
 
         # Create a simple bar chart
         fig = px.bar(x=['Average Transactions per Customer'], y=[avg_transactions], title='Average Transactions per Customer', color_discrete_sequence=[px.colors.qualitative.Plotly[0]])
         fig.update_layout(title_x=0.5)
 
     elif selected_analysis == 'avg_time_between_purchases':
-        # Calculate average time between consecutive purchases
-        # (You'll need to adjust this based on your specific date columns)
-        df['Purchase Date'] = pd.to_datetime(df['Purchase Date'])
-        df['Time Between Purchases'] = df.groupby('Customer ID')['Purchase Date'].diff().mean()
+        # Days between consecutive purchases of the same customer, computed once per process
+        gaps = customer_metrics.gaps('Customer ID')
 
         # Create a histogram
-        fig = px.histogram(df, x='Time Between Purchases', nbins=50, title='Average Time Between Consecutive Purchases', color_discrete_sequence=[px.colors.qualitative.Plotly[1]])
+        fig = histogram(gaps, x=GAP, nbins=50, labels={GAP: 'Days Between Purchases'}, title='Average Time Between Consecutive Purchases', color_discrete_sequence=[px.colors.qualitative.Plotly[1]])
         fig.update_layout(title_x=0.5)
     elif selected_analysis == 'correlation':
         # Calculate correlation between total purchase amount and churn
@@ -71,11 +78,10 @@ def update_graph(selected_analysis):
         threshold_frequency = 3  # Define your threshold for purchase frequency
         threshold_amount = 1000  # Define your threshold for total purchase amount
 
-        loyal_customers = df.groupby('Customer ID').agg({'Total Purchase Amount': 'sum', 'Purchase Date': 'count'})
-        loyal_customers = loyal_customers[(loyal_customers['Total Purchase Amount'] > threshold_amount) & (loyal_customers['Purchase Date'] > threshold_frequency)]
+        loyal_customers = customer_metrics.loyal('Customer ID', min_frequency=threshold_frequency, min_monetary=threshold_amount)
 
         # Create a scatter plot or table
-        fig = px.scatter(loyal_customers, x='Total Purchase Amount', y='Purchase Date', title='Identify Potential Loyal Customers', color_discrete_sequence=[px.colors.qualitative.Plotly[3]])
+        fig = px.scatter(loyal_customers, x='Monetary', y='Frequency', hover_data=['Customer ID'], labels={'Monetary': 'Total Purchase Amount', 'Frequency': 'Number of Purchases'}, title='Identify Potential Loyal Customers', color_discrete_sequence=[px.colors.qualitative.Plotly[3]])
         fig.update_layout(title_x=0.5)
 
     return fig
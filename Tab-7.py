@@ -4,9 +4,19 @@ from dash.dependencies import Input, Output
 import pandas as pd
 import plotly.express as px
 import random
+import numpy as np
+from dataset import load_dataset
+from downsample import downsample, zoom_window
+from filter_index import FilterIndex
+from time_pyramid import PERIODS, UNITS, TimePyramid
 
 # Load dataset
-df = pd.read_csv("ecommerce_customer_data_large.csv")
+df = load_dataset()
+filter_index = FilterIndex(df)
+# Row positions sorted by purchase date, for the line charts drawn over raw transactions
+date_order = np.argsort(df['Purchase Date'].to_numpy(), kind='stable')
+# Yearly to hourly sales per product category, for the zoomable total sales chart
+time_pyramid = TimePyramid(df, by=['Product Category'])
 
 # Create Dash app
 app = dash.Dash(__name__)
@@ -61,30 +71,40 @@ app.layout = html.Div(style={'backgroundColor': '#f4f4f4', 'padding': '20px', 'f
     Output('product-category-sales-graph', 'figure'),
     Output('returns-over-time-graph', 'figure'),
     Input('time-period-dropdown', 'value'),
-    Input('product-category-radio', 'value')
+    Input('product-category-radio', 'value'),
+    # Zooming a graph redraws it from the rows inside the visible range
+    Input('total-sales-graph', 'relayoutData'),
+    Input('product-category-sales-graph', 'relayoutData'),
+    Input('returns-over-time-graph', 'relayoutData')
 )
-def update_graphs(selected_time_period, selected_category):
-    # Filter data based on selected product category
-    filtered_df = df[df['Product Category'] == selected_category]
+def update_graphs(selected_time_period, selected_category, total_sales_zoom, category_sales_zoom, returns_zoom):
+    # Rows of the selected product category, in purchase date order
+    in_category = filter_index.mask({'Product Category': selected_category})
+    filtered_df = df.iloc[date_order[in_category[date_order]]]
 
-    # a. Monthly or weekly trends in total sales
-    total_sales_fig = px.line(filtered_df, x='Purchase Date', y='Total Purchase Amount', 
-                              labels={'Total Purchase Amount': 'Total Sales'},
-                              title=f'Trends in Total Sales ({selected_time_period})',
+    # a. Monthly or weekly trends in total sales, at a finer interval when zoomed
+    level, total_sales = time_pyramid.window(zoom_window(total_sales_zoom), base=selected_time_period,
+                                             filters={'Product Category': selected_category})
+    total_sales_fig = px.line(total_sales,
+                              x='Purchase Date', y='Total Purchase Amount',
+                              labels={'Total Purchase Amount': 'Total Sales', 'Purchase Date': UNITS[level]},
+                              title=f'Trends in Total Sales ({PERIODS[level]})',
                               color_discrete_sequence=[px.colors.qualitative.Plotly[0]])
-    total_sales_fig.update_layout(title_x=0.5)
+    total_sales_fig.update_layout(title_x=0.5, uirevision='zoom')
     # b. Seasonal patterns in selected product category sales
-    product_category_sales_fig = px.line(filtered_df, x='Purchase Date', y='Total Purchase Amount', 
+    product_category_sales_fig = px.line(downsample(filtered_df, 'Purchase Date', 'Total Purchase Amount', zoom_window(category_sales_zoom)),
+                                         x='Purchase Date', y='Total Purchase Amount',
                                          labels={'Total Purchase Amount': 'Total Sales'},
                                          title=f'Seasonal Patterns in {selected_category} Sales',
                                          color_discrete_sequence=[px.colors.qualitative.Plotly[1]])
-    product_category_sales_fig.update_layout(title_x=0.5)
+    product_category_sales_fig.update_layout(title_x=0.5, uirevision='zoom')
     # c. Trends in returns over time
-    returns_over_time_fig = px.line(filtered_df, x='Purchase Date', y='Returns', 
+    returns_over_time_fig = px.line(downsample(filtered_df, 'Purchase Date', 'Returns', zoom_window(returns_zoom)),
+                                     x='Purchase Date', y='Returns',
                                      labels={'Returns': 'Count of Returns'},
                                      title=f'Trends in Returns Over Time ({selected_category})',
                                      color_discrete_sequence=[px.colors.qualitative.Plotly[2]])
-    returns_over_time_fig.update_layout(title_x=0.5)
+    returns_over_time_fig.update_layout(title_x=0.5, uirevision='zoom')
 
     return total_sales_fig, product_category_sales_fig, returns_over_time_fig
 
@@ -4,9 +4,12 @@ from dash.dependencies import Input, Output
 import plotly.express as px
 import pandas as pd
 import base64
+from dataset import load_dataset
+from dense_scatter import dense_scatter
+from histograms import histogram
 
 # Assuming 'df' is your DataFrame
-df = pd.read_csv("ecommerce_customer_data_large.csv")
+df = load_dataset()
 
 # Create a new column 'Segment' based on user segments
 df['Segment'] = 'Purchase Behavior'
@@ -87,15 +90,15 @@ app.layout = html.Div(style={'backgroundColor': '#f4f4f4', 'padding': '20px', 'f
     Input('segment-dropdown', 'value')
 )
 def update_plots(selected_segment):
-    # Update 'Segment' column based on selected segment
-    df['Segment'] = selected_segment
+    # Label the rows with the selected segment in a derived frame, leaving the shared df untouched
+    segmented = df[['Customer Age', 'Total Purchase Amount', 'Quantity', 'Customer Name']].assign(Segment=selected_segment)
 
     # Update scatter plot based on 'Segment' column
-    scatter_fig = px.scatter(df, x='Customer Age', y='Total Purchase Amount', color='Segment', size='Quantity', hover_data=['Customer Name'], title='Customer Segmentation', color_discrete_map=color_map, template="plotly_dark")  
+    scatter_fig = dense_scatter(segmented, x='Customer Age', y='Total Purchase Amount', color='Segment', size='Quantity', hover_data=['Customer Name'], title='Customer Segmentation', color_discrete_map=color_map, template="plotly_dark")  
     scatter_fig.update_layout(title_x=0.5)
 
     # Update revenue chart based on 'Segment' column
-    revenue_fig = px.histogram(df, x='Total Purchase Amount', color='Segment', nbins=30, title='Distribution of Total Purchase Amount by Segment', template='plotly_dark', color_discrete_map=color_map)
+    revenue_fig = histogram(segmented, x='Total Purchase Amount', color='Segment', nbins=30, title='Distribution of Total Purchase Amount by Segment', template='plotly_dark', color_discrete_map=color_map)
     revenue_fig.update_layout(title_x=0.5, bargap=0.2)
 
     # Display detailed information in the text area
@@ -1,11 +1,17 @@
 import dash
 from dash import dcc, html
-from dash.dependencies import Input, Output
+from dash.dependencies import Input, Output, State
+from dash.exceptions import PreventUpdate
 import plotly.express as px
 import pandas as pd
+from customer_index import CustomerIndex
+from customer_search import PrefixIndex
+from dataset import load_dataset
 
 # Assuming you have already loaded your DataFrame 'df'
-df = pd.read_csv("ecommerce_customer_data_large.csv")
+df = load_dataset()
+customer_index = CustomerIndex(df)
+customer_names = PrefixIndex(df['Customer Name'])
 
 # Create a Dash web application
 app = dash.Dash(__name__)
@@ -20,8 +26,8 @@ app.layout = html.Div([
     html.Label("Select Customer:"),
     dcc.Dropdown(
         id='customer-dropdown1',
-        options=[{'label': customer, 'value': customer} for customer in df['Customer Name'].unique()],
-        value=[df['Customer Name'].unique()[0]],  # Set default value as a list with a single element
+        options=customer_names.options(selected=df['Customer Name'].iloc[0]),
+        value=[df['Customer Name'].iloc[0]],  # Set default value as a list with a single element
         multi=True,  # Allow multiple selections
         style={'box-shadow': '0 4px 8px rgba(0,0,0,0.1)', 'border-radius': '8px','margin-bottom': '1rem'}
     ),
@@ -65,6 +71,17 @@ app.layout = html.Div([
     ], className="row", style={'display': 'grid', 'grid-template-columns': '1fr'}),
 ],style={'backgroundColor': '#f4f4f4', 'padding': '20px', 'font-family': 'Arial, sans-serif'})
 
+# Type-ahead search: the dropdown only holds the matches of what has been typed
+@app.callback(
+    Output('customer-dropdown1', 'options'),
+    [Input('customer-dropdown1', 'search_value')],
+    [State('customer-dropdown1', 'value')]
+)
+def search_customer_names(search_value, selected_customers):
+    if not search_value:
+        raise PreventUpdate
+    return customer_names.options(search_value, selected_customers)
+
 # Define callback to update graphs based on dropdown selections
 # Define callback to update graphs based on dropdown selections
 @app.callback(
@@ -76,10 +93,8 @@ app.layout = html.Div([
 )
 def update_graphs(selected_customers, selected_categories):
     # Handle multiple selections in the callback function
-    filtered_df = df[
-        (df['Customer Name'].isin(selected_customers)) &
-        (df['Product Category'].isin(selected_categories))
-    ]
+    customer_rows = customer_index.select('Customer Name', selected_customers)
+    filtered_df = customer_rows[customer_rows['Product Category'].isin(selected_categories)]
 
     # Scatter Plot
     scatter_plot = px.scatter(filtered_df, x='Customer Age', y='Total Purchase Amount',  size='Quantity',title='Customer Age vs. Total Purchase Amount',color_discrete_sequence=[px.colors.qualitative.Dark24])
@@ -1,12 +1,13 @@
 from prettytable import PrettyTable
 import pandas as pd
+from dataset import load_dataset
 
 # Assuming you've already read the CSV file and filled NaN values
-df = pd.read_csv("ecommerce_customer_data_large.csv")
+df = load_dataset()
 df['Returns'].fillna(df['Returns'].mean(), inplace=True)
 
 # Select numerical features
-numerical_features = df.select_dtypes(include=['int64', 'float64']).columns
+numerical_features = df.select_dtypes(include='number').columns
 
 # Display numerical features in a PrettyTable with two-point precision for mean, median, and standard deviation
 table_stats = PrettyTable(["Feature", "Mean", "Median", "Correlation", "Std Dev","Variance"])
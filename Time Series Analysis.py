@@ -3,9 +3,13 @@ from dash import dcc, html
 from dash.dependencies import Input, Output
 import pandas as pd
 import plotly.express as px
+from dataset import load_dataset
+from time_buckets import TimeBuckets
 
 # Assume df is your DataFrame containing the data
-df = pd.read_csv("ecommerce_customer_data_large.csv", parse_dates=['Purchase Date'], low_memory=False)
+df = load_dataset()
+# Daily aggregates behind the frequency dropdown; other intervals are rolled up and cached
+time_buckets = TimeBuckets(df)
 
 # Set 'Purchase Date' as the index
 df.set_index('Purchase Date', inplace=True)
@@ -47,15 +51,16 @@ app.layout = html.Div([
 )
 def update_graphs(selected_frequency):
     # Monthly or weekly trends in total sales
+    sales = time_buckets.totals(selected_frequency)
     if selected_frequency == 'M':
-        sales_trend = px.line(df.resample('M').sum(), x=df.resample('M').sum().index, y='Total Purchase Amount', labels={'x': 'Month', 'y': 'Total Sales'},
+        sales_trend = px.line(sales, x=sales.index, y='Total Purchase Amount', labels={'x': 'Month', 'y': 'Total Sales'},
                               title='Monthly Sales Trend')
     else:
-        sales_trend = px.line(df.resample('W').sum(), x=df.resample('W').sum().index, y='Total Purchase Amount', labels={'x': 'Week', 'y': 'Total Sales'},
+        sales_trend = px.line(sales, x=sales.index, y='Total Purchase Amount', labels={'x': 'Week', 'y': 'Total Sales'},
                               title='Weekly Sales Trend')
 
     # Seasonal patterns in product category sales
-    monthly_product_sales = df.groupby([df.index.month, 'Product Category']).size().unstack()
+    monthly_product_sales = df.groupby([df.index.month, 'Product Category'], observed=True).size().unstack()
     seasonal_patterns = px.line(monthly_product_sales, x=monthly_product_sales.index, y=monthly_product_sales.columns,
                                 labels={'x': 'Month', 'y': 'Number of Sales'}, title='Monthly Sales Count by Product Category')
 
@@ -0,0 +1,66 @@
+import functools
+import os
+
+from dataset import CACHE_DIR, dataset_version
+
+# Background execution for the heavy callbacks.
+# With the diskcache package installed, callbacks registered through BackgroundJobs.callback run as
+# Dash background callbacks: each job runs in its own process and is tracked in a local disk
+# cache (no broker), the request thread returns at once and the browser polls for the result.
+# When the inputs change while a job is running, Dash terminates it and starts a new one. Results
+# are cached on disk per input values and dataset version, so a repeated request does no work.
+# Without diskcache the same callbacks run synchronously in the request thread, as before.
+
+JOB_DIR = os.path.join(CACHE_DIR, 'jobs')
+# Seconds a cached result is kept
+RESULT_TTL = 24 * 3600
+
+
+def _no_progress(*values):
+    pass
+
+
+class BackgroundJobs:
+    """Registers callbacks as Dash background callbacks backed by a local diskcache job queue.
+
+    `version` identifies the data the results are computed from (by default the loaded
+    dataset's version); cached results of other versions are never returned.
+    """
+
+    def __init__(self, version=None, cache_dir=JOB_DIR, expire=RESULT_TTL):
+        self.version = version if version is not None else dataset_version()
+        self.manager = None
+        version_key = self.version
+        try:
+            import diskcache
+            from dash import DiskcacheManager
+            # The manager itself imports the multiprocess and psutil extras of dash[diskcache]
+            self.manager = DiskcacheManager(diskcache.Cache(cache_dir), cache_by=[lambda: version_key],
+                                            expire=expire)
+        except ImportError:
+            # diskcache or its extras not installed: callbacks run synchronously
+            pass
+
+    def callback(self, app, *dependencies, progress=None, running=None, cancel=None, memoize=None, **kwargs):
+        """app.callback that runs in the background when a job queue is available.
+
+        When `progress` is given the decorated function receives a `set_progress` function as its
+        first argument, in both modes; `running` and `cancel` only apply in the background.
+        `memoize` (such as FigureCache.memoize(...), for callbacks without `progress`) only wraps
+        the synchronous callback: in the background the job queue already caches results per input
+        values and dataset version, and a cache filled inside a job process is lost when it exits.
+        """
+        def decorator(func):
+            if self.manager is not None:
+                return app.callback(*dependencies, background=True, manager=self.manager, progress=progress,
+                                    running=running, cancel=cancel, **kwargs)(func)
+            if memoize is not None:
+                func = memoize(func)
+            if progress is None:
+                return app.callback(*dependencies, **kwargs)(func)
+
+            @functools.wraps(func)
+            def run(*args):
+                return func(_no_progress, *args)
+            return app.callback(*dependencies, **kwargs)(run)
+        return decorator
@@ -6,8 +6,9 @@ from scipy.stats import boxcox
 from scipy.stats import anderson
 import seaborn as sns
 import matplotlib.pyplot as plt
+from dataset import load_dataset
 
-df = pd.read_csv("ecommerce_customer_data_large.csv")
+df = load_dataset()
 print(df.info())
 print(df.isnull().sum())
 print(df.isnull().any())
@@ -26,7 +27,7 @@ print(cleaned_df_stats)
 #2 Out-liners
 from scipy import stats
 z_threshold = 3
-z_scores = stats.zscore(df.select_dtypes(include=['int64', 'float64']))
+z_scores = stats.zscore(df.select_dtypes(include='number'))
 outliers = (abs(z_scores) > z_threshold).all(axis=1)
 cleaned_outliers = df[~outliers]
 cleaned_outliers_stats = cleaned_outliers.describe()
@@ -40,7 +41,7 @@ print("\nCleaned Dataset without Outliers - Statistics:")
 print(cleaned_outliers_stats)
 
 #PCA
-numerical_features = df.select_dtypes(include=['int64', 'float64']).columns
+numerical_features = df.select_dtypes(include='number').columns
 
 # Standardize the data
 scaler = StandardScaler()
@@ -0,0 +1,252 @@
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from cube import DIMENSIONS, SUM_MEASURES, Cube
+from dataset import CACHE_DIR, DATA_FILE, DATE_COLUMNS, SCHEMA, dataset_version, string_array
+
+# Out-of-core storage of the transactions, for data that does not fit in a worker's memory.
+# The CSV is read in chunks and every column is written as a memory-mapped .npy file, in one
+# partition per Purchase Date month (the rows each chunk holds of a month are merged at the end).
+# Categorical columns are stored as int32 codes into one sorted list of categories for the whole
+# store, so partitions combine without re-encoding. Queries name a date window and filters:
+# partitions outside the window are never opened, and within a partition only the columns a
+# query reads are paged in, so memory is bounded by what one partition's columns touch.
+
+STORE_FILE = 'store.json'
+# CSV rows parsed per chunk while building a store
+CHUNK_ROWS = 200000
+TIME_COLUMN = DATE_COLUMNS[0]
+
+
+def _store_path(source):
+    return os.path.join(CACHE_DIR, f"{dataset_version(source)}-store")
+
+
+def _as_list(values):
+    if values is None:
+        return []
+    if isinstance(values, str) or not pd.api.types.is_list_like(values):
+        return [values]
+    return list(values)
+
+
+def _chunks(source, frame, chunksize):
+    # Typed chunks of `frame`, or of the CSV when no frame is given
+    if frame is not None:
+        for start in range(0, len(frame), chunksize):
+            yield frame.iloc[start:start + chunksize]
+        return
+    for chunk in pd.read_csv(source, parse_dates=DATE_COLUMNS, low_memory=False, chunksize=chunksize):
+        yield chunk.astype({col: dtype for col, dtype in SCHEMA.items()
+                            if col in chunk.columns and dtype != 'category'})
+
+
+def build_store(source=DATA_FILE, directory=None, chunksize=CHUNK_ROWS, frame=None):
+    """Write `source` as a month-partitioned column store in `directory` and return the directory.
+
+    Only one chunk of the CSV is held in memory at a time. When the typed `frame` of `source`
+    is already loaded, it is chunked instead and the CSV is not parsed again. The directory
+    appears atomically; if another process built it first, its copy is kept.
+    """
+    directory = directory or _store_path(source)
+    tmp_dir = f"{directory}.{os.getpid()}.tmp"
+    pieces_dir = os.path.join(tmp_dir, 'pieces')
+    os.makedirs(pieces_dir, exist_ok=True)
+    categorical = [col for col, dtype in SCHEMA.items() if dtype == 'category']
+    # Categories in first-seen order while building; sorted at the end
+    categories = {col: {} for col in categorical}
+    dtypes = {}
+    # Month -> [(piece directory, rows)], one piece per chunk holding rows of that month
+    pieces = {}
+    column_names = []
+    for number, chunk in enumerate(_chunks(source, frame, chunksize)):
+        column_names = list(chunk.columns)
+        columns = {}
+        for col in column_names:
+            if col in categories:
+                codes, uniques = pd.factorize(chunk[col])
+                seen = categories[col]
+                # Chunk codes to store codes; the extra last slot keeps a missing value (-1) at -1
+                lookup = np.array([seen.setdefault(value, len(seen)) for value in uniques] + [-1], dtype=np.int32)
+                columns[col] = lookup[codes]
+            elif chunk[col].dtype == object:
+                # Strings such as customer names are stored fixed-width
+                columns[col] = string_array(chunk[col])
+                dtypes[col] = 'str'
+            else:
+                columns[col] = chunk[col].to_numpy()
+                dtypes[col] = str(columns[col].dtype)
+        months = chunk[TIME_COLUMN].dt.to_period('M').astype(str).to_numpy()
+        for month in np.unique(months):
+            rows = np.flatnonzero(months == month)
+            piece = os.path.join(pieces_dir, f"{month}-{number:05d}")
+            os.makedirs(piece)
+            for position, col in enumerate(column_names):
+                np.save(os.path.join(piece, f"{position}.npy"), columns[col][rows], allow_pickle=False)
+            pieces.setdefault(month, []).append((piece, len(rows)))
+
+    layout = [{'name': col, 'file': f"{position}.npy"} for position, col in enumerate(column_names)]
+    ranks = {}
+    for entry in layout:
+        col = entry['name']
+        if col not in categories:
+            entry['dtype'] = dtypes[col]
+            continue
+        # Re-number the codes so the categories are sorted, like apply_schema's categoricals
+        values = list(categories[col])
+        order = sorted(range(len(values)), key=values.__getitem__)
+        entry['categories'] = [values[i] for i in order]
+        rank = np.empty(len(values) + 1, dtype=np.int32)
+        rank[order] = np.arange(len(values), dtype=np.int32)
+        rank[-1] = -1
+        ranks[col] = rank
+
+    # One part per month, however the CSV is ordered: the month's pieces are copied one at a
+    # time into a single file per column
+    parts = []
+    for month in sorted(pieces):
+        rows = sum(count for _, count in pieces[month])
+        os.makedirs(os.path.join(tmp_dir, month))
+        for entry in layout:
+            arrays = [np.load(os.path.join(piece, entry['file']), mmap_mode='r') for piece, _ in pieces[month]]
+            merged = np.lib.format.open_memmap(os.path.join(tmp_dir, month, entry['file']), mode='w+',
+                                               dtype=np.result_type(*arrays), shape=(rows,))
+            offset = 0
+            for values in arrays:
+                if entry['name'] in ranks:
+                    values = ranks[entry['name']][values]
+                merged[offset:offset + len(values)] = values
+                offset += len(values)
+            merged.flush()
+            del merged, arrays
+        parts.append({'month': month, 'path': month, 'rows': int(rows)})
+    shutil.rmtree(pieces_dir)
+
+    with open(os.path.join(tmp_dir, STORE_FILE), 'w') as f:
+        json.dump({'columns': layout, 'parts': parts}, f)
+    try:
+        os.rename(tmp_dir, directory)
+    except OSError:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return directory
+
+
+class ColumnStore:
+    """Month-partitioned, memory-mapped columns of the transactions, as written by build_store().
+
+    `start` and `end` bound Purchase Date (inclusive); `filters` map a column to the value(s)
+    to keep, as in Cube.query().
+    """
+
+    def __init__(self, directory):
+        with open(os.path.join(directory, STORE_FILE)) as f:
+            meta = json.load(f)
+        self.directory = directory
+        self.columns = [entry['name'] for entry in meta['columns']]
+        self.parts = meta['parts']
+        self.rows = sum(part['rows'] for part in self.parts)
+        self._files = {entry['name']: entry['file'] for entry in meta['columns']}
+        self._dtypes = {entry['name']: pd.CategoricalDtype(entry['categories']) if 'categories' in entry
+                        else np.dtype(entry['dtype']) for entry in meta['columns']}
+
+    @property
+    def months(self):
+        return sorted({part['month'] for part in self.parts})
+
+    def _parts(self, start=None, end=None):
+        # Month labels ('YYYY-MM') sort like the months, so the window is pruned on the labels
+        low = str(pd.Timestamp(start).to_period('M')) if start is not None else None
+        high = str(pd.Timestamp(end).to_period('M')) if end is not None else None
+        return [part for part in self.parts
+                if (low is None or part['month'] >= low) and (high is None or part['month'] <= high)]
+
+    def _array(self, part, col):
+        return np.load(os.path.join(self.directory, part['path'], self._files[col]), mmap_mode='r')
+
+    def _mask(self, part, start=None, end=None, filters=None):
+        # Rows of the part to keep, or None for all of them
+        masks = []
+        if start is not None or end is not None:
+            dates = self._array(part, TIME_COLUMN)
+            if start is not None:
+                masks.append(dates >= pd.Timestamp(start).to_datetime64())
+            if end is not None:
+                masks.append(dates <= pd.Timestamp(end).to_datetime64())
+        for col, values in (filters or {}).items():
+            values = _as_list(values)
+            dtype = self._dtypes[col]
+            if isinstance(dtype, pd.CategoricalDtype):
+                # Compare codes; values that are not categories match nothing
+                values = dtype.categories.get_indexer(values)
+                values = values[values >= 0]
+            masks.append(np.isin(self._array(part, col), values))
+        return np.logical_and.reduce(masks) if masks else None
+
+    def _column(self, col, values):
+        dtype = self._dtypes[col]
+        if isinstance(dtype, pd.CategoricalDtype):
+            return pd.Categorical.from_codes(values, dtype=dtype)
+        return values
+
+    def _empty(self, columns):
+        data = {}
+        for col in columns:
+            dtype = self._dtypes[col]
+            stored = np.int32 if isinstance(dtype, pd.CategoricalDtype) else dtype
+            data[col] = self._column(col, np.empty(0, dtype=stored))
+        return pd.DataFrame(data)
+
+    def scan(self, columns=None, start=None, end=None, filters=None):
+        """Yield (month, frame) per month in the window, with the rows matching `filters`.
+
+        A part read whole is a zero-copy view of its mapped files; otherwise only the
+        selected rows of the requested columns are copied.
+        """
+        columns = list(columns or self.columns)
+        for part in self._parts(start, end):
+            mask = self._mask(part, start, end, filters)
+            if mask is not None and not mask.any():
+                continue
+            data = {}
+            for col in columns:
+                values = self._array(part, col)
+                data[col] = self._column(col, values if mask is None else values[mask])
+            yield part['month'], pd.DataFrame(data, copy=False)
+
+    def frame(self, columns=None, start=None, end=None, filters=None):
+        """The rows and columns selected by scan(), as one in-memory frame."""
+        frames = [frame for _, frame in self.scan(columns, start, end, filters)]
+        if not frames:
+            return self._empty(columns or self.columns)
+        return pd.concat(frames, ignore_index=True)
+
+    def cube(self, dimensions=DIMENSIONS, age_width=None, time_freq=None, start=None, end=None, filters=None,
+             age_column='Age'):
+        """Cube over the selected rows, built one part at a time and combined.
+
+        Only the dimension, measure, age and date columns the cube needs are read.
+        """
+        columns = list(dimensions) + [col for col in SUM_MEASURES if col in self.columns]
+        if age_width:
+            columns.append(age_column)
+        if time_freq:
+            columns.append(TIME_COLUMN)
+        columns = list(dict.fromkeys(columns))
+        cubes = [Cube(frame, dimensions, age_width, time_freq, age_column=age_column, time_column=TIME_COLUMN)
+                 for _, frame in self.scan(columns, start, end, filters)]
+        if not cubes:
+            cubes = [Cube(self._empty(columns), dimensions, age_width, time_freq, age_column=age_column,
+                          time_column=TIME_COLUMN)]
+        return Cube.combine(cubes)
+
+
+def open_store(source=DATA_FILE, frame=None):
+    """The ColumnStore of `source`, built under CACHE_DIR on first use (from `frame` if given)."""
+    directory = _store_path(source)
+    if not os.path.exists(directory):
+        build_store(source, directory, frame=frame)
+    return ColumnStore(directory)
@@ -0,0 +1,89 @@
+import pandas as pd
+
+# Pre-aggregated cube over the transaction frame.
+# Rows are grouped once by the cube's dimensions (optionally with an age bucket and a time bucket)
+# and only additive measures are stored per cell, so any coarser view is a roll-up of cells:
+# sums and counts add up, and means are derived as sum / count after rolling up.
+
+DIMENSIONS = ['Product Category', 'Gender', 'Payment Method']
+# Additive measures summed per cell
+SUM_MEASURES = ['Total Purchase Amount', 'Quantity', 'Product Price', 'Returns', 'Churn']
+COUNT = 'Transactions'
+# Number of rows whose 'Returns' value is known
+RETURNS_RECORDED = 'Returns Recorded'
+
+
+def time_bucket(dates, freq):
+    # Label each date with the last day of its period, the same labels resample(freq) uses
+    if freq in ('h', 'H'):
+        # Hours are labelled with their start, like resample('h')
+        return dates.dt.floor('h')
+    return dates.dt.to_period(freq).dt.to_timestamp(how='end').dt.normalize()
+
+
+def filter_cells(cells, filters=None, ranges=None):
+    """Rows of `cells` whose dimensions match `filters` (values to keep) and `ranges` (inclusive)."""
+    for dim, values in (filters or {}).items():
+        if values is None:
+            values = []
+        elif isinstance(values, str) or not pd.api.types.is_list_like(values):
+            values = [values]
+        cells = cells[cells[dim].isin(values)]
+    for dim, (low, high) in (ranges or {}).items():
+        cells = cells[cells[dim].between(low, high)]
+    return cells
+
+
+class Cube:
+    """Additive aggregates of the transaction frame, queried by roll-up instead of groupby on rows."""
+
+    def __init__(self, df, dimensions=DIMENSIONS, age_width=None, time_freq=None,
+                 age_column='Age', time_column='Purchase Date'):
+        keys = [df[dim] for dim in dimensions]
+        if age_width:
+            keys.append(((df[age_column] // age_width) * age_width).rename('Age Bucket'))
+        if time_freq:
+            keys.append(time_bucket(df[time_column], time_freq).rename(time_column))
+        self.dimensions = [key.name for key in keys]
+        self.measures = [col for col in SUM_MEASURES if col in df.columns]
+
+        grouped = df.groupby(keys, observed=True)
+        cells = grouped[self.measures].sum()
+        cells[COUNT] = grouped.size()
+        if 'Returns' in df.columns:
+            cells[RETURNS_RECORDED] = grouped['Returns'].count()
+        self.cells = cells.reset_index()
+
+    @classmethod
+    def combine(cls, cubes):
+        """One cube from cubes with the same dimensions over disjoint rows (such as partitions of the data)."""
+        cubes = list(cubes)
+        cube = cls.__new__(cls)
+        cube.dimensions = cubes[0].dimensions
+        cube.measures = cubes[0].measures
+        cells = pd.concat([part.cells for part in cubes], ignore_index=True)
+        # Cells of the same dimension values add up, like rows of the same group
+        cube.cells = cells.groupby(cube.dimensions, observed=True).sum().reset_index()
+        return cube
+
+    def _filtered(self, filters=None, ranges=None):
+        return filter_cells(self.cells, filters, ranges)
+
+    def query(self, by=(), filters=None, ranges=None, measures=None):
+        """Roll the cube up to the `by` dimensions.
+
+        `filters` maps a dimension to the value(s) to keep and `ranges` maps a dimension to an
+        inclusive (low, high) range. Returns one row per combination of `by` values.
+        """
+        measures = list(measures or self.measures + [COUNT])
+        cells = self._filtered(filters, ranges)
+        if not by:
+            return cells[measures].sum().to_frame().T
+        return cells.groupby(list(by), observed=True)[measures].sum().reset_index()
+
+    def mean(self, measure, by=(), filters=None, ranges=None):
+        # Like Series.mean, 'Returns' is averaged over the rows where it is known
+        count = RETURNS_RECORDED if measure == 'Returns' and RETURNS_RECORDED in self.cells.columns else COUNT
+        result = self.query(by, filters, ranges, measures=[measure, count])
+        result[measure] = result[measure] / result[count]
+        return result.drop(columns=count)
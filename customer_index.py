@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+# Row lookup by customer for the per-customer drilldown tabs.
+# Row positions are sorted by customer once, so each customer's rows form one contiguous
+# slice of that order; a drilldown reads the slice instead of scanning the whole frame.
+
+KEYS = ['Customer ID', 'Customer Name']
+
+
+class _SortedKey:
+    def __init__(self, series):
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        # Stable, so each customer's rows keep their original relative order
+        self.order = np.argsort(codes, kind='stable')
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        missing = np.count_nonzero(codes == -1)
+        # Rows with a missing key sort first and are never selected
+        self.offsets = np.concatenate([[0], np.cumsum(counts)]) + missing
+        self.codes = {value: code for code, value in enumerate(uniques)}
+
+    def positions(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            return self.order[:0]
+        return self.order[self.offsets[code]:self.offsets[code + 1]]
+
+
+class CustomerIndex:
+    """Contiguous row slices per customer, looked up by Customer ID or Customer Name.
+
+    Like FilterIndex, rows are referred to by position: the index stays valid while columns
+    are added to the frame but must be rebuilt if rows are added, removed or reordered.
+    """
+
+    def __init__(self, df, keys=KEYS):
+        self.df = df
+        self._keys = {key: _SortedKey(df[key]) for key in keys if key in df.columns}
+
+    def positions(self, key, values):
+        """Positions of the rows whose `key` equals `values` (a value or a list of values), in frame order."""
+        if values is None:
+            return np.array([], dtype=np.intp)
+        sorted_key = self._keys[key]
+        if isinstance(values, str) or not np.iterable(values):
+            return sorted_key.positions(values)
+        slices = [sorted_key.positions(value) for value in set(values)]
+        if not slices:
+            return np.array([], dtype=np.intp)
+        return np.sort(np.concatenate(slices))
+
+    def select(self, key, values):
+        return self.df.iloc[self.positions(key, values)]
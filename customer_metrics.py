@@ -0,0 +1,180 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from dataset import CACHE_DIR
+
+# One row of metrics per customer, shared by the loyalty, segmentation and drilldown views.
+# The rows are sorted once by customer and purchase date; every metric is then a reduction over
+# each customer's contiguous run of rows (np.*.reduceat), instead of a groupby per callback.
+# Tables are cached per customer key, in memory and, when a dataset version is given, on disk.
+
+METRICS_DIR = os.path.join(CACHE_DIR, 'customer_metrics')
+# Bump when the table's columns change so stale disk copies are rebuilt
+METRICS_VERSION = 2
+DAY = np.timedelta64(1, 'D')
+# Column of CustomerMetrics.gaps(): days since the same customer's previous purchase
+GAP = 'Time Between Purchases'
+# Default loyalty cut-off: above this quantile of both purchase count and total spend
+LOYAL_QUANTILE = 0.75
+
+
+def _customer_runs(df, key):
+    # Row order by (customer, purchase date), stable, without rows whose key is missing;
+    # the sorted customer codes and dates; and the start of each customer's run
+    codes, customers = pd.factorize(df[key], sort=True)
+    dates = df['Purchase Date'].to_numpy(dtype='datetime64[ns]')
+    order = np.lexsort((dates, codes))
+    # Missing keys (code -1) sort first
+    order = order[np.searchsorted(codes[order], 0):]
+    codes, dates = codes[order], dates[order]
+    starts = np.flatnonzero(np.r_[len(codes) > 0, codes[1:] != codes[:-1]])
+    return customers, order, codes, dates, starts
+
+
+def _reduceat(ufunc, values, starts):
+    # ufunc.reduceat over each run; reduceat itself rejects an empty list of runs
+    return ufunc.reduceat(values, starts) if len(starts) else values[:0]
+
+
+def _gaps(dates, starts):
+    # Days since the previous date of the same run; NaN on the first row of each run
+    gaps = np.empty(len(dates))
+    gaps[0:1] = np.nan
+    gaps[1:] = np.diff(dates) / DAY
+    gaps[starts] = np.nan
+    return gaps
+
+
+def _run_quantile(values, codes, starts, counts, q):
+    # Linear-interpolated quantile q of the non-NaN values of each run (NaN for an empty run)
+    ordered = values[np.lexsort((values, codes))]  # NaN last within each run
+    position = q * np.maximum(counts - 1, 0)
+    low = np.floor(position).astype(np.intp)
+    high = np.ceil(position).astype(np.intp)
+    low_values, high_values = ordered[starts + low], ordered[starts + high]
+    return np.where(counts > 0, low_values + (high_values - low_values) * (position - low), np.nan)
+
+
+def purchase_gaps(df, key='Customer ID'):
+    """GAP of every row of `df`, in days, aligned with its rows (NaN on a customer's first purchase)."""
+    _, order, _, dates, starts = _customer_runs(df, key)
+    gaps = np.full(len(df), np.nan)
+    gaps[order] = _gaps(dates, starts)
+    return pd.Series(gaps, index=df.index, name=GAP)
+
+
+def customer_metrics(df, key='Customer ID', as_of=None):
+    """Recency, frequency, monetary value, returns, inter-purchase gaps and churn per `key`.
+
+    Recency is the number of days from the customer's last purchase to `as_of` (by default the
+    last purchase date in `df`); gaps are in days and NaN for single-purchase customers.
+    """
+    customers, order, codes, dates, starts = _customer_runs(df, key)
+    ends = np.r_[starts[1:], len(order)][:len(starts)] - 1
+
+    amounts = df['Total Purchase Amount'].to_numpy(dtype=float)[order]
+    returns = df['Returns'].to_numpy(dtype=float)[order]
+    churn = df['Churn'].to_numpy()[order]
+    gaps = _gaps(dates, starts)
+
+    frequency = np.diff(np.r_[starts, len(order)])
+    monetary = _reduceat(np.add, amounts, starts)
+    total_returns = _reduceat(np.add, np.nan_to_num(returns), starts)
+    returns_recorded = _reduceat(np.add, (~np.isnan(returns)).astype(np.int64), starts)
+    first, last = dates[starts], dates[ends]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return_rate = np.where(returns_recorded > 0, total_returns / returns_recorded, np.nan)
+        mean_gap = np.where(frequency > 1, (last - first) / DAY / (frequency - 1), np.nan)
+    if as_of is None:
+        as_of = dates.max() if len(dates) else np.datetime64('NaT')
+
+    return pd.DataFrame({
+        key: customers[codes[starts]],
+        'First Purchase': first,
+        'Last Purchase': last,
+        'Recency': (np.datetime64(as_of, 'ns') - last) / DAY,
+        'Frequency': frequency,
+        'Monetary': monetary,
+        'Average Basket': monetary / frequency,
+        'Total Returns': total_returns,
+        'Return Rate': return_rate,
+        'Mean Gap': mean_gap,
+        'Median Gap': _run_quantile(gaps, codes, starts, frequency - 1, 0.5),
+        'P90 Gap': _run_quantile(gaps, codes, starts, frequency - 1, 0.9),
+        'Min Gap': _reduceat(np.fmin, gaps, starts),
+        'Max Gap': _reduceat(np.fmax, gaps, starts),
+        'Churn': _reduceat(np.maximum, churn, starts),
+    })
+
+
+def loyal_customers(customers, min_frequency=None, min_monetary=None, quantile=LOYAL_QUANTILE):
+    """Rows of a customer_metrics() table with more purchases and a higher total spend than the thresholds.
+
+    A threshold left as None is the `quantile` of that metric over all customers.
+    """
+    frequency, monetary = customers['Frequency'], customers['Monetary']
+    if min_frequency is None:
+        min_frequency = frequency.quantile(quantile)
+    if min_monetary is None:
+        min_monetary = monetary.quantile(quantile)
+    return customers[(frequency > min_frequency) & (monetary > min_monetary)]
+
+
+class CustomerMetrics:
+    """customer_metrics() tables of a frame, built on first use per customer key and cached.
+
+    Pass the `version` of the data (e.g. dataset_version()) only when `df` is the unmodified
+    dataset, so tables of different frames never share a disk entry.
+    """
+
+    def __init__(self, df, version=None, cache_dir=METRICS_DIR):
+        self.df = df
+        self.version = version
+        self.cache_dir = cache_dir
+        self._tables = {}
+        self._gaps = {}
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{self.version}-{key.replace(' ', '_')}-m{METRICS_VERSION}.parquet")
+
+    def _load_or_build(self, key):
+        if self.version is None:
+            return customer_metrics(self.df, key)
+        path = self._path(key)
+        if os.path.exists(path):
+            return pd.read_parquet(path)
+        table = customer_metrics(self.df, key)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            table.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+        except ImportError:
+            # No Parquet engine installed: keep the table in memory only
+            pass
+        return table
+
+    def table(self, key='Customer ID'):
+        """One row per customer; treat it as read-only, it is shared by every caller."""
+        with self._lock:
+            if key not in self._tables:
+                self._tables[key] = self._load_or_build(key)
+            return self._tables[key]
+
+    def gaps(self, key='Customer ID'):
+        """One-column frame of purchase_gaps(), computed once per key; read-only like table()."""
+        with self._lock:
+            if key not in self._gaps:
+                self._gaps[key] = purchase_gaps(self.df, key).to_frame()
+            return self._gaps[key]
+
+    def loyal(self, key='Customer ID', rows=False, **thresholds):
+        """loyal_customers() of the `key` table; with `rows`, also the transactions of those customers."""
+        loyal = loyal_customers(self.table(key), **thresholds)
+        if rows:
+            return loyal, self.df[self.df[key].isin(loyal[key])]
+        return loyal
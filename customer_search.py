@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+# Type-ahead search for the customer pickers.
+# The layout ships only the selected customer; as the user types, a callback on the dropdown's
+# search_value returns the first MAX_MATCHES customers whose name (or any word of it) or ID
+# starts with the typed text. Matches are found by binary search over sorted lowercase keys.
+
+MAX_MATCHES = 20
+
+
+def _word_starts(text):
+    # "Jane Doe" is found by typing "ja" or "do"
+    words = text.split(' ')
+    return [' '.join(words[i:]) for i in range(len(words)) if words[i]]
+
+
+class PrefixIndex:
+    """Distinct values of a column, searchable by case-insensitive prefix."""
+
+    def __init__(self, series, limit=MAX_MATCHES):
+        self.limit = limit
+        values = pd.unique(series.dropna())
+        keys, positions = [], []
+        for position, value in enumerate(values):
+            for key in _word_starts(str(value).lower()):
+                keys.append(key)
+                positions.append(position)
+        order = np.argsort(keys, kind='stable')
+        self._keys = np.array(keys, dtype=str)[order]
+        self._positions = np.array(positions, dtype=np.int64)[order]
+        # Native Python values, ready to be serialized as dropdown options
+        self._values = np.asarray(values).tolist()
+
+    def search(self, text, limit=None):
+        prefix = str(text).strip().lower()
+        if not prefix:
+            return []
+        limit = limit or self.limit
+        # Every key starting with `prefix` sorts between prefix and prefix + U+FFFF
+        lo = np.searchsorted(self._keys, prefix, side='left')
+        hi = np.searchsorted(self._keys, prefix + '\uffff', side='left')
+        matches = []
+        for position in self._positions[lo:hi]:
+            value = self._values[position]
+            if value not in matches:
+                matches.append(value)
+                if len(matches) == limit:
+                    break
+        return matches
+
+    def options(self, text=None, selected=None):
+        """Dropdown options for the matches of `text`, always including the selected value(s)."""
+        if selected is None:
+            selected = []
+        elif isinstance(selected, str) or not np.iterable(selected):
+            selected = [selected]
+        values = list(selected) + [value for value in self.search(text or '') if value not in selected]
+        return [{'label': value, 'value': value} for value in values]
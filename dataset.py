@@ -0,0 +1,222 @@
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+# Shared data access for every dashboard.
+# The CSV is parsed once and stored as a typed columnar file (Parquet) next to it;
+# later loads read the columnar copy instead of re-parsing the CSV.
+# A multi-threaded app loads the frame read-only (SharedDataset): callbacks read it and build
+# derived frames, and any attempt to change it in place raises instead of racing other requests.
+# Worker processes can share one copy of it: the typed columns are published once as .npy files
+# and every process memory-maps them read-only, so the pages live once in the OS page cache.
+DATA_FILE = "ecommerce_customer_data_large.csv"
+CACHE_DIR = ".dataset_cache"
+DATE_COLUMNS = ['Purchase Date']
+
+# Declared column types applied at load time.
+# Low-cardinality strings become categoricals and bounded numerics use the narrowest
+# dtype that holds them; 'Returns' stays a float so NaN can mark an unknown return.
+# 'Customer Name' is left as strings: names are nearly unique, so a categorical would save
+# almost nothing and carry a category per customer into every derived frame.
+SCHEMA = {
+    'Customer ID': 'int32',
+    'Customer Age': 'int8',
+    'Age': 'int8',
+    'Gender': 'category',
+    'Product Category': 'category',
+    'Product Price': 'int16',
+    'Quantity': 'int8',
+    'Total Purchase Amount': 'int32',
+    'Payment Method': 'category',
+    'Returns': 'float32',
+    'Churn': 'int8',
+}
+# Bump when SCHEMA changes so stale columnar copies are rebuilt
+SCHEMA_VERSION = 2
+# Layout file of a published column directory
+COLUMNS_FILE = 'columns.json'
+
+
+def _cache_path(source):
+    # The cache key is the source file's size and mtime, so editing or replacing the CSV
+    # invalidates the columnar copy automatically
+    stat = os.stat(source)
+    stem = os.path.splitext(os.path.basename(source))[0]
+    return os.path.join(CACHE_DIR, f"{stem}-{stat.st_size}-{stat.st_mtime_ns}-v{SCHEMA_VERSION}.parquet")
+
+
+def dataset_version(source=DATA_FILE):
+    # Identifies the data a process loaded; derived values cached elsewhere are keyed on it
+    return os.path.splitext(os.path.basename(_cache_path(source)))[0]
+
+
+def string_array(column):
+    # Fixed-width unicode copy of a string column, which .npy stores without pickling;
+    # missing values become ''
+    return column.fillna('').to_numpy(dtype=str)
+
+
+def _columns_path(source):
+    return os.path.join(CACHE_DIR, f"{dataset_version(source)}-columns")
+
+
+def _read_source(source):
+    return pd.read_csv(source, parse_dates=DATE_COLUMNS, low_memory=False)
+
+
+def apply_schema(df):
+    return df.astype({col: dtype for col, dtype in SCHEMA.items() if col in df.columns})
+
+
+def _read_only(*args, **kwargs):
+    raise TypeError("the shared dataset is read-only; build a derived frame (e.g. df.derive(...)) instead")
+
+
+class SharedDataset(pd.DataFrame):
+    """Read-only transaction frame shared by every request, tagged with its dataset `version`.
+
+    Adding, replacing or deleting columns (also as attributes, df.Col = ...), in-place methods and
+    writes to the values all raise TypeError or ValueError. Everything derived from it (selections,
+    copies, assign(), groupby results) is an ordinary DataFrame that the caller owns. `attrs` is
+    not covered: it cannot be replaced, but it is a plain dict and its items can be changed.
+    """
+
+    _metadata = ['version']
+
+    def __init__(self, df, version=None, consolidate=True):
+        super().__init__(df)
+        self.version = version
+        if consolidate:
+            # Memory-mapped columns are left as they are: merging them would copy them into memory
+            self._consolidate_inplace()
+        # Value writes through .loc/.iloc/.at or a NumPy view fail on read-only buffers; pandas
+        # reads them like the zero-copy buffers of a Parquet load
+        for block in self._mgr.blocks:
+            values = block.values
+            values = getattr(values, '_ndarray', getattr(values, '_codes', values))
+            if isinstance(values, np.ndarray):
+                values.flags.writeable = False
+
+    @property
+    def _constructor(self):
+        return pd.DataFrame
+
+    __setitem__ = __delitem__ = insert = pop = update = _update_inplace = _read_only
+
+    def __setattr__(self, name, value):
+        # An attribute named like a column would otherwise shadow the column on this frame only
+        if name in ('index', 'columns', 'attrs') or ('_mgr' in self.__dict__ and name in self.columns):
+            _read_only()
+        super().__setattr__(name, value)
+
+    def derive(self, columns=None, **values):
+        """A new frame with `columns` (default all) plus `values` as extra columns, like assign()."""
+        frame = self if columns is None else self[list(columns)]
+        return frame.assign(**values)
+
+
+def bytes_per_row(df):
+    return df.memory_usage(deep=True).sum() / max(len(df), 1)
+
+
+def schema_report(source=DATA_FILE):
+    # Compare the memory footprint of the raw CSV frame with the typed frame
+    raw = _read_source(source)
+    typed = apply_schema(raw)
+    before, after = bytes_per_row(raw), bytes_per_row(typed)
+    print(f"Rows: {len(raw)}")
+    print(f"Bytes per row before schema: {before:.1f}")
+    print(f"Bytes per row after schema: {after:.1f} ({before / after:.1f}x smaller)")
+    print(pd.DataFrame({'Before': raw.dtypes.astype(str), 'After': typed.dtypes.astype(str)}))
+    return before, after
+
+
+def _load(source):
+    path = _cache_path(source)
+    if os.path.exists(path):
+        return pd.read_parquet(path)
+
+    df = apply_schema(_read_source(source))
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = path + '.tmp'
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+    except ImportError:
+        # No Parquet engine (pyarrow/fastparquet) installed: keep working from the CSV
+        pass
+    return df
+
+
+def publish_columns(df, directory):
+    """Write each column of `df` to `directory` as a .npy file (categoricals as codes plus categories).
+
+    The directory appears atomically; if another process published it first, its copy is kept.
+    """
+    tmp_dir = f"{directory}.{os.getpid()}.tmp"
+    os.makedirs(tmp_dir, exist_ok=True)
+    layout = []
+    for position, (name, column) in enumerate(df.items()):
+        entry = {'name': name, 'file': f"{position}.npy"}
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            values = column.cat.codes.to_numpy()
+            entry['categories'] = column.cat.categories.tolist()
+            entry['ordered'] = bool(column.cat.ordered)
+        elif column.dtype == object:
+            # Mapped as fixed-width strings; attaching turns them into a per-process object column
+            values = string_array(column)
+        else:
+            values = column.to_numpy()
+        np.save(os.path.join(tmp_dir, entry['file']), values, allow_pickle=False)
+        layout.append(entry)
+    with open(os.path.join(tmp_dir, COLUMNS_FILE), 'w') as f:
+        json.dump(layout, f)
+    try:
+        os.rename(tmp_dir, directory)
+    except OSError:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def attach_columns(directory):
+    """The frame published in `directory`, its columns memory-mapped read-only (nothing is copied)."""
+    with open(os.path.join(directory, COLUMNS_FILE)) as f:
+        layout = json.load(f)
+    columns = {}
+    for entry in layout:
+        values = np.load(os.path.join(directory, entry['file']), mmap_mode='r')
+        if 'categories' in entry:
+            values = pd.Categorical.from_codes(values, categories=entry['categories'], ordered=entry['ordered'])
+        columns[entry['name']] = values
+    return pd.DataFrame(columns, copy=False)
+
+
+def load_dataset(source=DATA_FILE, read_only=False, shared=False):
+    """Return the transaction frame with 'Purchase Date' parsed and SCHEMA applied.
+
+    Every call returns a new frame, so scripts may keep mutating their own copy. With
+    `read_only` it is a SharedDataset carrying dataset_version(), for apps that serve
+    concurrent requests from one frame. `shared` also makes it read-only, with its columns
+    memory-mapped from a copy published once under CACHE_DIR, so every process that loads
+    it this way (server workers, background jobs, render workers) shares the same pages.
+    """
+    if shared:
+        directory = _columns_path(source)
+        if not os.path.exists(directory):
+            publish_columns(_load(source), directory)
+        return SharedDataset(attach_columns(directory), version=dataset_version(source), consolidate=False)
+    df = _load(source)
+    if read_only:
+        return SharedDataset(df, version=dataset_version(source))
+    return df
+
+
+def load_shared_dataset(source=DATA_FILE):
+    # Module-level loader for worker processes (see StaticPlots)
+    return load_dataset(source, shared=True)
+
+
+if __name__ == '__main__':
+    schema_report()
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from scatter_matrix import bin_codes
+
+# Scatter plots whose browser cost stays bounded as the number of rows grows.
+# Up to WEBGL_THRESHOLD rows a plain SVG scatter is drawn; above it the same figure is drawn with
+# WebGL; above BINNING_THRESHOLD the rows are counted into a 2D (or 3D) grid on the server and
+# only the grid is sent: a density heatmap, or one marker per occupied voxel in 3D.
+
+WEBGL_THRESHOLD = 10000
+BINNING_THRESHOLD = 100000
+GRID_SIZE = 200
+VOXEL_GRID_SIZE = 30
+COUNT = 'Rows'
+
+
+def _grid_counts(indexes, sizes):
+    valid = np.logical_and.reduce([index >= 0 for index in indexes])
+    flat = np.ravel_multi_index([index[valid] for index in indexes], sizes)
+    return np.bincount(flat, minlength=int(np.prod(sizes))).reshape(sizes)
+
+
+def _layout_kwargs(kwargs):
+    # The px arguments that still apply to a binned figure
+    return {key: kwargs[key] for key in ('title', 'template') if key in kwargs}
+
+
+def density_heatmap(df, x, y=None, bins=GRID_SIZE, trendline=None, labels=None, **kwargs):
+    """Row counts of `x` against `y` (the row position when `y` is None) on a grid of bins."""
+    labels = labels or {}
+    x_series = df[x]
+    y_series = df[y] if y is not None else pd.Series(np.arange(len(df)), index=df.index)
+    x_index, x_labels = bin_codes(x_series, bins)
+    y_index, y_labels = bin_codes(y_series, bins)
+    counts = _grid_counts([y_index, x_index], (len(y_labels), len(x_labels)))
+    fig = go.Figure(go.Heatmap(x=x_labels, y=y_labels, z=np.where(counts == 0, np.nan, counts),
+                               colorscale='Viridis', colorbar=dict(title=COUNT)))
+
+    if trendline == 'ols' and pd.api.types.is_numeric_dtype(x_series) and pd.api.types.is_numeric_dtype(y_series):
+        # The least-squares line over every row, not over the bins
+        x_values, y_values = x_series.to_numpy(dtype=float), y_series.to_numpy(dtype=float)
+        finite = np.isfinite(x_values) & np.isfinite(y_values)
+        slope, intercept = np.polyfit(x_values[finite], y_values[finite], 1)
+        ends = np.array([x_values[finite].min(), x_values[finite].max()])
+        fig.add_trace(go.Scatter(x=ends, y=slope * ends + intercept, mode='lines', name='OLS trendline',
+                                 line=dict(color='red')))
+
+    fig.update_layout(xaxis_title=labels.get(x, x), yaxis_title=labels.get(y, y or 'index'),
+                      **_layout_kwargs(kwargs))
+    return fig
+
+
+def dense_scatter(df, x, y=None, webgl_threshold=WEBGL_THRESHOLD, binning_threshold=BINNING_THRESHOLD,
+                  bins=GRID_SIZE, **kwargs):
+    """px.scatter that switches to WebGL, then to a server-side density heatmap, as rows grow.
+
+    Colors, sizes, hover data and marginals only apply to the scatter modes.
+    """
+    if len(df) > binning_threshold:
+        return density_heatmap(df, x, y, bins=bins, trendline=kwargs.get('trendline'),
+                               labels=kwargs.get('labels'), **_layout_kwargs(kwargs))
+    if len(df) > webgl_threshold:
+        kwargs['render_mode'] = 'webgl'
+    return px.scatter(df, x=x, y=y, **kwargs)
+
+
+def dense_scatter_3d(df, x, y, z, binning_threshold=BINNING_THRESHOLD, bins=VOXEL_GRID_SIZE, **kwargs):
+    """px.scatter_3d (already WebGL) that draws one marker per occupied voxel above the threshold."""
+    if len(df) <= binning_threshold:
+        return px.scatter_3d(df, x=x, y=y, z=z, **kwargs)
+    indexes, centers = zip(*(bin_codes(df[col], bins) for col in (x, y, z)))
+    sizes = tuple(len(axis) for axis in centers)
+    counts = _grid_counts(list(indexes), sizes)
+    occupied = np.nonzero(counts)
+    voxels = pd.DataFrame({col: np.asarray(axis)[position] for col, axis, position in zip((x, y, z), centers, occupied)})
+    voxels[COUNT] = counts[occupied]
+    return px.scatter_3d(voxels, x=x, y=y, z=z, color=COUNT, size=COUNT, size_max=12,
+                         labels=kwargs.get('labels'), **_layout_kwargs(kwargs))
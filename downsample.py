@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+# Downsampling for line charts drawn over raw transactions.
+# A series is reduced to about POINTS points with Largest-Triangle-Three-Buckets, which keeps
+# the peaks and troughs that define its shape. When the user zooms, the callback receives the
+# visible x range through relayoutData and downsamples only the rows inside it, so detail
+# increases with zoom until every raw point in the window is drawn.
+
+# A graph in the three-column TAB-7 grid is about 500 px wide; two points per pixel
+POINTS = 1000
+
+
+def lttb(x, y, threshold=POINTS):
+    """Indices of the `threshold` points of (x, y) kept by Largest-Triangle-Three-Buckets.
+
+    `x` must be sorted. The first and last points are always kept.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    # Points 1 .. n-2 are split into threshold - 2 buckets
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.intp)
+    selected = np.empty(threshold, dtype=np.intp)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        # Twice the area of the triangle (previous point, candidate, next bucket's average)
+        area = np.abs((x[previous] - avg_x) * (y[start:end] - y[previous])
+                      - (x[previous] - x[start:end]) * (avg_y - y[previous]))
+        previous = start + int(np.argmax(area))
+        selected[i + 1] = previous
+    return selected
+
+
+def zoom_window(relayout_data, axis='xaxis'):
+    """The (start, end) range of `axis` set by a zoom or pan, or None for the full range."""
+    if not relayout_data or relayout_data.get(f'{axis}.autorange'):
+        return None
+    if f'{axis}.range[0]' in relayout_data and f'{axis}.range[1]' in relayout_data:
+        return relayout_data[f'{axis}.range[0]'], relayout_data[f'{axis}.range[1]']
+    if f'{axis}.range' in relayout_data:
+        start, end = relayout_data[f'{axis}.range']
+        return start, end
+    return None
+
+
+def _numeric(series):
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.to_numpy(dtype='datetime64[ns]').astype(np.int64)
+    return series.to_numpy(dtype=float)
+
+
+def downsample(frame, x, y, window=None, points=POINTS):
+    """Rows of `frame` (sorted by `x`) to draw as a line of `y`: the rows in `window`, reduced by LTTB.
+
+    One row on each side of the window is kept so the line runs to the edges of the view.
+    """
+    frame = frame[frame[y].notna()]
+    if window is not None:
+        if pd.api.types.is_datetime64_any_dtype(frame[x]):
+            bounds = _numeric(pd.to_datetime(pd.Series(list(window))))
+        else:
+            bounds = np.asarray(window, dtype=float)
+        x_values = _numeric(frame[x])
+        start = np.searchsorted(x_values, bounds[0], side='left')
+        end = np.searchsorted(x_values, bounds[1], side='right')
+        frame = frame.iloc[max(start - 1, 0):end + 1]
+    return frame.iloc[lttb(_numeric(frame[x]), _numeric(frame[y]), points)]
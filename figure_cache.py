@@ -0,0 +1,178 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+from plotly.utils import PlotlyJSONEncoder
+
+from dataset import CACHE_DIR, dataset_version
+
+# Memoized outputs of callbacks that depend only on their inputs and the loaded dataset.
+# Outputs are stored as Plotly JSON keyed on (callback id, dataset version, code version, input
+# values); a repeated request decodes the stored JSON instead of rebuilding the figures. The code
+# version hashes the callback's own bytecode, so editing a callback retires its stored figures.
+
+MAX_ENTRIES = 256
+MAX_BYTES = 64 * 1024 * 1024
+FIGURE_DIR = os.path.join(CACHE_DIR, 'figures')
+MAX_DISK_ENTRIES = 2048
+# Bump when shared plotting helpers (histograms, dense_scatter, ...) change what callbacks draw;
+# changes inside a memoized callback are picked up by code_version()
+FIGURE_VERSION = 1
+
+
+def code_version(func):
+    """Hash of the bytecode, names and constants of `func` and of the functions defined in it."""
+    digest = hashlib.sha256()
+
+    def add(code):
+        digest.update(code.co_code)
+        digest.update(repr(code.co_names).encode())
+        for const in code.co_consts:
+            if hasattr(const, 'co_code'):
+                # The repr of a code object holds its address, which differs per process
+                add(const)
+            elif isinstance(const, frozenset):
+                # Set order depends on the per-process string hash seed
+                digest.update(repr(sorted(const, key=repr)).encode())
+            else:
+                digest.update(repr(const).encode())
+
+    add(func.__code__)
+    return digest.hexdigest()[:16]
+
+
+class FigureCache:
+    """LRU cache of serialized callback outputs, bounded by entry count and total bytes.
+
+    `version` identifies the data the callbacks read; entries of another version are never
+    served. With `disk_dir`, entries are also written to that directory, so worker processes
+    serving the same dataset reuse each other's figures; callback ids must then be unique among
+    the apps sharing the directory.
+    """
+
+    def __init__(self, version=None, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES, disk_dir=None,
+                 max_disk_entries=MAX_DISK_ENTRIES):
+        self.version = version if version is not None else dataset_version()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_entries = max_disk_entries
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _key(self, callback_id, args, kwargs, code=None):
+        payload = json.dumps([callback_id, self.version, FIGURE_VERSION, code, args, kwargs], sort_keys=True,
+                             default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, key + '.json')
+
+    def _store(self, key, serialized):
+        # Caller holds the lock
+        if key in self._entries:
+            self._bytes -= len(self._entries.pop(key))
+        self._entries[key] = serialized
+        self._bytes += len(serialized)
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+            self.evictions += 1
+
+    def _read_disk(self, key):
+        try:
+            with open(self._disk_path(key), encoding='utf-8') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write_disk(self, key, serialized):
+        try:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            path = self._disk_path(key)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(serialized)
+            os.replace(tmp_path, path)
+            self._prune_disk()
+        except OSError:
+            # The disk tier is best effort; the in-memory tier still holds the entry
+            pass
+
+    def _prune_disk(self):
+        names = [name for name in os.listdir(self.disk_dir) if name.endswith('.json')]
+        if len(names) <= self.max_disk_entries:
+            return
+        paths = sorted((os.path.join(self.disk_dir, name) for name in names), key=os.path.getmtime)
+        for path in paths[:len(paths) - self.max_disk_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def lookup(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+        serialized = self._read_disk(key) if self.disk_dir else None
+        with self._lock:
+            if serialized is None:
+                self.misses += 1
+            else:
+                self.disk_hits += 1
+                self._store(key, serialized)
+        return serialized
+
+    def store(self, key, value):
+        serialized = json.dumps(value, cls=PlotlyJSONEncoder)
+        with self._lock:
+            self._store(key, serialized)
+        if self.disk_dir:
+            self._write_disk(key, serialized)
+
+    def memoize(self, callback_id):
+        """Decorator caching a callback's return value per combination of input values.
+
+        Only apply it to callbacks whose output depends on nothing but their inputs and the
+        dataset. Exceptions such as PreventUpdate are not cached.
+        """
+        def decorator(func):
+            code = code_version(func)
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                key = self._key(callback_id, args, kwargs, code)
+                serialized = self.lookup(key)
+                if serialized is not None:
+                    return json.loads(serialized)
+                value = func(*args, **kwargs)
+                self.store(key, value)
+                return value
+            return wrapper
+        return decorator
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+            }
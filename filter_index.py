@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+
+# Precomputed row selections for the categorical filters used by the dashboard callbacks.
+# Each (column, value) pair owns a boolean bitmap over the rows; a filter is answered by
+# OR-ing the bitmaps of the selected values and AND-ing across columns, without rescanning
+# the column data.
+
+DIMENSIONS = ['Gender', 'Product Category', 'Payment Method', 'Returns', 'Churn']
+AGE_COLUMN = 'Age'
+
+
+def _value_bitmaps(series):
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    bitmaps = {value: codes == code for code, value in enumerate(uniques)}
+    if (codes == -1).any():
+        # Missing values are selectable under the key None
+        bitmaps[None] = codes == -1
+    return bitmaps
+
+
+class FilterIndex:
+    """Per-value bitmaps over the categorical dimensions of a frame, plus a sorted code per age.
+
+    The index refers to rows by position, so it stays valid while columns are added to the
+    frame but must be rebuilt if rows are added, removed or reordered.
+    """
+
+    def __init__(self, df, dimensions=DIMENSIONS, age_column=AGE_COLUMN):
+        self.df = df
+        self.size = len(df)
+        self._bitmaps = {dim: _value_bitmaps(df[dim]) for dim in dimensions if dim in df.columns}
+
+        # Each row's position among the sorted distinct ages, in the narrowest integer type, so an
+        # age range is two comparisons on one small code column (no bitmap per age)
+        self._ages = np.array([], dtype=np.int64)
+        self._age_codes = np.zeros(self.size, dtype=np.int8)
+        if age_column in df.columns:
+            ages = df[age_column].to_numpy()
+            self._ages = np.unique(ages)
+            code_type = np.min_scalar_type(max(len(self._ages) - 1, 0))
+            self._age_codes = np.searchsorted(self._ages, ages).astype(code_type)
+
+    def values(self, dim):
+        return [value for value in self._bitmaps[dim] if value is not None]
+
+    def _none(self):
+        return np.zeros(self.size, dtype=bool)
+
+    def _all(self):
+        return np.ones(self.size, dtype=bool)
+
+    def any_of(self, dim, values):
+        # OR of the bitmaps of the selected values; unknown values select nothing
+        if values is None:
+            return self._none()
+        if isinstance(values, str) or not np.iterable(values):
+            values = [values]
+        bitmaps = self._bitmaps[dim]
+        selected = [bitmaps[value] for value in values if value in bitmaps]
+        if not selected:
+            return self._none()
+        return np.logical_or.reduce(selected)
+
+    def age_between(self, low, high):
+        # Inclusive on both ends, like Series.between
+        lo = np.searchsorted(self._ages, low, side='left')
+        hi = np.searchsorted(self._ages, high, side='right') - 1
+        if hi < lo:
+            return self._none()
+        return (self._age_codes >= lo) & (self._age_codes <= hi)
+
+    def mask(self, filters=None, age_range=None):
+        """AND together `filters` ({column: value or list of values}) and an optional age range."""
+        mask = self._all()
+        for dim, values in (filters or {}).items():
+            mask &= self.any_of(dim, values)
+        if age_range is not None:
+            mask &= self.age_between(*age_range)
+        return mask
+
+    def select(self, filters=None, age_range=None):
+        return self.df[self.mask(filters, age_range)]
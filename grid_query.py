@@ -0,0 +1,156 @@
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Server-side rows for the 'Download Dataset' AgGrid.
+# The grid runs with AG Grid's infinite row model and asks for one block of rows at a time
+# (getRowsRequest); only that block is serialized and sent to the browser.
+
+BLOCK_SIZE = 100
+# Number of distinct sort/filter combinations whose row order is kept in memory
+MAX_CACHED_QUERIES = 8
+
+
+def column_defs(df):
+    # Pick the AG Grid filter that matches each column's dtype
+    defs = []
+    for col in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[col]):
+            grid_filter = 'agDateColumnFilter'
+        elif pd.api.types.is_numeric_dtype(df[col]):
+            grid_filter = 'agNumberColumnFilter'
+        else:
+            grid_filter = 'agTextColumnFilter'
+        defs.append({'headerName': col, 'field': col, 'filter': grid_filter, 'sortable': True})
+    return defs
+
+
+def grid_options(page_size=20):
+    return {
+        'cacheBlockSize': BLOCK_SIZE,
+        'maxBlocksInCache': 10,
+        'rowBuffer': 0,
+        'rowHeight': 40,
+        'domLayout': 'autoHeight',
+        'animateRows': True,
+        'pagination': True,
+        'paginationPageSize': page_size,
+    }
+
+
+def data_grid(df, component_id='ag-grid', page_size=20, **kwargs):
+    """AgGrid over `df` with the infinite row model; other keyword arguments are AgGrid props.
+
+    rowModelType has to be a top-level prop: dash-ag-grid only sets up the getRowsRequest
+    datasource from it, not from dashGridOptions.
+    """
+    import dash_ag_grid as dag
+    return dag.AgGrid(id=component_id, rowModelType='infinite', columnDefs=column_defs(df),
+                      dashGridOptions=grid_options(page_size), **kwargs)
+
+
+def _text_mask(series, test):
+    # Categoricals are tested once per category instead of once per row
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        matches = np.append(test(series.cat.categories.astype(str).str.lower()), False)
+        return pd.Series(matches[series.cat.codes.to_numpy()], index=series.index)
+    return test(series.astype(str).str.lower()).fillna(False)
+
+
+def _condition_mask(series, condition):
+    kind = condition.get('type')
+    if kind == 'blank':
+        return series.isna()
+    if kind == 'notBlank':
+        return series.notna()
+
+    filter_type = condition.get('filterType')
+    if filter_type == 'text':
+        value = str(condition.get('filter', '')).lower()
+        tests = {
+            'contains': lambda s: s.str.contains(value, regex=False),
+            'notContains': lambda s: ~s.str.contains(value, regex=False),
+            'equals': lambda s: s == value,
+            'notEqual': lambda s: s != value,
+            'startsWith': lambda s: s.str.startswith(value),
+            'endsWith': lambda s: s.str.endswith(value),
+        }
+        return _text_mask(series, tests[kind])
+
+    if filter_type == 'date':
+        value = pd.Timestamp(condition.get('dateFrom'))
+        upper = condition.get('dateTo')
+        upper = pd.Timestamp(upper) if upper else None
+    else:
+        value = condition.get('filter')
+        upper = condition.get('filterTo')
+    comparisons = {
+        'equals': lambda s: s == value,
+        'notEqual': lambda s: s != value,
+        'lessThan': lambda s: s < value,
+        'lessThanOrEqual': lambda s: s <= value,
+        'greaterThan': lambda s: s > value,
+        'greaterThanOrEqual': lambda s: s >= value,
+        'inRange': lambda s: s.between(value, upper),
+    }
+    if filter_type == 'date' and kind == 'equals':
+        # Date filters compare calendar days, not timestamps
+        return series.dt.normalize() == value
+    return comparisons[kind](series)
+
+
+def _column_mask(series, model):
+    # Combined filters come either as a 'conditions' list or as condition1/condition2
+    conditions = model.get('conditions') or [model[key] for key in ('condition1', 'condition2') if key in model]
+    if not conditions:
+        return _condition_mask(series, model)
+    masks = [_condition_mask(series, condition) for condition in conditions]
+    combine = np.logical_or if model.get('operator') == 'OR' else np.logical_and
+    return combine.reduce(masks)
+
+
+def _row_order(df, sort_model, filter_model):
+    # Positions of the filtered rows in the requested sort order
+    mask = np.ones(len(df), dtype=bool)
+    for col, model in filter_model.items():
+        mask &= np.asarray(_column_mask(df[col], model), dtype=bool)
+    positions = np.flatnonzero(mask)
+    if sort_model:
+        cols = [sort['colId'] for sort in sort_model]
+        ascending = [sort['sort'] == 'asc' for sort in sort_model]
+        view = df.iloc[positions].reset_index(drop=True)
+        positions = positions[view.sort_values(cols, ascending=ascending, kind='stable').index.to_numpy()]
+    return positions
+
+
+class GridQuery:
+    """Answer infinite-row-model block requests from a frame held on the server."""
+
+    def __init__(self, df):
+        self.df = df
+        self._orders = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _cached_order(self, sort_model, filter_model):
+        # Scrolling asks for consecutive blocks of the same query: filter and sort once per query
+        key = json.dumps([sort_model, filter_model], sort_keys=True, default=str)
+        with self._lock:
+            if key in self._orders:
+                self._orders.move_to_end(key)
+                return self._orders[key]
+        order = _row_order(self.df, sort_model, filter_model)
+        with self._lock:
+            self._orders[key] = order
+            if len(self._orders) > MAX_CACHED_QUERIES:
+                self._orders.popitem(last=False)
+        return order
+
+    def rows(self, request):
+        order = self._cached_order(request.get('sortModel') or [], request.get('filterModel') or {})
+        start = request.get('startRow', 0)
+        end = request.get('endRow', start + BLOCK_SIZE)
+        block = self.df.iloc[order[start:end]]
+        return {'rowData': block.to_dict('records'), 'rowCount': len(order)}
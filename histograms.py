@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+from scatter_matrix import bin_codes
+
+# Histograms binned on the server.
+# px.histogram ships every raw value to the browser and bins it there, so the figure grows with
+# the number of rows. Here the bin edges and the counts (per color group) are computed with NumPy,
+# and the figure is a px.bar with one bar per bin and group.
+
+BINS = 30
+COUNT = 'count'
+
+
+def histogram_counts(df, x, color=None, nbins=BINS):
+    """Rows of `df` counted per bin of `x` (and value of `color`); empty cells are left out."""
+    x_index, x_labels = bin_codes(df[x], nbins)
+    x_labels = np.asarray(x_labels)
+    if color is None:
+        counts = np.bincount(x_index[x_index >= 0], minlength=len(x_labels))
+        occupied = np.flatnonzero(counts)
+        return pd.DataFrame({x: x_labels[occupied], COUNT: counts[occupied]})
+    color_index, color_labels = pd.factorize(df[color], sort=True)
+    valid = (x_index >= 0) & (color_index >= 0)
+    sizes = (len(x_labels), len(color_labels))
+    counts = np.bincount(np.ravel_multi_index((x_index[valid], color_index[valid]), sizes),
+                         minlength=sizes[0] * sizes[1]).reshape(sizes)
+    bins, groups = np.nonzero(counts)
+    # String labels, so a numeric color is drawn as discrete groups like px.histogram does
+    color_labels = [str(value) for value in color_labels]
+    groups = pd.Categorical.from_codes(groups, categories=color_labels)
+    return pd.DataFrame({x: x_labels[bins], color: groups, COUNT: counts[bins, groups.codes]})
+
+
+def histogram(df, x, color=None, nbins=BINS, barnorm=None, **kwargs):
+    """px.histogram of `x` (split by `color`) drawn from histogram_counts().
+
+    Other keyword arguments are passed to px.bar. Numeric `x` is cut into `nbins` equal bins
+    (one per value for small integer ranges) and each bar sits at its bin's centre.
+    """
+    frame = histogram_counts(df, x, color, nbins)
+    category_orders = {}
+    if color is not None:
+        # Legend in sorted order, whichever bin each group first appears in
+        category_orders[color] = list(frame[color].cat.categories)
+    category_orders.update(kwargs.pop('category_orders', None) or {})
+    fig = px.bar(frame, x=x, y=COUNT, color=color, category_orders=category_orders, **kwargs)
+    if pd.api.types.is_numeric_dtype(df[x]) and not pd.api.types.is_bool_dtype(df[x]):
+        # Adjacent bins touch, as in px.histogram
+        fig.update_layout(bargap=0)
+    if barnorm is not None:
+        fig.update_layout(barnorm=barnorm)
+    return fig
@@ -1,7 +1,8 @@
 import pandas as pd
+from dataset import load_dataset
 
 
-df = pd.read_csv("ecommerce_customer_data_large.csv")
+df = load_dataset()
 print(df.info())
 print(df.columns)
 print(df['Customer Name'].unique())
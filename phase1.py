@@ -4,7 +4,8 @@ import seaborn as sns
 import statsmodels.api as sm
 import scipy.stats as stats
 from mpl_toolkits.mplot3d import Axes3D
-df = pd.read_csv('ecommerce_customer_data_large.csv')
+from dataset import load_dataset
+df = load_dataset()
 print(df.shape)
 print(df.info())
 print(df.describe().round(2))
@@ -22,7 +23,6 @@ print(df.isnull().sum())
 df['Total Purchase Amount'] = df['Product Price'] * df['Quantity']
 # Drop unnecessary columns
 df.drop(['Customer Name'], axis=1, inplace=True)
-df['Purchase Date'] = pd.to_datetime(df['Purchase Date'])
 df.set_index('Purchase Date', inplace=True)
 # print top 5 records
 print(df.head())
@@ -40,7 +40,7 @@ plt.grid(True)
 plt.show()
 
 # Stack bar plot
-gender_category_counts = df.groupby(['Gender', 'Product Category']).size().unstack()
+gender_category_counts = df.groupby(['Gender', 'Product Category'], observed=True).size().unstack()
 gender_category_counts.plot(kind='bar', stacked=True)
 plt.xlabel('Gender',fontname='serif', color='darkred', fontsize=14)
 plt.ylabel('Number of Purchases',fontname='serif', color='darkred', fontsize=14)
@@ -49,7 +49,7 @@ plt.xticks(rotation=0)
 plt.show()
 
 # Group bar plot
-grouped_data = df.groupby(['Product Category', 'Gender'])['Total Purchase Amount'].sum().unstack()
+grouped_data = df.groupby(['Product Category', 'Gender'], observed=True)['Total Purchase Amount'].sum().unstack()
 grouped_data.plot(kind='bar', width=0.8, colormap='Set2')
 plt.title('Total Purchase Amount by Product Category and Gender', fontdict={'fontname': 'serif', 'color': 'blue', 'size': 16})
 plt.xlabel('Product Category' , fontsize=14,fontname='serif', color='darkred')
@@ -198,7 +198,7 @@ plt.show()
 # Subplots
 # Plot 1: Average Purchase Amount by Product Category (Bar Plot)
 plt.figure(figsize=(10, 6))
-average_purchase_by_category = df.groupby('Product Category')['Total Purchase Amount'].mean()
+average_purchase_by_category = df.groupby('Product Category', observed=True)['Total Purchase Amount'].mean()
 average_purchase_by_category.plot(kind='bar', color='skyblue')
 plt.xlabel('Product Category', fontsize=14, fontname='serif', color='darkred')
 plt.ylabel('Average Purchase Amount', fontsize=14, fontname='serif', color='darkred')
@@ -227,7 +227,7 @@ plt.xticks(rotation=0)
 plt.show()
 
 # Plot 4: Customer Churn by Product Category (Pie Chart)
-churn_by_category = df.groupby('Product Category')['Churn'].sum()
+churn_by_category = df.groupby('Product Category', observed=True)['Churn'].sum()
 plt.figure(figsize=(8, 8))
 plt.pie(churn_by_category, labels=churn_by_category.index, autopct='%1.2f%%', startangle=90, colors=sns.color_palette('pastel'))
 plt.title('Customer Churn by Product Category', fontdict={'fontname': 'serif', 'color': 'blue', 'size': 16})
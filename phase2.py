@@ -2,7 +2,6 @@ import dash
 from dash import html, dcc
 from dash.dependencies import Input, Output, State
 from dash.exceptions import PreventUpdate
-import dash_ag_grid as dag
 import matplotlib.pyplot as plt
 import seaborn as sns
 import statsmodels.api as sm
@@ -16,13 +15,22 @@ from scipy.stats import anderson
 from sklearn.decomposition import PCA
 from sklearn.preprocessing import StandardScaler
 import numpy as np
+from cube import COUNT
+from customer_index import CustomerIndex
+from customer_metrics import GAP, CustomerMetrics
+from customer_search import PrefixIndex
+from dataset import load_dataset
+from dense_scatter import dense_scatter
+from figure_cache import FigureCache
+from grid_query import GridQuery, data_grid
+from histograms import histogram
+from time_buckets import TimeBuckets
 
 # Load the dataset
-df = pd.read_csv("ecommerce_customer_data_large.csv")
+df = load_dataset()
 
 
 time_intervals = ['D', 'W', 'M', 'Y']  # 'D' for Daily, 'W' for Weekly, 'M' for Monthly, 'Y' for Yearly
-df['Purchase Date'] = pd.to_datetime(df['Purchase Date'])
 payment_methods = df['Payment Method'].unique()
 return_percentage = (df['Returns'].count() / len(df)) * 100
 returns_df = df[df['Returns'].notnull()]
@@ -44,13 +52,15 @@ color_map = {
 
 # Dropdown options for age groups
 age_group_options = [{'label': f'{i}-{i+9}', 'value': i} for i in range(18, 71, 10)]
-df = pd.read_csv("ecommerce_customer_data_large.csv")
-df['Purchase Date'] = pd.to_datetime(df['Purchase Date'])
 
-time_intervals = ['D', 'W', 'M', 'Y']  # 'D' for Daily, 'W' for Weekly, 'M' for Monthly, 'Y' for Yearly
-payment_methods = df['Payment Method'].unique()
-return_percentage = (df['Returns'].count() / len(df)) * 100
-returns_df = df[df['Returns'].notnull()]
+# Daily aggregates behind the time-interval dropdown; other intervals are rolled up and cached
+time_buckets = TimeBuckets(df, by=['Product Category'])
+figure_cache = FigureCache()
+customer_index = CustomerIndex(df)
+# Per-customer metrics for the purchase behavior tab, built on first use
+customer_metrics = CustomerMetrics(df)
+customer_names = PrefixIndex(df['Customer Name'])
+customer_ids = PrefixIndex(df['Customer ID'])
 
 app = dash.Dash(__name__)
 image = 'logo.png'
@@ -110,21 +120,8 @@ app.layout = html.Div(style={'font-family': 'Arial, sans-serif'},children=[
             }
         ),
         # Display the data in an Ag-Grid table with styling
-        dag.AgGrid(
-            id='ag-grid',
-            columnDefs=[{'headerName': col, 'field': col} for col in df.columns],
-            rowData=df.to_dict('records'),
-            className="ag-theme-alpine-dark",
-            dashGridOptions={
-                'rowHeight': 40,
-                'domLayout': 'autoHeight',
-                'animateRows': True,
-                'pagination': True,
-                'paginationPageSize': 20,
-                'exportDataAsCsv': True,  # Enable CSV export option
-            },
-            style={'height': '500px', 'width': '100%', },
-        ),
+        # Rows are fetched block by block through the getRowsRequest callback
+        data_grid(df, className="ag-theme-alpine-dark", style={'height': '500px', 'width': '100%', }),
         dcc.Download(id="download-data"),
             ]),
         ]),#TAB-9 END
@@ -521,8 +518,8 @@ app.layout = html.Div(style={'font-family': 'Arial, sans-serif'},children=[
             html.Label("Select Customer:"),
             dcc.Dropdown(
                 id='customer-dropdown1',
-                options=[{'label': customer, 'value': customer} for customer in df['Customer Name'].unique()],
-                value=df['Customer Name'].unique()[0],style={'box-shadow': '0 4px 8px rgba(0,0,0,0.1)', 'border-radius': '8px','margin-bottom': '1rem'}
+                options=customer_names.options(selected=df['Customer Name'].iloc[0]),
+                value=df['Customer Name'].iloc[0],style={'box-shadow': '0 4px 8px rgba(0,0,0,0.1)', 'border-radius': '8px','margin-bottom': '1rem'}
                
             ),
             html.Label("Select Product Category:"),
@@ -567,8 +564,8 @@ app.layout = html.Div(style={'font-family': 'Arial, sans-serif'},children=[
         html.Label("Select Customer ID:"),
         dcc.Dropdown(
             id='customer-dropdown2',
-            options=[{'label': customer, 'value': customer} for customer in df['Customer ID'].unique()],
-            value=df['Customer ID'].unique()[0],
+            options=customer_ids.options(selected=df['Customer ID'].iloc[0]),
+            value=df['Customer ID'].iloc[0],
             style={'width': '50%','margin-left':'18rem'}
         ),
     ], style={'margin': '20px','text-align':'center'}),
@@ -625,14 +622,14 @@ def tab2_update_charts(selected_demographic, selected_groups, selected_age_range
         filtered_df = df[df['Gender'].isin(selected_groups)]
 
     # Bar chart for distribution of customers by age or gender
-    bar_chart = px.histogram(filtered_df, x=selected_demographic, title=f'Distribution of Customers by {selected_demographic}',
+    bar_chart = histogram(filtered_df, x=selected_demographic, title=f'Distribution of Customers by {selected_demographic}',
                                     labels={selected_demographic: selected_demographic, 'count': 'Count'},
                                     category_orders={'Gender': selected_groups} if selected_demographic == 'Gender' else None,
                                     color_discrete_sequence=px.colors.qualitative.D3_r, template="plotly_dark")
     bar_chart.update_layout( title_x=0.5,bargap=0.2)
 
     # Bar chart for average purchase amount by age or gender
-    avg_purchase_chart = px.bar(filtered_df.groupby(selected_demographic)['Total Purchase Amount'].mean().reset_index(),
+    avg_purchase_chart = px.bar(filtered_df.groupby(selected_demographic, observed=True)['Total Purchase Amount'].mean().reset_index(),
                                 x=selected_demographic, y='Total Purchase Amount',
                                 title=f'Average Purchase Amount by {selected_demographic}',
                                 labels={selected_demographic: selected_demographic, 'Total Purchase Amount': 'Average Purchase Amount'},
@@ -662,18 +659,19 @@ def tab2_update_charts(selected_demographic, selected_groups, selected_age_range
 def update_graphs(selected_interval):
     
     # Resample data based on the selected time interval
-    df_resampled = df.set_index('Purchase Date').resample(selected_interval).count().reset_index()
+    # Transactions per interval, rolled up from the cached daily aggregates
+    df_resampled = time_buckets.totals(selected_interval).reset_index()
 
     # Frequency distribution of purchase dates
-    fig_purchase_date = px.line(df_resampled, x='Purchase Date', y='Customer ID', title='Frequency Distribution of Purchase Dates', color_discrete_sequence=px.colors.qualitative.Vivid,template="plotly_dark")
+    fig_purchase_date = px.line(df_resampled, x='Purchase Date', y=COUNT, title='Frequency Distribution of Purchase Dates', color_discrete_sequence=px.colors.qualitative.Vivid,template="plotly_dark")
 
     # Average quantity of products purchased
-    fig_average_quantity = px.bar(df_resampled, x='Purchase Date', y='Quantity', title='Average Quantity of Products Purchased', color_discrete_sequence=px.colors.qualitative.Safe,template="plotly_dark")
+    fig_average_quantity = px.bar(df_resampled, x='Purchase Date', y=COUNT, title='Average Quantity of Products Purchased', color_discrete_sequence=px.colors.qualitative.Safe,template="plotly_dark")
     # Most popular product categories and their average prices
-    fig_product_category = px.histogram(df, x='Product Price', color='Product Category', nbins=30,title='Distribution of Product Prices by Category',color_discrete_sequence=px.colors.qualitative.Antique,template='plotly_dark')
+    fig_product_category = histogram(df, x='Product Price', color='Product Category', nbins=30,title='Distribution of Product Prices by Category',color_discrete_sequence=px.colors.qualitative.Antique,template='plotly_dark')
     fig_product_category.update_layout( title_x=0.5,bargap=0.2)
     # Distribution of total purchase amounts
-    fig_total_purchase_distribution = px.histogram(df, x='Total Purchase Amount', title='Distribution of Total Purchase Amounts', color_discrete_sequence= px.colors.qualitative.Light24,template="plotly_dark")
+    fig_total_purchase_distribution = histogram(df, x='Total Purchase Amount', title='Distribution of Total Purchase Amounts', color_discrete_sequence= px.colors.qualitative.Light24,template="plotly_dark")
     return fig_purchase_date, fig_average_quantity, fig_product_category, fig_total_purchase_distribution
 
 #TAB-3
@@ -700,7 +698,7 @@ def tab3_update_graphs(selected_payment_methods):
                                template="plotly_dark")
     bar_chart.update_layout(title_x=0.5,bargap=0.1)
     # Scatter plot with payment methods on X-axis, product category/price on Y-axis
-    scatter_plot = px.scatter(filtered_df, x='Payment Method', y='Product Price', color='Product Category',
+    scatter_plot = dense_scatter(filtered_df, x='Payment Method', y='Product Price', color='Product Category',
                               title='Correlation between Selected Payments and Product Category/Price',
                               color_discrete_sequence=px.colors.qualitative.Set3,template="plotly_dark")
     scatter_plot.update_layout(title_x=0.5)
@@ -732,15 +730,15 @@ def update_visualizations(selected_category, selected_age_group, selected_age_ra
     pie_chart .update_layout(title_x=0.5)
 
     # Update the bar chart for correlation between returns and product categories
-    bar_chart_correlation = px.histogram(filtered_df, x='Product Category', color='Returns', barmode='group', title='Distribution of Product Category with Returns',color_discrete_sequence=px.colors.qualitative.Dark24_r,template="plotly_dark")
+    bar_chart_correlation = histogram(filtered_df, x='Product Category', color='Returns', barmode='group', title='Distribution of Product Category with Returns',color_discrete_sequence=px.colors.qualitative.Dark24_r,template="plotly_dark")
     bar_chart_correlation.update_layout(title_x=0.5)
 
     # Update the bar chart for returns by age group
-    bar_chart_age_group =px.histogram(filtered_df, x='Age', color='Returns', barmode='group',title='Distribution of Age with Returns',color_discrete_sequence=px.colors.qualitative.Light24,template="plotly_dark")
+    bar_chart_age_group =histogram(filtered_df, x='Age', color='Returns', barmode='group',title='Distribution of Age with Returns',color_discrete_sequence=px.colors.qualitative.Light24,template="plotly_dark")
     bar_chart_age_group.update_layout(title_x=0.5)
 
     # Update the bar chart for returns by gender
-    bar_chart_gender = px.histogram(filtered_df, x='Gender', color='Returns', barmode='group',title='Distribution of Gender with Returns',color_discrete_sequence=px.colors.qualitative.Set2,template="plotly_dark")
+    bar_chart_gender = histogram(filtered_df, x='Gender', color='Returns', barmode='group',title='Distribution of Gender with Returns',color_discrete_sequence=px.colors.qualitative.Set2,template="plotly_dark")
     bar_chart_gender.update_layout(title_x=0.5,bargap=0.2)
 
     return pie_chart, bar_chart_common_returns, bar_chart_correlation, bar_chart_age_group, bar_chart_gender
@@ -753,6 +751,7 @@ def update_visualizations(selected_category, selected_age_group, selected_age_ra
      Output('churn-rate', 'children')],
     [Input('productcategory-dropdown', 'value')]
 )
+@figure_cache.memoize('churn-by-category')
 def update_churn_by_category(selected_category):
     filtered_df = df[df['Product Category'] == selected_category]
     churn_by_category_fig = px.line(
@@ -773,23 +772,22 @@ def update_churn_by_category(selected_category):
     Output('analysis-result', 'figure'),
     [Input('analysis-type', 'value')]
 )
+@figure_cache.memoize('purchase-behavior')
 def update_graph(selected_analysis):
     if selected_analysis == 'avg_transactions':
         # Calculate average transactions per customer
-        avg_transactions = df.groupby('Customer ID')['Purchase Date'].count().mean()
+        avg_transactions = customer_metrics.table('Customer ID')['Frequency'].mean()
 
         # Create a simple bar chart
         fig = px.bar(x=['Average Transactions per Customer'], y=[avg_transactions], title='Average Transactions per Customer',template="plotly_dark" ,color_discrete_sequence=[px.colors.qualitative.Plotly[0]])
         fig.update_layout(title_x=0.5)
 
     elif selected_analysis == 'avg_time_between_purchases':
-        # Calculate average time between consecutive purchases
-        # (You'll need to adjust this based on your specific date columns)
-        df['Purchase Date'] = pd.to_datetime(df['Purchase Date'])
-        df['Time Between Purchases'] = df.groupby('Customer ID')['Purchase Date'].diff().mean()
+        # Days between consecutive purchases of the same customer, computed once per process
+        gaps = customer_metrics.gaps('Customer ID')
 
         # Create a histogram
-        fig = px.histogram(df, x='Time Between Purchases', nbins=50, title='Average Time Between Consecutive Purchases',template="plotly_dark", color_discrete_sequence=[px.colors.qualitative.Plotly[1]])
+        fig = histogram(gaps, x=GAP, nbins=50, labels={GAP: 'Days Between Purchases'}, title='Average Time Between Consecutive Purchases',template="plotly_dark", color_discrete_sequence=[px.colors.qualitative.Plotly[1]])
         fig.update_layout(title_x=0.5)
     elif selected_analysis == 'correlation':
         # Calculate correlation between total purchase amount and churn
@@ -802,11 +800,10 @@ def update_graph(selected_analysis):
         threshold_frequency = 3  # Define your threshold for purchase frequency
         threshold_amount = 1000  # Define your threshold for total purchase amount
 
-        loyal_customers = df.groupby('Customer ID').agg({'Total Purchase Amount': 'sum', 'Purchase Date': 'count'})
-        loyal_customers = loyal_customers[(loyal_customers['Total Purchase Amount'] > threshold_amount) & (loyal_customers['Purchase Date'] > threshold_frequency)]
+        loyal_customers = customer_metrics.loyal('Customer ID', min_frequency=threshold_frequency, min_monetary=threshold_amount)
 
         # Create a scatter plot or table
-        fig = px.scatter(loyal_customers, x='Total Purchase Amount', y='Purchase Date', title='Identify Potential Loyal Customers', color_discrete_sequence=[px.colors.qualitative.Plotly[3]])
+        fig = px.scatter(loyal_customers, x='Monetary', y='Frequency', hover_data=['Customer ID'], labels={'Monetary': 'Total Purchase Amount', 'Frequency': 'Number of Purchases'}, title='Identify Potential Loyal Customers', color_discrete_sequence=[px.colors.qualitative.Plotly[3]])
         fig.update_layout(title_x=0.5)
 
     return fig
@@ -848,15 +845,15 @@ def update_graphs(selected_time_period, selected_category):
     Input('segment-dropdown', 'value')
 )
 def update_plots(selected_segment):
-    # Update 'Segment' column based on selected segment
-    df['Segment'] = selected_segment
+    # Label the rows with the selected segment in a derived frame, leaving the shared df untouched
+    segmented = df[['Customer Age', 'Total Purchase Amount', 'Quantity', 'Customer Name']].assign(Segment=selected_segment)
 
     # Update scatter plot based on 'Segment' column
-    scatter_fig = px.scatter(df, x='Customer Age', y='Total Purchase Amount', color='Segment', size='Quantity', hover_data=['Customer Name'], title='Customer Segmentation', color_discrete_map=color_map, template="plotly_dark")  
+    scatter_fig = dense_scatter(segmented, x='Customer Age', y='Total Purchase Amount', color='Segment', size='Quantity', hover_data=['Customer Name'], title='Customer Segmentation', color_discrete_map=color_map, template="plotly_dark")  
     scatter_fig.update_layout(title_x=0.5)
 
     # Update revenue chart based on 'Segment' column
-    revenue_fig = px.histogram(df, x='Total Purchase Amount', color='Segment', nbins=30, title='Distribution of Total Purchase Amount by Segment', template='plotly_dark', color_discrete_map=color_map)
+    revenue_fig = histogram(segmented, x='Total Purchase Amount', color='Segment', nbins=30, title='Distribution of Total Purchase Amount by Segment', template='plotly_dark', color_discrete_map=color_map)
     revenue_fig.update_layout(title_x=0.5, bargap=0.2)
 
     # Display detailed information in the text area
@@ -903,6 +900,29 @@ def download_data(n_clicks, selectedChecklist1, selectedChecklist2):
     # Return PreventUpdate to prevent updating the download when the button is not clicked
     raise PreventUpdate
 
+# Serve only the block of rows the grid is showing, sorted and filtered on the server
+grid_query = GridQuery(df)
+
+@app.callback(
+    Output('ag-grid', 'getRowsResponse'),
+    Input('ag-grid', 'getRowsRequest')
+)
+def grid_rows(request):
+    if request is None:
+        raise PreventUpdate
+    return grid_query.rows(request)
+
+# Type-ahead search: the dropdown only holds the matches of what has been typed
+@app.callback(
+    Output('customer-dropdown1', 'options'),
+    [Input('customer-dropdown1', 'search_value')],
+    [State('customer-dropdown1', 'value')]
+)
+def search_customer_names(search_value, selected_customer):
+    if not search_value:
+        raise PreventUpdate
+    return customer_names.options(search_value, selected_customer)
+
 #TAB-10
 # Define callback to update graphs based on dropdown selections
 @app.callback(
@@ -914,7 +934,8 @@ def download_data(n_clicks, selectedChecklist1, selectedChecklist2):
 )
 def update_graphs(selected_customer, selected_category):
     # Filter DataFrame based on selected values
-    filtered_df = df[(df['Customer Name'] == selected_customer) & (df['Product Category'] == selected_category)]
+    customer_rows = customer_index.select('Customer Name', selected_customer)
+    filtered_df = customer_rows[customer_rows['Product Category'] == selected_category]
 
     # Scatter Plot
     scatter_plot = px.scatter(filtered_df, x='Customer Age', y='Total Purchase Amount', color='Gender', size='Quantity',title='Customer Age vs. Total Purchase Amount',color_discrete_sequence=[px.colors.qualitative.Dark24])
@@ -946,6 +967,17 @@ def update_graphs(selected_customer, selected_category):
 
     return scatter_plot, pie_chart, bar_chart
 
+# Type-ahead search: the dropdown only holds the matches of what has been typed
+@app.callback(
+    Output('customer-dropdown2', 'options'),
+    [Input('customer-dropdown2', 'search_value')],
+    [State('customer-dropdown2', 'value')]
+)
+def search_customer_ids(search_value, selected_customer):
+    if not search_value:
+        raise PreventUpdate
+    return customer_ids.options(search_value, selected_customer)
+
 #TAB-11
 # Define callback to update graphs based on dropdown selections
 @app.callback(
@@ -957,7 +989,7 @@ def update_graphs(selected_customer, selected_category):
 )
 def update_dashboard(selected_customer):
     # Filter DataFrame based on selected customer
-    filtered_df = df[df['Customer ID'] == selected_customer]
+    filtered_df = customer_index.select('Customer ID', selected_customer)
 
     # Scatter Plot
     scatter_plot = px.scatter(filtered_df, x='Customer Age', y='Total Purchase Amount', color='Gender',
@@ -0,0 +1,152 @@
+import numpy as np
+import pandas as pd
+
+# Pair plots and joint plots whose cost does not grow with the number of rows drawn.
+# Scatter panes show a sample of at most ROW_BUDGET rows, drawn per hue class in proportion to
+# its size (so small classes such as churned customers stay visible); histogram and density panes
+# are computed from every row with fixed bins, so the distribution shapes are exact.
+
+ROW_BUDGET = 5000
+BINS = 40
+# Every hue class keeps at least this many rows in the sample (or all of them, if fewer)
+MIN_PER_CLASS = 50
+
+
+def stratified_sample(df, by=None, budget=ROW_BUDGET, min_per_class=MIN_PER_CLASS, seed=0):
+    """At most about `budget` rows of `df`, sampled proportionally within each value of `by`."""
+    if len(df) <= budget:
+        return df
+    rng = np.random.default_rng(seed)
+    if by is None:
+        return df.iloc[np.sort(rng.choice(len(df), budget, replace=False))]
+    codes, _ = pd.factorize(df[by], use_na_sentinel=True)
+    fraction = budget / len(df)
+    picked = []
+    for code in np.unique(codes):
+        rows = np.flatnonzero(codes == code)
+        size = min(len(rows), max(min_per_class, round(len(rows) * fraction)))
+        picked.append(rng.choice(rows, size, replace=False))
+    return df.iloc[np.sort(np.concatenate(picked))]
+
+
+def bin_edges(series, bins=BINS):
+    values = series.to_numpy(dtype=float)
+    values = values[np.isfinite(values)]
+    if not len(values):
+        return np.linspace(0, 1, bins + 1)
+    low, high = values.min(), values.max()
+    if pd.api.types.is_integer_dtype(series) and high - low < bins:
+        # One bin per value for small integer ranges (ages, quantities), centred on the value
+        return np.arange(low - 0.5, high + 1.5)
+    if low == high:
+        high = low + 1
+    return np.linspace(low, high, bins + 1)
+
+
+def bin_codes(series, bins=BINS):
+    """Bin index of every row (-1 when missing) and the label of each bin.
+
+    Numeric series are cut at bin_edges() and labelled by bin centre; other series get one bin
+    per distinct value, in sorted order.
+    """
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        edges = bin_edges(series, bins)
+        values = series.to_numpy(dtype=float)
+        index = np.clip(np.searchsorted(edges, values, side='right') - 1, 0, len(edges) - 2)
+        index[~np.isfinite(values)] = -1
+        return index, (edges[:-1] + edges[1:]) / 2
+    codes, uniques = pd.factorize(series, sort=True)
+    return codes, [str(value) for value in uniques]
+
+
+def _hue_classes(df, hue):
+    if hue is None:
+        return np.zeros(len(df), dtype=np.intp), [None]
+    codes, uniques = pd.factorize(df[hue], sort=True)
+    return codes, list(uniques)
+
+
+def _colors(count, palette, color):
+    import matplotlib.pyplot as plt
+    if count == 1 and color is not None:
+        return [color]
+    cmap = plt.get_cmap(palette)
+    return [cmap(i % cmap.N) for i in range(count)]
+
+
+def _histogram(ax, values, edges, color, label=None, orientation='vertical'):
+    counts, _ = np.histogram(values[np.isfinite(values)], bins=edges, density=True)
+    ax.stairs(counts, edges, color=color, label=label, linewidth=1.5, orientation=orientation)
+
+
+def _scatter(ax, sample, x, y, hue, classes, colors):
+    for value, color in zip(classes, colors):
+        rows = sample if hue is None else sample[sample[hue] == value]
+        ax.scatter(rows[x], rows[y], s=6, alpha=0.5, color=color, label=None if value is None else str(value))
+
+
+def pair_plot(df, vars, hue=None, budget=ROW_BUDGET, bins=BINS, palette='tab10', color=None):
+    """Scatter matrix of `vars`: sampled scatters above the diagonal, full-data 2D histograms
+    below it and per-class 1D histograms on it."""
+    import matplotlib.pyplot as plt
+    n = len(vars)
+    fig, axes = plt.subplots(n, n, figsize=(2.5 * n, 2.5 * n), squeeze=False)
+    codes, classes = _hue_classes(df, hue)
+    colors = _colors(len(classes), palette, color)
+    edges = {var: bin_edges(df[var], bins) for var in vars}
+    values = {var: df[var].to_numpy(dtype=float) for var in vars}
+    sample = stratified_sample(df, hue, budget)
+
+    for i, y in enumerate(vars):
+        for j, x in enumerate(vars):
+            ax = axes[i, j]
+            if i == j:
+                for code, (value, class_color) in enumerate(zip(classes, colors)):
+                    label = None if value is None else str(value)
+                    _histogram(ax, values[x][codes == code], edges[x], class_color, label)
+            elif i > j:
+                finite = np.isfinite(values[x]) & np.isfinite(values[y])
+                counts, _, _ = np.histogram2d(values[x][finite], values[y][finite], bins=[edges[x], edges[y]])
+                ax.pcolormesh(edges[x], edges[y], np.ma.masked_equal(counts.T, 0), cmap='viridis')
+            else:
+                _scatter(ax, sample, x, y, hue, classes, colors)
+            if i == n - 1:
+                ax.set_xlabel(x)
+            else:
+                ax.tick_params(labelbottom=False)
+            if j == 0:
+                ax.set_ylabel(y)
+            else:
+                ax.tick_params(labelleft=False)
+
+    if hue is not None:
+        fig.legend(*axes[0, 0].get_legend_handles_labels(), title=hue, loc='center right')
+    fig.tight_layout(rect=(0, 0, 0.92 if hue is not None else 1, 1))
+    return fig
+
+
+def joint_plot(df, x, y, hue=None, budget=ROW_BUDGET, bins=BINS, palette='tab10', color=None):
+    """Sampled scatter of `x` against `y` with full-data histograms of each in the margins."""
+    import matplotlib.pyplot as plt
+    fig = plt.figure(figsize=(8, 8))
+    grid = fig.add_gridspec(2, 2, width_ratios=(4, 1), height_ratios=(1, 4), hspace=0.05, wspace=0.05)
+    ax = fig.add_subplot(grid[1, 0])
+    ax_x = fig.add_subplot(grid[0, 0], sharex=ax)
+    ax_y = fig.add_subplot(grid[1, 1], sharey=ax)
+    ax_x.tick_params(labelbottom=False)
+    ax_y.tick_params(labelleft=False)
+
+    codes, classes = _hue_classes(df, hue)
+    colors = _colors(len(classes), palette, color)
+    _scatter(ax, stratified_sample(df, hue, budget), x, y, hue, classes, colors)
+    x_values, y_values = df[x].to_numpy(dtype=float), df[y].to_numpy(dtype=float)
+    x_edges, y_edges = bin_edges(df[x], bins), bin_edges(df[y], bins)
+    for code, class_color in enumerate(colors):
+        _histogram(ax_x, x_values[codes == code], x_edges, class_color)
+        _histogram(ax_y, y_values[codes == code], y_edges, class_color, orientation='horizontal')
+
+    ax.set_xlabel(x)
+    ax.set_ylabel(y)
+    if hue is not None:
+        ax.legend(title=hue)
+    return fig
@@ -0,0 +1,253 @@
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from dataset import CACHE_DIR
+
+# KMeans customer segmentations for every choice of the cluster dropdown.
+# The models are fitted by a pool of worker processes (each holding its own copy of the customer
+# matrix) as soon as the app starts, never in the request thread. Each fit is cached in memory
+# and on disk, keyed on a hash of the matrix, so a restart with the same data loads the labels
+# instead of refitting. Above MINIBATCH_THRESHOLD customers MiniBatchKMeans replaces KMeans.
+# Every fit also records its inertia and a silhouette score on a sample of customers, so the
+# finished fits double as an elbow/silhouette model-selection sweep over the cluster counts.
+
+CLUSTER_COUNTS = range(2, 11)
+MODEL_DIR = os.path.join(CACHE_DIR, 'segments')
+MINIBATCH_THRESHOLD = 100000
+# Customers scored per silhouette; the exact score is quadratic in the number of customers
+SILHOUETTE_SAMPLE = 10000
+RANDOM_STATE = 42
+# Bump when the saved fit contents change so stale files are refitted
+MODEL_VERSION = 2
+# Seconds a forked process (such as a background callback job) waits for a fit its parent has
+# in progress to reach the disk cache, polling every POLL_INTERVAL, before fitting it itself
+PARENT_WAIT = 600
+POLL_INTERVAL = 0.5
+CLUSTER = 'Cluster'
+
+# State of a fitting worker process
+_worker = {}
+
+
+def _init_worker(matrix):
+    _worker['matrix'] = matrix
+
+
+def _fit(k, minibatch):
+    from sklearn.cluster import KMeans, MiniBatchKMeans
+    if minibatch:
+        model = MiniBatchKMeans(n_clusters=k, random_state=RANDOM_STATE, batch_size=4096, n_init=3)
+    else:
+        model = KMeans(n_clusters=k, random_state=RANDOM_STATE)
+    from sklearn.metrics import silhouette_score
+    matrix = _worker['matrix']
+    labels = model.fit_predict(matrix)
+    silhouette = silhouette_score(matrix, labels, sample_size=min(SILHOUETTE_SAMPLE, len(matrix)),
+                                  random_state=RANDOM_STATE)
+    return {'labels': labels.astype(np.int32), 'inertia': float(model.inertia_),
+            'silhouette': float(silhouette), 'centers': model.cluster_centers_}
+
+
+def cluster_summary(frame, labels, columns):
+    """Mean of each of `columns` per cluster label, one row per cluster."""
+    counts = np.bincount(labels)
+    summary = {CLUSTER: np.arange(len(counts))}
+    for col in columns:
+        values = frame[col].to_numpy(dtype=float)
+        summary[col] = np.bincount(labels, weights=values, minlength=len(counts)) / counts
+    return pd.DataFrame(summary)[counts > 0].reset_index(drop=True)
+
+
+def recommended_k(sweep):
+    """The cluster count with the highest silhouette score (the smallest one on a tie)."""
+    return int(sweep.loc[sweep['Silhouette'].idxmax(), 'k'])
+
+
+def elbow_k(sweep):
+    """The cluster count farthest below the straight line from the first to the last inertia."""
+    k, inertia = sweep['k'].to_numpy(dtype=float), sweep['Inertia'].to_numpy(dtype=float)
+    if len(k) < 3:
+        return int(k[0])
+    line = inertia[0] + (inertia[-1] - inertia[0]) * (k - k[0]) / (k[-1] - k[0])
+    return int(k[np.argmax(line - inertia)])
+
+
+def recommendation_text(sweep, failures=None):
+    """The recommended cluster count of a finished sweep, and the cluster counts that failed to fit."""
+    failed = ''
+    if failures:
+        errors = '; '.join(f"k = {k}: {error}" for k, error in sorted(failures.items()))
+        failed = f"Failed to fit {errors}"
+    if sweep.empty:
+        return f"No cluster count could be fitted. {failed}"
+    k = recommended_k(sweep)
+    text = f"Recommended number of clusters: {k} (highest silhouette; the inertia elbow is at {elbow_k(sweep)})"
+    return f"{text}. {failed}" if failed else text
+
+
+def sweep_figure(sweep, recommended=None):
+    """Inertia (elbow) and silhouette score per cluster count, marking the `recommended` count."""
+    fig = make_subplots(specs=[[{'secondary_y': True}]])
+    fig.add_trace(go.Scatter(x=sweep['k'], y=sweep['Inertia'], mode='lines+markers', name='Inertia'),
+                  secondary_y=False)
+    fig.add_trace(go.Scatter(x=sweep['k'], y=sweep['Silhouette'], mode='lines+markers',
+                             name='Silhouette (sampled)'), secondary_y=True)
+    if recommended is not None:
+        fig.add_vline(x=recommended, line_dash='dash', annotation_text=f'k = {recommended}')
+    fig.update_layout(title='Elbow and Silhouette by Number of Clusters', xaxis_title='Clusters')
+    fig.update_yaxes(title_text='Inertia', secondary_y=False)
+    fig.update_yaxes(title_text='Silhouette', secondary_y=True)
+    return fig
+
+
+class SegmentModels:
+    """KMeans labels and cluster summaries of `frame`'s customers for each cluster count.
+
+    `matrix` is the prepared (scaled, imputed) feature matrix, one row per row of `frame`;
+    `columns` are the frame columns averaged in the cluster summary. Concurrent requests for
+    the same cluster count share one fit.
+    """
+
+    def __init__(self, frame, matrix, columns, counts=CLUSTER_COUNTS, workers=None,
+                 minibatch_threshold=MINIBATCH_THRESHOLD, model_dir=MODEL_DIR):
+        self.frame = frame
+        self.matrix = np.ascontiguousarray(matrix, dtype=float)
+        self.columns = list(columns)
+        self.counts = list(counts)
+        self.workers = workers or min(len(self.counts), os.cpu_count() or 1)
+        self.minibatch = len(self.matrix) > minibatch_threshold
+        self.model_dir = model_dir
+        self.version = hashlib.sha256(self.matrix.tobytes()).hexdigest()[:16]
+        self._models = {}
+        self._summaries = {}
+        # Error message of each cluster count whose last fit raised
+        self._failures = {}
+        self._lock = threading.Lock()
+        self._pool = None
+        self._pid = os.getpid()
+        # Cluster counts the parent process was fitting when this process was forked
+        self._parent_pending = set()
+
+    def _after_fork(self):
+        # A forked process (such as a background callback job) inherits pending fits owned by
+        # threads and a pool that do not exist in it. Keep the finished fits, and read the ones the
+        # parent is still running from the disk cache once it has saved them instead of refitting
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._lock = threading.Lock()
+            self._parent_pending = {k for k, future in self._models.items() if not future.done()}
+            self._models = {k: future for k, future in self._models.items() if future.done()}
+            self._pool = None
+
+    def _path(self, k):
+        kind = 'minibatch' if self.minibatch else 'kmeans'
+        return os.path.join(self.model_dir, f"{self.version}-{kind}-{RANDOM_STATE}-k{k}-v{MODEL_VERSION}.npz")
+
+    def _executor(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                                 initargs=(self.matrix,))
+            return self._pool
+
+    def _load_or_fit(self, k):
+        path = self._path(k)
+        if k in self._parent_pending:
+            deadline = time.monotonic() + PARENT_WAIT
+            while not os.path.exists(path) and time.monotonic() < deadline:
+                time.sleep(POLL_INTERVAL)
+        if os.path.exists(path):
+            with np.load(path) as saved:
+                return {name: saved[name] for name in saved.files}
+        model = self._executor().submit(_fit, k, self.minibatch).result()
+        try:
+            os.makedirs(self.model_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, **model)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+        return model
+
+    def model(self, k):
+        """{'labels', 'inertia', 'silhouette', 'centers'} of the fit with `k` clusters."""
+        self._after_fork()
+        with self._lock:
+            future = self._models.get(k)
+            owner = future is None
+            if owner:
+                future = self._models[k] = Future()
+        if owner:
+            try:
+                future.set_result(self._load_or_fit(k))
+                with self._lock:
+                    self._failures.pop(k, None)
+            except BaseException as exc:
+                future.set_exception(exc)
+                # Allow a later request to retry; prefetch() leaves failed counts alone
+                with self._lock:
+                    del self._models[k]
+                    self._failures[k] = str(exc) or type(exc).__name__
+        return future.result()
+
+    def labels(self, k):
+        return self.model(k)['labels']
+
+    def summary(self, k):
+        """cluster_summary() of the fit with `k` clusters; read-only, it is shared by every caller."""
+        with self._lock:
+            summary = self._summaries.get(k)
+        if summary is None:
+            summary = cluster_summary(self.frame, self.labels(k), self.columns)
+            with self._lock:
+                self._summaries[k] = summary
+        return summary
+
+    def segmented(self, k):
+        """A copy of `frame` with the CLUSTER label of each customer."""
+        return self.frame.assign(**{CLUSTER: self.labels(k)})
+
+    def prefetch(self, *counts):
+        # Fit every cluster count in the background so dropdown changes are served from the cache;
+        # counts already fitted, being fitted or failed are skipped, so this is cheap to call repeatedly
+        def warm(k):
+            try:
+                self.model(k)
+            except Exception:
+                pass
+        with self._lock:
+            pending = [k for k in counts or self.counts if k not in self._models and k not in self._failures]
+        for k in pending:
+            threading.Thread(target=warm, args=(k,), daemon=True).start()
+
+    def sweep(self):
+        """k, inertia and silhouette score of every finished fit, in k order."""
+        with self._lock:
+            finished = {k: future for k, future in self._models.items()
+                        if future.done() and future.exception() is None}
+        rows = []
+        for k in sorted(finished):
+            model = finished[k].result()
+            rows.append({'k': k, 'Inertia': float(model['inertia']), 'Silhouette': float(model['silhouette'])})
+        return pd.DataFrame(rows, columns=['k', 'Inertia', 'Silhouette'])
+
+    def failures(self):
+        """Error message of each cluster count whose fit failed."""
+        with self._lock:
+            return dict(self._failures)
+
+    def progress(self):
+        """(cluster counts fitted or failed, cluster counts) of the sweep."""
+        with self._lock:
+            finished = sum(1 for k in self.counts if k in self._failures or (
+                k in self._models and self._models[k].done() and self._models[k].exception() is None))
+        return finished, len(self.counts)
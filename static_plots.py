@@ -0,0 +1,240 @@
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from io import BytesIO
+
+import plotly.graph_objects as go
+
+from dataset import CACHE_DIR, dataset_version, load_dataset
+from figure_cache import code_version
+from scatter_matrix import joint_plot, pair_plot
+
+# Matplotlib/seaborn plots of the Phase-1 graph selector, rendered headlessly to PNG.
+# Rendering runs in a pool of worker processes (each with its own Agg pyplot state and its own
+# copy of the frame), never in the request thread. Images are cached in memory and on disk per
+# plot type, dataset version and renderer version, served by a Flask route and shown in dcc.Graph
+# as a layout image. The renderer version hashes the plot function's code, so an edited plot gets a
+# new file name and URL instead of the stale image.
+
+IMAGE_DIR = os.path.join(CACHE_DIR, 'plots')
+ROUTE = '/static-plots/'
+TITLE_FONT = {'fontname': 'serif', 'color': 'blue', 'size': 16}
+# Bump when shared rendering code (_render, scatter_matrix, TITLE_FONT) changes the images;
+# changes to a plot function itself are picked up by code_version()
+RENDER_VERSION = 1
+
+
+def _pie_chart(df, plt, sns):
+    payment_method_counts = df['Payment Method'].value_counts()
+    plt.figure(figsize=(8, 8))
+    plt.pie(payment_method_counts, labels=payment_method_counts.index, autopct='%1.2f%%', startangle=90, colors=sns.color_palette('pastel'))
+    plt.title('Payment Method Distribution', fontdict=TITLE_FONT)
+
+
+def _dist_plot(df, plt, sns):
+    plt.figure(figsize=(8, 6))
+    sns.histplot(df['Customer Age'], kde=True, color='skyblue')
+    plt.title('Distribution of Customer Ages', fontdict=TITLE_FONT)
+    plt.xlabel('Customer Age', fontname='serif', color='darkred', fontsize=14)
+    plt.ylabel('Density', fontname='serif', color='darkred', fontsize=14)
+
+
+def _pair_plot(df, plt, sns):
+    fig = pair_plot(df, ['Product Price', 'Quantity', 'Total Purchase Amount'], hue='Churn')
+    fig.suptitle('Pair Plot for Selected Columns', y=1.02)
+
+
+def _heatmap(df, plt, sns):
+    correlation_matrix = df.select_dtypes(include='number').corr()
+    plt.figure(figsize=(10, 8))
+    sns.heatmap(correlation_matrix, cmap='coolwarm')
+    for i in range(len(correlation_matrix)):
+        for j in range(len(correlation_matrix.columns)):
+            text = f"{correlation_matrix.iloc[i, j]:.2f}"
+            plt.text(j + 0.5, i + 0.5, text, ha='center', va='center', color='black', fontsize=12)
+    plt.title('Heat Map: Correlation Matrix', fontdict=TITLE_FONT)
+
+
+def _histogram_with_kde(df, plt, sns):
+    plt.figure(figsize=(8, 6))
+    sns.histplot(df['Total Purchase Amount'], kde=True, color='skyblue')
+    plt.title('Histogram Plot with KDE', fontdict=TITLE_FONT)
+    plt.xlabel('Total Purchase Amount', fontname='serif', color='darkred')
+    plt.ylabel('Count', fontname='serif', color='darkred')
+
+
+def _qq_plot(df, plt, sns):
+    import statsmodels.api as sm
+    sm.qqplot(df['Product Price'], line='s')
+    plt.title('QQ-Plot', fontdict=TITLE_FONT)
+    plt.xlabel('Theoritical quantity', fontname='serif', color='darkred')
+    plt.ylabel('Sample quantity', fontname='serif', color='darkred')
+
+
+def _kde_plot(df, plt, sns):
+    plt.figure(figsize=(8, 6))
+    sns.kdeplot(df['Quantity'], fill=True, alpha=0.6, linewidth=3)
+    plt.title('KDE Plot with Filled Area', fontdict=TITLE_FONT)
+    plt.xlabel("Quality", fontname='serif', color='darkred')
+    plt.ylabel('Density', fontname='serif', color='darkred')
+
+
+def _joint_plot(df, plt, sns):
+    # Sampled scatter in the joint axes, full-data histograms of both variables in the margins
+    fig = joint_plot(df, 'Customer Age', 'Total Purchase Amount', color='g')
+    fig.suptitle('Joint Plot: Customer Age vs. Total Purchase Amount', **TITLE_FONT)
+
+
+def _cluster_map(df, plt, sns):
+    correlation_matrix = df.select_dtypes(include='number').corr()
+    grid = sns.clustermap(correlation_matrix, cmap='coolwarm', annot=True, figsize=(10, 8))
+    grid.fig.suptitle('Cluster Map: Correlation Heatmap', **TITLE_FONT)
+
+
+def _hexbin_plot(df, plt, sns):
+    plt.figure(figsize=(10, 8))
+    plt.hexbin(df['Age'], df['Customer ID'], gridsize=50, cmap='viridis')
+    plt.colorbar()
+    plt.title('Hexbin Plot of Age vs Customer ID', fontdict=TITLE_FONT)
+    plt.xlabel('Age', fontdict={'fontname': 'serif', 'color': 'darkred'})
+    plt.ylabel('Total Purchase Amount', fontdict={'fontname': 'serif', 'color': 'darkred'})
+
+
+# graph-selector value -> function drawing the plot with pyplot
+PLOTS = {
+    'pie-chart': _pie_chart,
+    'Dist-plot': _dist_plot,
+    'Pair-plot': _pair_plot,
+    'Heatmap': _heatmap,
+    'Histogram-with-kde': _histogram_with_kde,
+    'QQ-Plot': _qq_plot,
+    'kde-plot': _kde_plot,
+    'Joint-Plot': _joint_plot,
+    'Cluster-map': _cluster_map,
+    'Hexbin-plot': _hexbin_plot,
+}
+
+# State of a render worker process
+_worker = {}
+
+
+def _init_worker(loader):
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+    _worker['frame'] = loader()
+
+
+def _render(kind):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    plt.close('all')
+    try:
+        PLOTS[kind](_worker['frame'], plt, sns)
+        buffer = BytesIO()
+        plt.gcf().savefig(buffer, format='png', bbox_inches='tight')
+        return buffer.getvalue()
+    finally:
+        plt.close('all')
+        sns.reset_defaults()
+
+
+class StaticPlots:
+    """PNG renderings of the PLOTS, made by a pool of render worker processes.
+
+    `loader` is a module-level function returning the frame to plot; each worker calls it once.
+    Concurrent requests for the same plot share one rendering.
+    """
+
+    def __init__(self, loader=load_dataset, version=None, workers=2, image_dir=IMAGE_DIR):
+        self.loader = loader
+        self.version = f"{loader.__name__}-{version if version is not None else dataset_version()}"
+        self.workers = workers
+        self.image_dir = image_dir
+        self._images = {}
+        self._lock = threading.Lock()
+        self._pool = None
+
+    def _render_version(self, kind):
+        return f"r{RENDER_VERSION}-{code_version(PLOTS[kind])}"
+
+    def _path(self, kind):
+        return os.path.join(self.image_dir, f"{self.version}-{kind}-{self._render_version(kind)}.png")
+
+    def _executor(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                                 initargs=(self.loader,))
+            return self._pool
+
+    def _load_or_render(self, kind):
+        path = self._path(kind)
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                return f.read()
+        png = self._executor().submit(_render, kind).result()
+        try:
+            os.makedirs(self.image_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(png)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+        return png
+
+    def png(self, kind):
+        if kind not in PLOTS:
+            raise KeyError(f"Unknown plot: {kind}")
+        with self._lock:
+            future = self._images.get(kind)
+            owner = future is None
+            if owner:
+                future = self._images[kind] = Future()
+        if owner:
+            try:
+                future.set_result(self._load_or_render(kind))
+            except BaseException as exc:
+                future.set_exception(exc)
+                # Allow a later request to retry
+                with self._lock:
+                    del self._images[kind]
+        return future.result()
+
+    def prefetch(self, *kinds):
+        # Render in the background so the first selection is served from the cache
+        def warm(kind):
+            try:
+                self.png(kind)
+            except Exception:
+                pass
+        for kind in kinds or PLOTS:
+            threading.Thread(target=warm, args=(kind,), daemon=True).start()
+
+    def url(self, kind):
+        # The data and renderer versions in the query string let browsers cache each rendering
+        # indefinitely: a new rendering is always requested under a new URL
+        return f"{ROUTE}{kind}.png?v={self.version}-{self._render_version(kind)}"
+
+    def figure(self, kind):
+        """A dcc.Graph figure showing the rendered image of `kind`."""
+        fig = go.Figure()
+        fig.add_layout_image(source=self.url(kind), xref='paper', yref='paper', x=0.5, y=0.5,
+                             sizex=1, sizey=1, xanchor='center', yanchor='middle', sizing='contain')
+        fig.update_xaxes(visible=False)
+        fig.update_yaxes(visible=False)
+        fig.update_layout(height=700, margin=dict(l=0, r=0, t=0, b=0), plot_bgcolor='white')
+        return fig
+
+    def register(self, server):
+        """Serve the images from the app's Flask server."""
+        import flask
+
+        def serve(kind):
+            if kind not in PLOTS:
+                flask.abort(404)
+            response = flask.Response(self.png(kind), mimetype='image/png')
+            response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+            return response
+
+        server.add_url_rule(ROUTE + '<kind>.png', 'static_plots', serve)
@@ -0,0 +1,196 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from dataset import load_dataset
+
+# Statistical preamble of the Phase-1 analysis (outliers, PCA, normality, Box-Cox, summary tables).
+# Nothing here runs on import: each result is computed the first time it is requested and memoized.
+# The dashboards only share clean_dataset(); the statistics are printed by 'python stats_service.py'.
+
+
+def clean_dataset(df):
+    # Remove duplicates, treat a missing 'Returns' value as no return and index by purchase date
+    df = df.drop_duplicates().reset_index(drop=True)
+    df['Returns'] = df['Returns'].fillna(0)
+    df['Total Purchase Amount'] = df['Product Price'] * df['Quantity']
+    # Drop unnecessary columns
+    return df.drop(columns=['Customer Name']).set_index('Purchase Date')
+
+
+def load_cleaned_dataset():
+    return clean_dataset(load_dataset())
+
+
+def _numerical_features(df):
+    return df.select_dtypes(include='number').columns
+
+
+def _outliers(df, z_threshold=3):
+    from scipy import stats
+    z_scores = stats.zscore(df[_numerical_features(df)])
+    outliers = (abs(z_scores) > z_threshold).all(axis=1)
+    return df[~outliers]
+
+
+def _pca(df, desired_explained_variance=0.95):
+    from sklearn.decomposition import PCA
+    from sklearn.preprocessing import StandardScaler
+    scaled_data = StandardScaler().fit_transform(df[_numerical_features(df)])
+    pca = PCA()
+    pca_result = pca.fit_transform(scaled_data)
+    cumulative_variance_ratio = pca.explained_variance_ratio_.cumsum()
+    # Number of principal components to retain based on desired explained variance
+    num_components = (cumulative_variance_ratio < desired_explained_variance).sum() + 1
+    return {
+        'explained_variance_ratio': pca.explained_variance_ratio_,
+        'cumulative_variance_ratio': cumulative_variance_ratio,
+        'num_components': num_components,
+        'reduced': pca_result[:, :num_components],
+        'condition_number': np.linalg.cond(pca.get_covariance()),
+        'singular_values': pca.singular_values_[:num_components],
+    }
+
+
+def _normality(df):
+    from scipy.stats import anderson
+    rows = []
+    for feature in _numerical_features(df):
+        result = anderson(df[feature])
+        rows.append({
+            'Feature': feature,
+            'Statistic': result.statistic,
+            'Critical Values': result.critical_values,
+            # Index 2 is the 5% significance level
+            'Conclusion': 'Normal' if result.statistic < result.critical_values[2] else 'Not Normal',
+        })
+    return pd.DataFrame(rows)
+
+
+def _boxcox(df):
+    from scipy.stats import boxcox
+    transformed_df = pd.DataFrame()
+    for feature in _numerical_features(df):
+        transformed_df[feature], _ = boxcox(df[feature] + 1)  # Adding 1 to handle zero values
+    return transformed_df
+
+
+def _summary_tables(df):
+    from prettytable import PrettyTable
+    numerical_features = _numerical_features(df)
+    table_stats = PrettyTable(["Feature", "Mean", "Median", "Correlation", "Std Dev", "Variance"])
+    for feature in numerical_features:
+        table_stats.add_row([
+            feature,
+            f"{df[feature].mean():.2f}",
+            f"{df[feature].median():.2f}",
+            f"{df['Churn'].corr(df[feature]):.2f}",
+            f"{df[feature].std():.2f}",
+            f"{df[feature].var():.2f}"
+        ])
+
+    table_correlation = PrettyTable(["Feature1", "Feature2", "Correlation"])
+    correlation_matrix = df[numerical_features].corr()
+    for i in range(len(numerical_features)):
+        for j in range(i + 1, len(numerical_features)):
+            feature1, feature2 = numerical_features[i], numerical_features[j]
+            table_correlation.add_row([feature1, feature2, f"{correlation_matrix.loc[feature1, feature2]:.2f}"])
+    return table_stats, table_correlation
+
+
+_COMPUTATIONS = {
+    'outliers': _outliers,
+    'pca': _pca,
+    'normality': _normality,
+    'boxcox': _boxcox,
+    'summary_tables': _summary_tables,
+}
+
+
+class StatisticsService:
+    """Lazily evaluated, memoized statistics over the cleaned dataset.
+
+    `frame` is a callable returning the cleaned frame; it is only called when the first
+    statistic is requested. Concurrent requests for the same statistic share one computation.
+    """
+
+    def __init__(self, frame=load_cleaned_dataset):
+        self._frame = frame
+        self._futures = {}
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _result(self, name, compute):
+        with self._lock:
+            future = self._futures.get(name)
+            owner = future is None
+            if owner:
+                future = self._futures[name] = Future()
+        if owner:
+            try:
+                future.set_result(compute())
+            except BaseException as exc:
+                future.set_exception(exc)
+                # Allow a later request to retry
+                with self._lock:
+                    del self._futures[name]
+        return future.result()
+
+    def cleaned(self):
+        return self._result('cleaned', self._frame)
+
+    def get(self, name):
+        if name not in _COMPUTATIONS:
+            raise KeyError(f"Unknown statistic: {name}")
+        return self._result(name, lambda: _COMPUTATIONS[name](self.cleaned()))
+
+    def prefetch(self, *names):
+        # Warm the cache in a background thread; the web server does not wait for it
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='statistics')
+        for name in names or _COMPUTATIONS:
+            self._executor.submit(self.get, name)
+
+    def report(self):
+        df = self.cleaned()
+        print("Cleaned Dataset - First Few Observations:")
+        print(df.head())
+        print(df.isnull().sum())
+        print("\nCleaned Dataset - Statistics:")
+        print(df.describe())
+
+        cleaned_outliers = self.get('outliers')
+        print("Cleaned Dataset without Outliers:")
+        print(cleaned_outliers)
+        print("\nCleaned Dataset without Outliers - Statistics:")
+        print(cleaned_outliers.describe())
+
+        pca = self.get('pca')
+        print("Explained Variance Ratio:")
+        print(pca['explained_variance_ratio'])
+        print("\nCumulative Explained Variance:")
+        print(pca['cumulative_variance_ratio'])
+        print(f"\nNumber of Retained Principal Components: {pca['num_components']}")
+        print(f"\nCondition Number of Covariance Matrix: {pca['condition_number']}")
+        print("\nSingular Values of Retained Principal Components:")
+        print(pca['singular_values'])
+
+        alpha_levels = [0.01, 0.05, 0.1]
+        for row in self.get('normality').itertuples(index=False):
+            print(f"Anderson-Darling test for {row.Feature}: Statistic={row.Statistic}, Critical Values={row[2]}, Significance Levels={alpha_levels}")
+            print(f"Conclusion: {row.Conclusion}\n")
+
+        print("Transformed Dataset:")
+        print(self.get('boxcox').head())
+
+        table_stats, table_correlation = self.get('summary_tables')
+        print("Correlation Table:")
+        print(table_correlation)
+        print("Statistics Table:")
+        print(table_stats)
+
+
+if __name__ == '__main__':
+    StatisticsService().report()
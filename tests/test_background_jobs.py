@@ -0,0 +1,61 @@
+import sys
+import types
+
+import pytest
+
+pytest.importorskip('pandas')
+
+from background_jobs import BackgroundJobs
+
+
+class _App:
+    # Records the keyword arguments of app.callback
+    def __init__(self):
+        self.calls = []
+
+    def callback(self, *dependencies, **kwargs):
+        self.calls.append(kwargs)
+        return lambda func: func
+
+
+def _missing_extras(*args, **kwargs):
+    raise ImportError("No module named 'multiprocess'")
+
+
+def _synchronous_jobs(monkeypatch, tmp_path):
+    # diskcache is importable, but building the manager needs the multiprocess/psutil extras
+    monkeypatch.setitem(sys.modules, 'diskcache', types.SimpleNamespace(Cache=lambda directory: directory))
+    monkeypatch.setitem(sys.modules, 'dash', types.SimpleNamespace(DiskcacheManager=_missing_extras))
+    return BackgroundJobs(version='test', cache_dir=str(tmp_path))
+
+
+def test_missing_diskcache_extras_fall_back_to_synchronous_callbacks(monkeypatch, tmp_path):
+    jobs = _synchronous_jobs(monkeypatch, tmp_path)
+    assert jobs.manager is None
+
+    app = _App()
+    run = jobs.callback(app, 'output', 'input', progress='status')(lambda set_progress, value: value * 2)
+    # Registered as a plain callback, called without the progress argument
+    assert app.calls == [{}]
+    assert run(21) == 42
+
+
+def test_memoize_wraps_only_synchronous_callbacks(monkeypatch, tmp_path):
+    jobs = _synchronous_jobs(monkeypatch, tmp_path)
+    calls = []
+
+    def memoize(func):
+        def wrapper(value):
+            calls.append(value)
+            return func(value)
+        return wrapper
+
+    run = jobs.callback(_App(), 'output', 'input', memoize=memoize)(lambda value: value + 1)
+    assert run(1) == 2
+    assert calls == [1]
+
+    jobs.manager = object()
+    app = _App()
+    func = lambda value: value + 1
+    assert jobs.callback(app, 'output', 'input', memoize=memoize)(func) is func
+    assert app.calls[0]['background'] is True
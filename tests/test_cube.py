@@ -0,0 +1,56 @@
+import pytest
+
+pd = pytest.importorskip('pandas')
+np = pytest.importorskip('numpy')
+
+from cube import COUNT, Cube
+
+
+def _transactions():
+    rng = np.random.default_rng(0)
+    n = 500
+    returns = rng.integers(0, 2, n).astype(float)
+    returns[rng.random(n) < 0.3] = np.nan
+    return pd.DataFrame({
+        'Product Category': rng.choice(['Books', 'Clothing', 'Home'], n),
+        'Gender': rng.choice(['Female', 'Male'], n),
+        'Payment Method': rng.choice(['Card', 'Cash'], n),
+        'Age': rng.integers(18, 70, n),
+        'Total Purchase Amount': rng.integers(10, 5000, n),
+        'Quantity': rng.integers(1, 6, n),
+        'Product Price': rng.integers(10, 500, n),
+        'Returns': returns,
+        'Churn': rng.integers(0, 2, n),
+    })
+
+
+def test_roll_up_matches_groupby_sum():
+    df = _transactions()
+    cube = Cube(df)
+    result = cube.query(by=['Gender', 'Product Category'], measures=['Total Purchase Amount', COUNT])
+    expected = df.groupby(['Gender', 'Product Category'])['Total Purchase Amount'].agg(['sum', 'size'])
+    result = result.set_index(['Gender', 'Product Category']).sort_index()
+    assert result['Total Purchase Amount'].tolist() == expected['sum'].tolist()
+    assert result[COUNT].tolist() == expected['size'].tolist()
+
+
+def test_filtered_roll_up_matches_groupby_sum():
+    df = _transactions()
+    result = Cube(df).query(by=['Payment Method'], filters={'Gender': 'Female'}, measures=['Quantity'])
+    expected = df[df['Gender'] == 'Female'].groupby('Payment Method')['Quantity'].sum()
+    assert result.set_index('Payment Method')['Quantity'].to_dict() == expected.to_dict()
+
+
+def test_mean_skips_missing_returns_like_pandas():
+    df = _transactions()
+    result = Cube(df).mean('Returns', by=['Gender']).set_index('Gender')['Returns']
+    expected = df.groupby('Gender')['Returns'].mean()
+    assert np.allclose(result.sort_index(), expected.sort_index())
+
+
+def test_combined_partitions_match_one_cube():
+    df = _transactions()
+    whole = Cube(df).cells.sort_values(['Product Category', 'Gender', 'Payment Method']).reset_index(drop=True)
+    combined = Cube.combine([Cube(df.iloc[:200]), Cube(df.iloc[200:])]).cells
+    combined = combined.sort_values(['Product Category', 'Gender', 'Payment Method']).reset_index(drop=True)
+    pd.testing.assert_frame_equal(whole, combined, check_dtype=False)
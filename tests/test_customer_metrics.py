@@ -0,0 +1,52 @@
+import pytest
+
+pd = pytest.importorskip('pandas')
+np = pytest.importorskip('numpy')
+
+from customer_metrics import GAP, customer_metrics, purchase_gaps
+
+
+def _transactions():
+    rng = np.random.default_rng(0)
+    n = 300
+    returns = rng.integers(0, 2, n).astype(float)
+    returns[rng.random(n) < 0.2] = np.nan
+    return pd.DataFrame({
+        'Customer ID': rng.integers(1, 40, n),
+        'Purchase Date': pd.Timestamp('2023-01-01') + pd.to_timedelta(rng.integers(0, 365 * 24, n), unit='h'),
+        'Total Purchase Amount': rng.integers(10, 5000, n),
+        'Returns': returns,
+        'Churn': rng.integers(0, 2, n),
+    })
+
+
+def test_metrics_match_groupby():
+    df = _transactions()
+    table = customer_metrics(df).set_index('Customer ID')
+    grouped = df.groupby('Customer ID')
+    assert table['Frequency'].tolist() == grouped.size().tolist()
+    assert np.allclose(table['Monetary'], grouped['Total Purchase Amount'].sum())
+    assert (table['Last Purchase'] == grouped['Purchase Date'].max()).all()
+    assert np.allclose(table['Return Rate'], grouped['Returns'].mean(), equal_nan=True)
+    assert table['Churn'].tolist() == grouped['Churn'].max().tolist()
+
+    gaps = df.sort_values(['Customer ID', 'Purchase Date']).groupby('Customer ID')['Purchase Date'].diff()
+    days = (gaps / pd.Timedelta(days=1)).groupby(df['Customer ID'])
+    assert np.allclose(table['Mean Gap'], days.mean(), equal_nan=True)
+    assert np.allclose(table['Median Gap'], days.median(), equal_nan=True)
+    assert np.allclose(table['P90 Gap'], days.quantile(0.9), equal_nan=True)
+
+
+def test_purchase_gaps_align_with_rows():
+    df = _transactions()
+    expected = df.sort_values(['Customer ID', 'Purchase Date']).groupby('Customer ID')['Purchase Date'].diff()
+    expected = (expected / pd.Timedelta(days=1)).reindex(df.index)
+    result = purchase_gaps(df)
+    assert result.name == GAP
+    assert np.allclose(result, expected, equal_nan=True)
+
+
+def test_empty_frame_gives_an_empty_table():
+    table = customer_metrics(_transactions().iloc[:0])
+    assert len(table) == 0
+    assert {'Customer ID', 'Frequency', 'Monetary', 'Median Gap', 'Churn'} <= set(table.columns)
@@ -0,0 +1,21 @@
+import pytest
+
+pd = pytest.importorskip('pandas')
+pytest.importorskip('numpy')
+
+from customer_search import PrefixIndex
+
+
+def test_options_match_any_word_prefix_case_insensitively():
+    index = PrefixIndex(pd.Series(['Jane Doe', 'John Smith', 'Dora Jones', 'Jane Doe']))
+    values = [option['value'] for option in index.options('jo')]
+    assert sorted(values) == ['Dora Jones', 'John Smith']
+    assert sorted(option['value'] for option in index.options('DO')) == ['Dora Jones', 'Jane Doe']
+
+
+def test_options_keep_the_selection_and_respect_the_limit():
+    index = PrefixIndex(pd.Series([f'Customer {i}' for i in range(100)]), limit=5)
+    options = index.options('cust', selected='Customer 99')
+    assert options[0] == {'label': 'Customer 99', 'value': 'Customer 99'}
+    assert len(options) == 6
+    assert index.options('') == []
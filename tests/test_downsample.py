@@ -0,0 +1,26 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('pandas')
+
+from downsample import lttb
+
+
+def test_lttb_keeps_the_endpoints_and_the_point_budget():
+    x = np.arange(10000, dtype=float)
+    y = np.sin(x / 50)
+    selected = lttb(x, y, threshold=200)
+    assert len(selected) == 200
+    assert selected[0] == 0 and selected[-1] == len(x) - 1
+    assert (np.diff(selected) > 0).all()
+
+
+def test_lttb_keeps_every_point_of_a_short_series():
+    assert list(lttb(np.arange(5), np.arange(5), threshold=10)) == [0, 1, 2, 3, 4]
+
+
+def test_lttb_keeps_an_isolated_peak():
+    x = np.arange(1000, dtype=float)
+    y = np.zeros(1000)
+    y[437] = 100
+    assert 437 in lttb(x, y, threshold=50)
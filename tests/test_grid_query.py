@@ -0,0 +1,19 @@
+import pytest
+
+pd = pytest.importorskip('pandas')
+pytest.importorskip('dash_ag_grid')
+
+from grid_query import data_grid, grid_options
+
+
+def test_row_model_is_a_top_level_grid_prop():
+    grid = data_grid(pd.DataFrame({'a': [1, 2]}), className='ag-theme-alpine-dark')
+    props = grid.to_plotly_json()['props']
+    assert props['rowModelType'] == 'infinite'
+    assert 'rowModelType' not in props['dashGridOptions']
+    assert props['id'] == 'ag-grid'
+    assert props['className'] == 'ag-theme-alpine-dark'
+
+
+def test_grid_options_leave_the_row_model_out():
+    assert 'rowModelType' not in grid_options()
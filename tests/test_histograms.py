@@ -0,0 +1,23 @@
+import pytest
+
+pd = pytest.importorskip('pandas')
+np = pytest.importorskip('numpy')
+
+from histograms import COUNT, histogram_counts
+from scatter_matrix import bin_edges
+
+
+def test_counts_match_numpy_histogram():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({'amount': rng.normal(1000, 300, 2000)})
+    counts = histogram_counts(df, 'amount', nbins=30)
+    expected, _ = np.histogram(df['amount'], bins=bin_edges(df['amount'], 30))
+    assert list(counts[COUNT]) == [count for count in expected if count]
+
+
+def test_color_groups_add_up_to_their_rows():
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({'amount': rng.integers(0, 500, 1000), 'segment': rng.choice(['a', 'b', 'c'], 1000)})
+    counts = histogram_counts(df, 'amount', color='segment', nbins=20)
+    per_group = counts.groupby('segment', observed=True)[COUNT].sum()
+    assert per_group.to_dict() == df['segment'].value_counts().to_dict()
@@ -0,0 +1,75 @@
+import threading
+
+import pandas as pd
+
+from cube import COUNT, Cube, filter_cells, time_bucket
+
+# Time-bucketed aggregates for the time-interval dropdowns.
+# Daily (or, with base_freq='h', hourly) aggregates are computed once per dataset; coarser series
+# are rolled up from them on first use and cached per interval, so switching intervals is a
+# dictionary lookup.
+
+
+class TimeBuckets:
+    """Resample-style series derived from cached daily (or `base_freq`) aggregates.
+
+    Call refresh() with the new frame whenever the underlying data changes; it rebuilds the
+    base aggregates and drops every cached interval.
+    """
+
+    def __init__(self, df, by=(), time_column='Purchase Date', base_freq='D'):
+        self.by = list(by)
+        self.time_column = time_column
+        self.base_freq = base_freq
+        self._lock = threading.Lock()
+        self.refresh(df)
+
+    def refresh(self, df):
+        daily = Cube(df, dimensions=self.by, time_freq=self.base_freq, time_column=self.time_column)
+        with self._lock:
+            self._daily = daily
+            self._results = {}
+
+    def _cached(self, key, compute):
+        with self._lock:
+            daily = self._daily
+            if key in self._results:
+                return self._results[key]
+        result = compute(daily)
+        with self._lock:
+            # Do not cache a result computed from data replaced in the meantime
+            if self._daily is daily:
+                self._results[key] = result
+        return result
+
+    def _rolled_up(self, daily, freq):
+        cells = daily.cells
+        return cells.assign(**{self.time_column: time_bucket(cells[self.time_column], freq)})
+
+    def _fill(self, frame, freq):
+        # Like resample(), include intervals without any purchase as zeros
+        if frame.empty:
+            return frame
+        full_range = pd.date_range(frame.index.min(), frame.index.max(), freq=freq)
+        return frame.reindex(full_range, fill_value=0).rename_axis(self.time_column)
+
+    def totals(self, freq, filters=None):
+        """Every measure summed per interval, indexed by the interval's end date.
+
+        `filters` maps a dimension given in `by` to the value(s) to keep.
+        """
+        def compute(daily):
+            measures = [col for col in daily.cells.columns if col not in daily.dimensions]
+            cells = filter_cells(self._rolled_up(daily, freq), filters)
+            totals = cells.groupby(self.time_column)[measures].sum()
+            return self._fill(totals, freq)
+        filters_key = tuple(sorted((dim, repr(values)) for dim, values in (filters or {}).items()))
+        return self._cached(('totals', freq, filters_key), compute)
+
+    def by_dimension(self, freq, dim, measure=COUNT):
+        """One column per value of `dim` holding `measure` per interval."""
+        def compute(daily):
+            wide = self._rolled_up(daily, freq).pivot_table(
+                index=self.time_column, columns=dim, values=measure, aggfunc='sum', fill_value=0, observed=True)
+            return self._fill(wide, freq)
+        return self._cached((dim, measure, freq), compute)
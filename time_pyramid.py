@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+
+from cube import SUM_MEASURES
+from downsample import POINTS
+from time_buckets import TimeBuckets
+
+# Multi-resolution view of the transactions over time, for zoomable time-series charts.
+# Yearly, monthly, weekly, daily and hourly totals are rolled up from one cached hourly cube;
+# below the hourly level the raw transactions are read through a sorted index of purchase dates.
+# A chart starts at its base interval and, when zoomed, asks for the finest level whose number
+# of points in the visible window stays within the point budget.
+
+# Coarsest to finest
+LEVELS = ['Y', 'M', 'W', 'D', 'h']
+TRANSACTIONS = 'transactions'
+# Chart wording for each level
+PERIODS = {'Y': 'Yearly', 'M': 'Monthly', 'W': 'Weekly', 'D': 'Daily', 'h': 'Hourly', TRANSACTIONS: 'Per-purchase'}
+UNITS = {'Y': 'Year', 'M': 'Month', 'W': 'Week', 'D': 'Day', 'h': 'Hour', TRANSACTIONS: 'Purchase Date'}
+# Nominal length of one interval of each level, to estimate the number of points in a window
+_DURATIONS = {
+    'Y': pd.Timedelta(days=365.25),
+    'M': pd.Timedelta(days=30.44),
+    'W': pd.Timedelta(weeks=1),
+    'D': pd.Timedelta(days=1),
+    'h': pd.Timedelta(hours=1),
+}
+
+
+class TimePyramid:
+    """Totals of the transaction frame at every level of LEVELS, plus the transactions themselves.
+
+    The transaction level refers to rows by position, so the pyramid must be rebuilt if rows are
+    added, removed or reordered.
+    """
+
+    def __init__(self, df, by=(), time_column='Purchase Date'):
+        self.df = df
+        self.time_column = time_column
+        self.buckets = TimeBuckets(df, by=by, time_column=time_column, base_freq='h')
+        dates = df[time_column].to_numpy()
+        self._order = np.argsort(dates, kind='stable')
+        self._dates = dates[self._order]
+
+    def _transactions(self, start, end, filters=None):
+        lo = np.searchsorted(self._dates, start.to_datetime64(), side='left')
+        hi = np.searchsorted(self._dates, end.to_datetime64(), side='right')
+        # One row beyond each edge, so the line runs to the edges of the view
+        rows = self.df.iloc[self._order[max(lo - 1, 0):hi + 1]]
+        for dim, values in (filters or {}).items():
+            if isinstance(values, str) or not pd.api.types.is_list_like(values):
+                values = [values]
+            rows = rows[rows[dim].isin(values)]
+        measures = [col for col in SUM_MEASURES if col in rows.columns]
+        return rows[[self.time_column] + measures].reset_index(drop=True)
+
+    def level_for(self, window, base='M', max_points=POINTS, transactions=True):
+        """The finest level, no coarser than `base`, that draws `window` in at most `max_points` points."""
+        if window is None:
+            return base
+        start, end = (pd.Timestamp(bound) for bound in window)
+        level = base
+        for freq in LEVELS[LEVELS.index(base) + 1:]:
+            if (end - start) / _DURATIONS[freq] > max_points:
+                return level
+            level = freq
+        if transactions:
+            rows = np.searchsorted(self._dates, end.to_datetime64(), side='right') - \
+                np.searchsorted(self._dates, start.to_datetime64(), side='left')
+            if rows <= max_points:
+                return TRANSACTIONS
+        return level
+
+    def window(self, window=None, base='M', max_points=POINTS, filters=None, transactions=True):
+        """(level, frame) for the visible `window` (a (start, end) pair, or None for everything).
+
+        The frame has the time column and the summed measures of each interval; at the
+        transaction level it has one row per transaction instead.
+        """
+        level = self.level_for(window, base, max_points, transactions)
+        if level == TRANSACTIONS:
+            start, end = (pd.Timestamp(bound) for bound in window)
+            return level, self._transactions(start, end, filters)
+        totals = self.buckets.totals(level, filters)
+        if window is not None:
+            start, end = (pd.Timestamp(bound) for bound in window)
+            # One interval beyond each edge, so the line runs to the edges of the view
+            lo = max(totals.index.searchsorted(start, side='left') - 1, 0)
+            hi = totals.index.searchsorted(end, side='right') + 1
+            totals = totals.iloc[lo:hi]
+        return level, totals.reset_index()